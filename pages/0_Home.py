@@ -0,0 +1,220 @@
+import streamlit as st
+
+from src import jobs
+from src.deps import import_report
+from src.i18n import money, number, t
+from src.models import demo_items, empty_trip
+from src.session import SESSION_CAP_BYTES, session_usage
+from src.state import leave_shared, set_items, update_trip
+from src.utils import budget_per_person, trip_days
+
+# -----------------------------
+# Styling (subtiel "nuts")
+# -----------------------------
+st.markdown(
+    """
+    <style>
+      .tb-hero {
+        padding: 1.2rem 1.4rem;
+        border-radius: 18px;
+        background: linear-gradient(120deg, rgba(0, 255, 180, 0.10), rgba(80, 120, 255, 0.10));
+        border: 1px solid rgba(255,255,255,0.08);
+      }
+      .tb-kpi {
+        padding: 0.9rem 1rem;
+        border-radius: 16px;
+        border: 1px solid rgba(255,255,255,0.08);
+        background: rgba(255,255,255,0.03);
+      }
+      .tb-small {
+        opacity: 0.85;
+        font-size: 0.92rem;
+      }
+    </style>
+    """,
+    unsafe_allow_html=True,
+)
+
+# -----------------------------
+# Header / Hero
+# -----------------------------
+st.markdown(
+    f"""
+    <div class="tb-hero">
+      <h1 style="margin:0;">🧭 TripBuilder</h1>
+      <p class="tb-small" style="margin:0.25rem 0 0 0;">
+        {t("home.tagline")}
+      </p>
+    </div>
+    """,
+    unsafe_allow_html=True,
+)
+
+st.write("")
+
+# -----------------------------
+# Sidebar controls (globaal)
+# -----------------------------
+with st.sidebar:
+    st.header(t("home.controls"))
+
+    st.caption(t("home.controls_caption"))
+
+    # Quick edit essentials (globale inputs); uitgeschakeld voor een gedeelde (read-only) trip
+    read_only = st.session_state.ui.get("read_only", False)
+    destination = st.text_input(
+        t("field.destination"),
+        value=st.session_state.trip["destination"],
+        disabled=read_only,
+    )
+
+    c1, c2 = st.columns(2)
+    with c1:
+        start_date = st.date_input(
+            t("field.start"),
+            value=st.session_state.trip["start_date"],
+            disabled=read_only,
+        )
+    with c2:
+        end_date = st.date_input(
+            t("field.end"),
+            value=st.session_state.trip["end_date"],
+            disabled=read_only,
+        )
+
+    travelers = st.number_input(
+        t("field.travelers"),
+        min_value=1,
+        max_value=20,
+        value=int(st.session_state.trip["travelers"]),
+        step=1,
+        disabled=read_only,
+    )
+
+    budget = st.slider(
+        t("field.budget"),
+        min_value=0,
+        max_value=10000,
+        value=int(st.session_state.trip["budget_eur"]),
+        step=50,
+        disabled=read_only,
+    )
+
+    update_trip(
+        destination=destination,
+        start_date=start_date,
+        end_date=end_date,
+        travelers=int(travelers),
+        budget_eur=int(budget),
+    )
+
+    st.session_state.ui["show_tips"] = st.toggle(
+        t("home.show_tips"),
+        value=st.session_state.ui["show_tips"],
+    )
+
+    st.divider()
+
+    # Quick actions
+    a1, a2 = st.columns(2)
+    with a1:
+        if st.button(t("home.reset")):
+            leave_shared()
+            st.session_state.trip = empty_trip()
+            set_items([])
+            st.session_state.ui["last_saved"] = None
+            st.session_state.ui.pop("checklist", None)
+            st.rerun()
+
+    with a2:
+        if st.button(t("home.demo"), disabled=read_only):
+            update_trip(destination="Tokyo", budget_eur=1800, travelers=2, interests=["Food", "Tech", "Culture"])
+            set_items(demo_items())
+            st.rerun()
+
+    st.caption(t("home.nav_tip"))
+
+# -----------------------------
+# Main overview (landing)
+# -----------------------------
+trip = st.session_state.trip
+
+colA, colB, colC, colD = st.columns(4)
+
+with colA:
+    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
+    st.metric(t("kpi.destination"), trip["destination"] or "—")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with colB:
+    days = trip_days(trip)
+    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
+    st.metric(t("kpi.duration"), t("kpi.days_value", n=days))
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with colC:
+    per_person = budget_per_person(trip)
+    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
+    st.metric(t("kpi.budget_pp"), money(per_person))
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with colD:
+    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
+    st.metric(t("kpi.items_draft"), len(st.session_state.draft_items))
+    st.markdown("</div>", unsafe_allow_html=True)
+
+st.write("")
+
+# Progress bar "trip completeness"
+score = 0
+score += 1 if trip["destination"] else 0
+score += 1 if trip["budget_eur"] > 0 else 0
+score += 1 if days > 0 else 0
+score += 1 if len(st.session_state.draft_items) > 0 else 0
+progress = score / 4
+
+st.subheader(t("home.readiness"))
+st.progress(progress)
+labels = {
+    0.0: t("home.ready_0"),
+    0.25: t("home.ready_25"),
+    0.50: t("home.ready_50"),
+    0.75: t("home.ready_75"),
+    1.0: t("home.ready_100"),
+}
+closest = max([k for k in labels.keys() if k <= progress])
+st.caption(labels[closest])
+
+st.write("")
+
+with st.expander(t("home.server_report")):
+    st.caption(t("home.import_times"))
+    report = import_report()
+    if report:
+        st.table(report)
+    else:
+        st.caption(t("home.nothing_loaded"))
+
+    usage = session_usage()
+    used_kb = sum(usage.values()) / 1024
+    st.caption(t("home.session_memory", used=number(used_kb), cap=number(SESSION_CAP_BYTES / 1024 / 1024)))
+
+    # Achtergrondtaken (src/jobs.py) van dit server-proces en eerdere runs
+    recent = jobs.recent(10)
+    running = sum(1 for j in recent if j["status"] in jobs.ACTIVE)
+    st.caption(t("home.jobs", running=running, workers=jobs.MAX_WORKERS))
+    if recent:
+        st.dataframe(
+            [
+                {
+                    # Labels/boodschappen/fouten staan als catalog key in storage: hier vertalen
+                    "label": jobs.text(j["label"]),
+                    **{k: j[k] for k in ("status", "progress", "attempts")},
+                    "message": jobs.text(j["message"]),
+                    "error": jobs.text(j["error"]),
+                }
+                for j in recent
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
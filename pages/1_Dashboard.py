@@ -1,200 +1,270 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import date
-
-st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
-
-# -----------------------------
-# Helpers
-# -----------------------------
-def ensure_state():
-    if "trip" not in st.session_state:
-        st.session_state.trip = {
-            "destination": "",
-            "start_date": date.today(),
-            "end_date": date.today(),
-            "budget_eur": 0,
-            "travelers": 1,
-            "interests": [],
-            "notes": "",
-        }
-    if "draft_items" not in st.session_state:
-        st.session_state.draft_items = []
-    if "ui" not in st.session_state:
-        st.session_state.ui = {"show_tips": True, "last_saved": None}
-    if "activity" not in st.session_state:
-        st.session_state.activity = []  # list[str]
-
-def log(msg: str):
-    st.session_state.activity.insert(0, msg)
-    st.session_state.activity = st.session_state.activity[:30]
-
-ensure_state()
-trip = st.session_state.trip
-
-# -----------------------------
-# Header
-# -----------------------------
-st.title("📊 Dashboard")
-st.caption("Overzicht van je trip, budget, en planning. Alles komt uit `st.session_state`.")
-
-# -----------------------------
-# Derived values
-# -----------------------------
-days = (trip["end_date"] - trip["start_date"]).days + 1
-days = max(days, 0)
-
-budget = int(trip["budget_eur"])
-travelers = int(trip["travelers"]) if int(trip["travelers"]) > 0 else 1
-budget_pp = int(budget / travelers) if travelers else 0
-
-items = st.session_state.draft_items
-items_df = pd.DataFrame(items) if len(items) else pd.DataFrame(columns=["day", "time", "title", "cost"])
-
-total_planned_cost = int(items_df["cost"].sum()) if len(items_df) else 0
-remaining = budget - total_planned_cost
-
-# -----------------------------
-# KPI Row
-# -----------------------------
-c1, c2, c3, c4 = st.columns(4)
-
-c1.metric("📍 Bestemming", trip["destination"] or "—")
-c2.metric("🗓️ Duur", f"{days} dagen")
-c3.metric("💶 Budget p.p.", f"€ {budget_pp}")
-c4.metric("🧾 Items", f"{len(items)}")
-
-st.divider()
-
-# -----------------------------
-# Main layout
-# -----------------------------
-left, right = st.columns([1.25, 1])
-
-with left:
-    st.subheader("🧭 Trip status")
-
-    # Readiness score
-    score = 0
-    score += 1 if trip["destination"] else 0
-    score += 1 if budget > 0 else 0
-    score += 1 if days > 0 else 0
-    score += 1 if len(items) > 0 else 0
-    progress = score / 4
-
-    st.progress(progress)
-    if progress < 0.5:
-        st.warning("Nog wat basics invullen (bestemming, data, budget) en je bent vertrokken.")
-    elif progress < 1.0:
-        st.info("Nice! Voeg nog wat itinerary-items toe om je trip ‘af’ te maken.")
-    else:
-        st.success("Trip readiness: 100%. 🧳")
-
-    st.write("")
-
-    st.subheader("🗺️ Mini map (demo)")
-    st.caption("We gebruiken een simpele demo-locatie. Later kan je echte coördinaten gebruiken.")
-    demo_map = pd.DataFrame(
-        [{"lat": 50.8503, "lon": 4.3517, "label": "Brussel (demo pin)"}]
-    )
-    st.map(demo_map, latitude="lat", longitude="lon", size=None)
-
-    st.write("")
-
-    st.subheader("📝 Itinerary preview")
-    if len(items_df):
-        items_df_sorted = items_df.sort_values(["day", "time"], ascending=[True, True])
-        st.dataframe(items_df_sorted, use_container_width=True, hide_index=True)
-
-        # Quick filters
-        day_filter = st.selectbox("Filter op dag", options=["Alle"] + sorted(items_df["day"].unique().tolist()))
-        if day_filter != "Alle":
-            st.dataframe(items_df_sorted[items_df_sorted["day"] == day_filter], use_container_width=True, hide_index=True)
-
-        if st.button("🧨 Clear draft items", type="secondary"):
-            st.session_state.draft_items = []
-            log("Draft items gewist.")
-            st.rerun()
-    else:
-        st.info("Nog geen items. Ga naar **TripPlanner** om activiteiten toe te voegen.")
-
-with right:
-    st.subheader("💸 Budget breakdown")
-
-    # Make a fake category split based on titles (demo logic)
-    if len(items_df):
-        def categorize(title: str) -> str:
-            t = str(title).lower()
-            if any(k in t for k in ["hotel", "hostel", "airbnb"]):
-                return "Stay"
-            if any(k in t for k in ["train", "metro", "flight", "bus", "taxi"]):
-                return "Transport"
-            if any(k in t for k in ["museum", "ticket", "tour"]):
-                return "Activities"
-            if any(k in t for k in ["lunch", "dinner", "ramen", "food", "pizza"]):
-                return "Food"
-            return "Other"
-
-        tmp = items_df.copy()
-        tmp["category"] = tmp["title"].apply(categorize)
-        cat = tmp.groupby("category", as_index=False)["cost"].sum()
-
-        fig = px.pie(cat, names="category", values="cost", title="Geplande kosten per categorie")
-        st.plotly_chart(fig, use_container_width=True)
-
-        st.metric("✅ Gepland", f"€ {total_planned_cost}")
-        st.metric("🧾 Remaining", f"€ {remaining}")
-
-        if remaining < 0:
-            st.error("Je zit over budget. Tijd om te schrappen of budget te verhogen.")
-        elif remaining < 100:
-            st.warning("Je zit dicht bij je budget.")
-        else:
-            st.success("Je hebt nog ruimte in je budget.")
-    else:
-        st.info("Geen itinerary costs gevonden. Voeg items toe met kosten om charts te zien.")
-        st.metric("🧾 Budget", f"€ {budget}")
-
-    st.write("")
-
-    st.subheader("📦 Export (demo)")
-    st.caption("We exporteren naar CSV/JSON vanuit session_state.")
-
-    export_col1, export_col2 = st.columns(2)
-
-    with export_col1:
-        if len(items_df):
-            csv_bytes = items_df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "⬇️ Download itinerary.csv",
-                data=csv_bytes,
-                file_name="itinerary.csv",
-                mime="text/csv",
-            )
-        else:
-            st.button("⬇️ Download itinerary.csv", disabled=True)
-
-    with export_col2:
-        # Trip JSON export
-        import json
-        trip_json = json.dumps(
-            {"trip": trip, "draft_items": st.session_state.draft_items},
-            indent=2,
-            default=str,
-        ).encode("utf-8")
-        st.download_button(
-            "⬇️ Download trip.json",
-            data=trip_json,
-            file_name="trip.json",
-            mime="application/json",
-        )
-
-    st.write("")
-
-    st.subheader("🧾 Activity log")
-    if st.session_state.activity:
-        for line in st.session_state.activity[:10]:
-            st.write("•", line)
-    else:
-        st.caption("Nog geen acties gelogd.")
\ No newline at end of file
+import json
+
+import streamlit as st
+
+from src import simulate
+from src.deps import plotly_express
+from src.i18n import current_locale, money, percent, t
+from src.ical import to_ics_bytes
+from src.pacing import pace
+from src.settle import settle, traveler_names
+from src.share import create_snapshot
+from src.state import cached, items_table, log, maintained, save_trip, set_items
+from src.storage import get_store
+from src.table import filter_day, sort_view, to_csv_bytes, to_parquet_bytes, total_cost, totals_by, unique_days, visible
+from src.utils import trip_days
+
+trip = st.session_state.trip
+read_only = st.session_state.ui.get("read_only", False)
+
+# -----------------------------
+# Header
+# -----------------------------
+st.title(t("dashboard.title"))
+st.caption(t("dashboard.caption"))
+
+# -----------------------------
+# Derived values
+# -----------------------------
+days = trip_days(trip)
+
+budget = int(trip["budget_eur"])
+travelers = int(trip["travelers"]) if int(trip["travelers"]) > 0 else 1
+budget_pp = int(budget / travelers) if travelers else 0
+
+items = st.session_state.draft_items
+table = items_table()
+
+total_planned_cost = total_cost(table)
+remaining = budget - total_planned_cost
+
+# -----------------------------
+# Fragments: de dagfilter herlaadt enkel zijn eigen tabel
+# -----------------------------
+@st.fragment
+def itinerary_preview():
+    table_sorted = cached("dashboard_sorted", lambda: sort_view(items_table(), "day_time"))
+    st.dataframe(visible(table_sorted), use_container_width=True, hide_index=True)
+
+    # Quick filters
+    all_days = t("filter.all")
+    day_filter = st.selectbox(
+        t("filter.day"), options=[all_days] + cached("unique_days", lambda: unique_days(items_table()))
+    )
+    if day_filter != all_days:
+        st.dataframe(visible(filter_day(table_sorted, day_filter)), use_container_width=True, hide_index=True)
+
+    if st.button(t("dashboard.clear"), type="secondary"):
+        set_items([])
+        log(t("log.cleared_draft"))
+        st.rerun()
+
+# -----------------------------
+# KPI Row
+# -----------------------------
+c1, c2, c3, c4 = st.columns(4)
+
+c1.metric(t("kpi.destination"), trip["destination"] or "—")
+c2.metric(t("kpi.duration"), t("kpi.days_value", n=days))
+c3.metric(t("kpi.budget_pp"), money(budget_pp))
+c4.metric(t("kpi.items"), f"{len(items)}")
+
+st.divider()
+
+# -----------------------------
+# Main layout
+# -----------------------------
+left, right = st.columns([1.25, 1])
+
+with left:
+    st.subheader(t("dashboard.status"))
+
+    # Readiness score
+    score = 0
+    score += 1 if trip["destination"] else 0
+    score += 1 if budget > 0 else 0
+    score += 1 if days > 0 else 0
+    score += 1 if len(items) > 0 else 0
+    progress = score / 4
+
+    st.progress(progress)
+    if progress < 0.5:
+        st.warning(t("dashboard.ready_low"))
+    elif progress < 1.0:
+        st.info(t("dashboard.ready_mid"))
+    else:
+        st.success(t("dashboard.ready_full"))
+
+    st.write("")
+
+    st.subheader(t("dashboard.map"))
+    st.caption(t("dashboard.map_caption"))
+    demo_map = {"lat": [50.8503], "lon": [4.3517], "label": [t("dashboard.map_pin")]}
+    st.map(demo_map, latitude="lat", longitude="lon", size=None)
+
+    st.write("")
+
+    st.subheader(t("dashboard.preview"))
+    if table.num_rows:
+        itinerary_preview()
+    else:
+        st.info(t("dashboard.preview_empty"))
+
+with right:
+    st.subheader(t("dashboard.budget"))
+
+    # Make a fake category split based on titles (demo logic)
+    if table.num_rows:
+        def categorize(title: str) -> str:
+            low = str(title).lower()
+            if any(k in low for k in ["hotel", "hostel", "airbnb"]):
+                return "Stay"
+            if any(k in low for k in ["train", "metro", "flight", "bus", "taxi"]):
+                return "Transport"
+            if any(k in low for k in ["museum", "ticket", "tour"]):
+                return "Activities"
+            if any(k in low for k in ["lunch", "dinner", "ramen", "food", "pizza"]):
+                return "Food"
+            return "Other"
+
+        def category_pie():
+            tmp = table.set_column(
+                table.schema.get_field_index("category"),
+                "category",
+                [[categorize(title) for title in table["title"].to_pylist()]],
+            )
+            cat = totals_by(tmp, "category").to_pydict()
+            return plotly_express().pie(cat, names="category", values="cost", title=t("dashboard.pie_title"))
+
+        # Titel hangt van de taal af: die gaat mee als cache-input
+        st.plotly_chart(cached("dashboard_pie", category_pie, inputs=current_locale()), use_container_width=True)
+
+        st.metric(t("kpi.planned"), money(total_planned_cost))
+        st.metric(t("kpi.remaining"), money(remaining))
+
+        sim = simulate.peek(items, budget)
+        if sim is not None and budget > 0:
+            st.caption(t("dashboard.sim_p_over", p=percent(sim["p_over"])))
+
+        # Pacing over de echte tripdagen (kost per dag wordt incrementeel bijgehouden)
+        pacing = pace(trip, maintained("daily_costs").per_day)
+        if pacing["cross_day"]:
+            d = pacing["cross_day"]
+            st.error(t("dashboard.pace_exceeded", day=d, date=pacing["dates"][d - 1]))
+        elif pacing["ahead_day"]:
+            d = pacing["ahead_day"]
+            st.warning(t("dashboard.pace_ahead", day=d, amount=money(pacing["ahead_eur"])))
+
+        if remaining < 0:
+            st.error(t("budget.over"))
+        elif remaining < 100:
+            st.warning(t("budget.close"))
+        else:
+            st.success(t("budget.room"))
+    else:
+        st.info(t("dashboard.no_costs"))
+        st.metric(t("kpi.budget"), money(budget))
+
+    # Verrekening tussen reizigers (saldi worden incrementeel bijgehouden)
+    names = traveler_names(trip, fallback=t("settle.traveler_n"))
+    if len(names) > 1 and items:
+        st.write("")
+        st.subheader(t("settle.title"))
+        net = maintained("balances").net(len(names))
+        label = {p: names[p] if p < len(names) else t("settle.traveler_n", n=p + 1) for p in net}
+        st.dataframe(
+            {
+                t("settle.traveler"): [label[p] for p in sorted(net)],
+                t("settle.balance"): [net[p] / 100 for p in sorted(net)],
+            },
+            use_container_width=True,
+            hide_index=True,
+        )
+        transfers = settle(net)
+        for debtor, creditor, cents in transfers:
+            st.write(t("settle.pays", debtor=label[debtor], creditor=label[creditor], amount=money(cents / 100, 2)))
+        if not transfers:
+            st.caption(t("settle.even"))
+
+    st.write("")
+
+    st.subheader(t("export.title"))
+    st.caption(t("export.caption"))
+
+    export_col1, export_col2, export_col3, export_col4 = st.columns(4)
+
+    with export_col1:
+        if table.num_rows:
+            st.download_button(
+                t("export.download", name="itinerary.csv"),
+                data=cached("export_csv", lambda: to_csv_bytes(table)),
+                file_name="itinerary.csv",
+                mime="text/csv",
+            )
+        else:
+            st.button(t("export.download", name="itinerary.csv"), disabled=True)
+
+    with export_col2:
+        if table.num_rows:
+            st.download_button(
+                t("export.download", name="itinerary.ics"),
+                data=to_ics_bytes(trip, items),
+                file_name="itinerary.ics",
+                mime="text/calendar",
+            )
+        else:
+            st.button(t("export.download", name="itinerary.ics"), disabled=True)
+
+    with export_col3:
+        if table.num_rows:
+            st.download_button(
+                t("export.download", name="itinerary.parquet"),
+                data=cached("export_parquet", lambda: to_parquet_bytes(table)),
+                file_name="itinerary.parquet",
+                mime="application/vnd.apache.parquet",
+            )
+        else:
+            st.button(t("export.download", name="itinerary.parquet"), disabled=True)
+
+    with export_col4:
+        # Trip JSON export
+        trip_json = json.dumps(
+            {"trip": trip, "draft_items": st.session_state.draft_items},
+            indent=2,
+            default=str,
+        ).encode("utf-8")
+        st.download_button(
+            t("export.download", name="trip.json"),
+            data=trip_json,
+            file_name="trip.json",
+            mime="application/json",
+        )
+
+    save_col, variant_col, share_col = st.columns(3)
+    with save_col:
+        if st.button(t("dashboard.save"), disabled=read_only):
+            trip_id = save_trip()
+            log(t("log.saved", id=trip_id))
+            st.toast(t("dashboard.saved"), icon="💾")
+    with variant_col:
+        if st.button(t("dashboard.save_variant"), disabled=read_only or not trip.get("id")):
+            trip_id = save_trip(as_variant=True)
+            log(t("log.variant_saved", id=trip_id))
+            st.toast(t("dashboard.variant_saved"), icon="🧬")
+    with share_col:
+        if st.button(t("dashboard.share")):
+            key = create_snapshot(get_store(), trip, items)
+            st.session_state.ui["share_link"] = f"{(st.context.url or '').split('?')[0]}?trip={key}"
+            log(t("log.shared", snapshot=key))
+    if st.session_state.ui.get("share_link"):
+        st.caption(t("dashboard.share_caption"))
+        st.code(st.session_state.ui["share_link"], language=None)
+
+    st.write("")
+
+    st.subheader(t("dashboard.activity"))
+    if st.session_state.activity:
+        for line in st.session_state.activity[:10]:
+            st.write("•", line)
+    else:
+        st.caption(t("dashboard.activity_empty"))
\ No newline at end of file
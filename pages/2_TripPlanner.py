@@ -1,231 +1,337 @@
-import streamlit as st
-from datetime import date, timedelta
-
-st.set_page_config(page_title="Trip Planner", page_icon="🗺️", layout="wide")
-
-# -----------------------------
-# State init
-# -----------------------------
-def ensure_state():
-    if "trip" not in st.session_state:
-        st.session_state.trip = {
-            "destination": "",
-            "start_date": date.today(),
-            "end_date": date.today(),
-            "budget_eur": 0,
-            "travelers": 1,
-            "interests": [],
-            "notes": "",
-        }
-    if "draft_items" not in st.session_state:
-        st.session_state.draft_items = []  # list[dict]
-    if "activity" not in st.session_state:
-        st.session_state.activity = []  # list[str]
-
-def log(msg: str):
-    st.session_state.activity.insert(0, msg)
-    st.session_state.activity = st.session_state.activity[:30]
-
-ensure_state()
-trip = st.session_state.trip
-
-# -----------------------------
-# Header
-# -----------------------------
-st.title("🗺️ Trip Planner")
-st.caption("Stel je trip in en voeg activiteiten toe aan je itinerary (via session_state).")
-
-# -----------------------------
-# Trip settings (left) + Quick stats (right)
-# -----------------------------
-left, right = st.columns([1.15, 0.85])
-
-with left:
-    st.subheader("⚙️ Trip instellingen")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        destination = st.text_input("Bestemming", value=trip["destination"])
-    with c2:
-        travelers = st.number_input("Reizigers", min_value=1, max_value=20, value=int(trip["travelers"]), step=1)
-
-    c3, c4 = st.columns(2)
-    with c3:
-        start_date = st.date_input("Startdatum", value=trip["start_date"])
-    with c4:
-        end_date = st.date_input("Einddatum", value=trip["end_date"])
-
-    budget = st.slider("Budget (€)", 0, 10000, int(trip["budget_eur"]), step=50)
-
-    interests = st.multiselect(
-        "Interesses",
-        ["Food", "Culture", "Nature", "Nightlife", "Museums", "Shopping", "Tech", "Beaches", "History"],
-        default=trip.get("interests", []),
-    )
-
-    notes = st.text_area("Notes (optioneel)", value=trip.get("notes", ""), height=120)
-
-    save_col1, save_col2 = st.columns(2)
-    with save_col1:
-        if st.button("💾 Save trip settings", type="primary"):
-            trip["destination"] = destination
-            trip["travelers"] = int(travelers)
-            trip["start_date"] = start_date
-            trip["end_date"] = end_date
-            trip["budget_eur"] = int(budget)
-            trip["interests"] = interests
-            trip["notes"] = notes
-            log(f"Trip settings saved: {trip['destination']} • €{trip['budget_eur']} • {trip['travelers']} traveler(s)")
-            st.success("Opgeslagen!")
-    with save_col2:
-        if st.button("➡️ Ga naar Itinerary"):
-            st.switch_page("pages/Itinerary.py")
-
-with right:
-    st.subheader("📌 Quick stats")
-    days = (trip["end_date"] - trip["start_date"]).days + 1
-    days = max(days, 0)
-
-    budget_pp = int(trip["budget_eur"] / max(1, int(trip["travelers"])))
-
-    st.metric("Bestemming", trip["destination"] or "—")
-    st.metric("Duur", f"{days} dagen")
-    st.metric("Budget", f"€ {trip['budget_eur']}")
-    st.metric("Budget p.p.", f"€ {budget_pp}")
-    st.write("")
-    st.info("Tip: eerst trip opslaan, dan activities toevoegen.")
-
-st.divider()
-
-# -----------------------------
-# Activity templates (starter catalog)
-# -----------------------------
-st.subheader("🎯 Activity Builder")
-
-templates = [
-    {"title": "City walking tour", "category": "Activities", "cost": 25, "time": "10:00"},
-    {"title": "Museum visit", "category": "Museums", "cost": 18, "time": "11:00"},
-    {"title": "Lunch at local spot", "category": "Food", "cost": 20, "time": "13:00"},
-    {"title": "Public transport day pass", "category": "Transport", "cost": 9, "time": "09:00"},
-    {"title": "Sunset viewpoint", "category": "Nature", "cost": 0, "time": "19:00"},
-    {"title": "Dinner reservation", "category": "Food", "cost": 35, "time": "20:00"},
-]
-
-if "template_pick" not in st.session_state:
-    st.session_state.template_pick = templates[0]["title"]
-
-tcol1, tcol2, tcol3 = st.columns([1.2, 0.9, 0.9])
-
-with tcol1:
-    template_choice = st.selectbox(
-        "Kies een template (optioneel)",
-        [t["title"] for t in templates],
-        index=0,
-        key="template_pick",
-    )
-
-picked = next(t for t in templates if t["title"] == template_choice)
-
-with tcol2:
-    st.write("**Category**")
-    st.write(picked["category"])
-with tcol3:
-    st.write("**Default cost**")
-    st.write(f"€ {picked['cost']}")
-
-st.write("")
-
-# -----------------------------
-# Add activity form (no rerun until submit)
-# -----------------------------
-days = (trip["end_date"] - trip["start_date"]).days + 1
-days = max(days, 1)  # minimum 1 voor day selector
-
-with st.form("add_activity_form", clear_on_submit=True):
-    f1, f2, f3 = st.columns([1, 1, 1])
-
-    with f1:
-        day = st.selectbox("Dag", list(range(1, days + 1)))
-        time_str = st.text_input("Tijd (HH:MM)", value=picked["time"])
-    with f2:
-        title = st.text_input("Activiteit", value=picked["title"])
-        category = st.selectbox(
-            "Categorie",
-            ["Activities", "Museums", "Food", "Transport", "Nature", "Shopping", "Nightlife", "Other"],
-            index=["Activities", "Museums", "Food", "Transport", "Nature", "Shopping", "Nightlife", "Other"].index(
-                picked["category"] if picked["category"] in ["Activities", "Museums", "Food", "Transport", "Nature", "Shopping", "Nightlife", "Other"] else "Other"
-            ),
-        )
-    with f3:
-        cost = st.number_input("Kost (€)", min_value=0, max_value=5000, value=int(picked["cost"]), step=1)
-        tags = st.text_input("Tags (comma-separated)", value="")
-
-    submitted = st.form_submit_button("➕ Add to itinerary")
-
-if submitted:
-    item = {
-        "day": int(day),
-        "time": time_str.strip(),
-        "title": title.strip(),
-        "category": category,
-        "cost": int(cost),
-        "tags": [t.strip() for t in tags.split(",") if t.strip()],
-    }
-    st.session_state.draft_items.append(item)
-    log(f"Added: Day {item['day']} • {item['time']} • {item['title']} (€{item['cost']})")
-    st.toast("Activity toegevoegd!", icon="✅")
-    st.rerun()
-
-# -----------------------------
-# Preview + quick edits
-# -----------------------------
-st.write("")
-st.subheader("🧾 Current draft (preview)")
-
-if not st.session_state.draft_items:
-    st.info("Nog niets toegevoegd. Gebruik het formulier hierboven.")
-else:
-    # Sort preview
-    items_sorted = sorted(st.session_state.draft_items, key=lambda x: (x.get("day", 0), x.get("time", "")))
-
-    # Show as dataframe
-    import pandas as pd
-    df = pd.DataFrame(items_sorted)
-    st.dataframe(df, use_container_width=True, hide_index=True)
-
-    # Quick tools
-    q1, q2, q3 = st.columns(3)
-    with q1:
-        if st.button("🔀 Sort by day/time"):
-            st.session_state.draft_items = items_sorted
-            log("Draft sorted by day/time.")
-            st.rerun()
-
-    with q2:
-        if st.button("🧽 Remove last item"):
-            removed = st.session_state.draft_items.pop() if st.session_state.draft_items else None
-            if removed:
-                log(f"Removed last: {removed['title']}")
-                st.rerun()
-
-    with q3:
-        if st.button("🧨 Clear all"):
-            st.session_state.draft_items = []
-            log("Cleared all draft items.")
-            st.rerun()
-
-st.divider()
-
-# -----------------------------
-# Next steps
-# -----------------------------
-st.subheader("➡️ Next steps")
-n1, n2 = st.columns(2)
-with n1:
-    st.write("Ga naar **Itinerary** om per dag te bekijken en items te verwijderen.")
-    if st.button("📅 Open Itinerary"):
-        st.switch_page("pages/3_Itinerary.py")
-with n2:
-    st.write("Ga naar **Dashboard** om charts en export te zien.")
-    if st.button("📊 Open Dashboard"):
+import streamlit as st
+
+from src import ical, jobs, recommend
+from src.hours import is_open
+from src.i18n import money, number, percent, t
+from src.models import CATEGORIES, DEFAULT_TIMEZONE, INTERESTS, TEMPLATES
+from src.settle import traveler_names
+from src.state import add_item, add_items, items_table, log, pop_item, set_items, update_trip
+from src.sort_index import sort_key
+from src.storage import get_store
+from src.table import sort_view, visible
+from src.utils import clean_item, trip_days
+
+trip = st.session_state.trip
+ui = st.session_state.ui
+read_only = ui.get("read_only", False)
+
+# -----------------------------
+# Header
+# -----------------------------
+st.title(t("planner.title"))
+st.caption(t("planner.caption"))
+
+# -----------------------------
+# Trip settings (left) + Quick stats (right)
+# -----------------------------
+left, right = st.columns([1.15, 0.85])
+
+with left:
+    st.subheader(t("planner.settings"))
+
+    c1, c2 = st.columns(2)
+    with c1:
+        destination = st.text_input(t("field.destination"), value=trip["destination"], disabled=read_only)
+    with c2:
+        travelers = st.number_input(
+            t("field.travelers"), min_value=1, max_value=20, value=int(trip["travelers"]), step=1, disabled=read_only
+        )
+
+    c3, c4 = st.columns(2)
+    with c3:
+        start_date = st.date_input(t("field.start_date"), value=trip["start_date"], disabled=read_only)
+    with c4:
+        end_date = st.date_input(t("field.end_date"), value=trip["end_date"], disabled=read_only)
+
+    budget = st.slider(t("field.budget"), 0, 10000, int(trip["budget_eur"]), step=50, disabled=read_only)
+
+    interests = st.multiselect(
+        t("field.interests"),
+        INTERESTS,
+        default=trip.get("interests", []),
+        disabled=read_only,
+    )
+
+    timezones = ical.timezone_names()
+    tz_current = trip.get("timezone") if trip.get("timezone") in timezones else DEFAULT_TIMEZONE
+    tz_name = st.selectbox(
+        t("field.timezone"), timezones, index=timezones.index(tz_current), disabled=read_only
+    )
+
+    people = st.text_input(
+        t("field.people"),
+        value=", ".join(trip.get("people", [])),
+        help=t("field.people_help"),
+        disabled=read_only,
+    )
+
+    notes = st.text_area(t("field.notes"), value=trip.get("notes", ""), height=120, disabled=read_only)
+
+    save_col1, save_col2 = st.columns(2)
+    with save_col1:
+        if st.button(t("planner.save_settings"), type="primary", disabled=read_only):
+            update_trip(
+                destination=destination,
+                travelers=int(travelers),
+                start_date=start_date,
+                end_date=end_date,
+                budget_eur=int(budget),
+                interests=interests,
+                notes=notes,
+                timezone=tz_name,
+                people=[p.strip() for p in people.split(",") if p.strip()],
+            )
+            log(
+                t(
+                    "log.settings_saved",
+                    destination=trip["destination"],
+                    budget=money(trip["budget_eur"]),
+                    travelers=trip["travelers"],
+                )
+            )
+            st.success(t("planner.saved"))
+    with save_col2:
+        if st.button(t("planner.to_itinerary")):
+            st.switch_page("pages/3_Itinerary.py")
+
+with right:
+    st.subheader(t("planner.quick_stats"))
+    days = trip_days(trip)
+
+    budget_pp = int(trip["budget_eur"] / max(1, int(trip["travelers"])))
+
+    st.metric(t("stat.destination"), trip["destination"] or "—")
+    st.metric(t("stat.duration"), t("kpi.days_value", n=days))
+    st.metric(t("stat.budget"), money(trip["budget_eur"]))
+    st.metric(t("stat.budget_pp"), money(budget_pp))
+    st.write("")
+    st.info(t("planner.tip_save_first"))
+
+st.divider()
+
+# -----------------------------
+# Activity templates (starter catalog)
+# -----------------------------
+st.subheader(t("planner.builder"))
+
+templates = TEMPLATES
+
+if "template_pick" not in st.session_state:
+    st.session_state.template_pick = templates[0]["title"]
+
+tcol1, tcol2, tcol3 = st.columns([1.2, 0.9, 0.9])
+
+with tcol1:
+    template_choice = st.selectbox(
+        t("planner.template"),
+        [tpl["title"] for tpl in templates],
+        index=0,
+        key="template_pick",
+    )
+
+picked = next(tpl for tpl in templates if tpl["title"] == template_choice)
+
+with tcol2:
+    st.write(t("planner.category"))
+    st.write(picked["category"])
+with tcol3:
+    st.write(t("planner.default_cost"))
+    st.write(money(picked["cost"]))
+
+if picked.get("hours"):
+    st.caption(t("planner.open", hours=picked["hours"]) + (t("planner.holiday_exceptions") if picked.get("closed") else ""))
+
+# -----------------------------
+# Suggesties (templates + items uit het archief, zie src/recommend.py)
+# -----------------------------
+catalog = recommend.get_catalog(get_store())
+
+similar = catalog.like_item(picked, k=3)
+if similar:
+    st.caption(t("planner.similar", titles=", ".join(x["title"] for x in similar)))
+
+if trip.get("interests"):
+    st.write("")
+    st.write(t("planner.suggestions", interests=", ".join(trip["interests"])))
+    for i, sug in enumerate(recommend.suggestions(get_store(), trip["interests"])):
+        s1, s2, s3 = st.columns([3.2, 1.0, 0.8])
+        s1.write(f"{sug['title']}  \n:gray[{sug['category']}]")
+        s2.write(money(sug["cost"]))
+        if s3.button("➕", key=f"suggest_{i}"):
+            # Zelfde validatie als het formulier: archief-items kunnen een ongeldig uur of kost hebben
+            try:
+                item = clean_item(
+                    {
+                        "day": 1,
+                        "time": sug.get("time", ""),
+                        "title": sug["title"],
+                        "category": sug["category"],
+                        "cost": sug.get("cost", 0),
+                        "tags": list(sug.get("tags", [])),
+                    },
+                    max_day=trip_days(trip, minimum=1),
+                )
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                add_item(item)
+                log(t("log.added_suggestion", title=item["title"]))
+                st.rerun()
+
+if catalog.trip_ids:
+    with st.expander(t("planner.like_mine")):
+        like_mine = catalog.like_trip(
+            st.session_state.draft_items, trip.get("interests", []), k=3, exclude_trip=trip.get("id")
+        )
+        for row in like_mine:
+            st.write("•", row["destination"], t("planner.like_mine_row", start=row["start_date"], score=percent(row["score"])))
+        if not like_mine:
+            st.caption(t("planner.like_mine_empty"))
+
+st.write("")
+
+# -----------------------------
+# Add activity form (no rerun until submit)
+# -----------------------------
+days = trip_days(trip, minimum=1)  # minimum 1 voor day selector
+
+with st.form("add_activity_form", clear_on_submit=True):
+    f1, f2, f3 = st.columns([1, 1, 1])
+
+    with f1:
+        day = st.selectbox(t("field.day"), list(range(1, days + 1)))
+        time_str = st.text_input(t("field.time"), value=picked["time"], help=t("field.time_help"))
+        duration = st.number_input(t("field.duration"), min_value=0, max_value=24 * 60, value=60, step=15)
+    with f2:
+        title = st.text_input(t("field.title"), value=picked["title"])
+        category = st.selectbox(
+            t("field.category"),
+            CATEGORIES,
+            index=CATEGORIES.index(picked["category"] if picked["category"] in CATEGORIES else "Other"),
+        )
+        location = st.text_input(t("field.location"), value="", placeholder="35.7148, 139.7967")
+    with f3:
+        cost = st.number_input(t("field.cost"), min_value=0, max_value=5000, value=int(picked["cost"]), step=1)
+        uncertainty = st.number_input(t("field.uncertainty"), min_value=0, max_value=100, value=0, step=5)
+        tags = st.text_input(t("field.tags"), value="")
+
+    names = traveler_names(trip, fallback=t("settle.traveler_n"))
+    if len(names) > 1:
+        p1, p2 = st.columns(2)
+        paid_by = p1.selectbox(t("field.paid_by"), range(len(names)), format_func=names.__getitem__)
+        shared_with = p2.multiselect(
+            t("field.shared_with"), range(len(names)), format_func=names.__getitem__
+        )
+    else:
+        paid_by, shared_with = 0, []
+
+    submitted = st.form_submit_button(t("planner.add"))
+
+if submitted:
+    raw = {
+        "day": day,
+        "time": time_str,
+        "title": title,
+        "category": category,
+        "cost": cost,
+        "tags": tags,
+        "duration_min": duration,
+        "location": location,
+        "paid_by": paid_by,
+        "shared_with": shared_with,
+    }
+    if uncertainty:
+        # Kostrange voor de what-if simulator (Statistics)
+        raw["cost_low"] = cost * (1 - uncertainty / 100)
+        raw["cost_high"] = cost * (1 + uncertainty / 100)
+    try:
+        item = clean_item(raw, max_day=days)
+    except ValueError as e:
+        st.error(str(e))
+    else:
+        add_item(item)
+        log(t("log.added", day=item["day"], time=item["time"], title=item["title"], cost=money(item["cost"])))
+        st.toast(t("planner.added"), icon="✅")
+        if is_open(trip, item) is False:
+            st.toast(t("planner.closed_then", title=item["title"]), icon="🕒")
+        st.rerun()
+
+# -----------------------------
+# Preview + quick edits
+# -----------------------------
+st.write("")
+st.subheader(t("planner.preview"))
+
+if not st.session_state.draft_items:
+    st.info(t("planner.preview_empty"))
+else:
+    # Show as dataframe (gesorteerde Arrow view)
+    st.dataframe(visible(sort_view(items_table(), "day_time")), use_container_width=True, hide_index=True)
+
+    # Quick tools
+    q1, q2, q3 = st.columns(3)
+    with q1:
+        if st.button(t("planner.sort")):
+            set_items(sorted(st.session_state.draft_items, key=lambda x: sort_key("day_time", x)))
+            log(t("log.sorted"))
+            st.rerun()
+
+    with q2:
+        if st.button(t("planner.remove_last")):
+            removed = pop_item() if st.session_state.draft_items else None
+            if removed:
+                log(t("log.removed_last", title=removed["title"]))
+                st.rerun()
+
+    with q3:
+        if st.button(t("planner.clear")):
+            set_items([])
+            log(t("log.cleared_all_draft"))
+            st.rerun()
+
+# -----------------------------
+# Kalender import (.ics), in batches
+# -----------------------------
+with st.expander(t("import.title"), expanded=bool(ui.get("import_job"))):
+    st.caption(t("import.caption"))
+    upload = st.file_uploader(t("import.file"), type=["ics"])
+    if upload is not None and not ui.get("import_job") and st.button(t("import.button")):
+        ui["import_job"] = jobs.submit(ical.IMPORT_JOB, label=jobs.message("import.job_label", name=upload.name), upload=upload, trip=dict(trip))
+        st.rerun()
+
+    import_job = ui.get("import_job")
+    job = jobs.status(import_job) if import_job else None
+    if job is not None and job["status"] in jobs.ACTIVE:
+        jobs.poll(import_job)
+    elif import_job:
+        ui.pop("import_job")
+        if job is not None and job["status"] == "done":
+            res = jobs.result(import_job)
+            # Batches komen uit storage (ctx.emit in de job): per batch toevoegen
+            for batch in jobs.outputs(import_job):
+                add_items(batch)
+            log(t("log.imported", imported=number(res["imported"]), skipped=number(res["skipped"])))
+            st.toast(t("import.done", imported=number(res["imported"]), skipped=number(res["skipped"])), icon="📥")
+            st.rerun()
+        # Geannuleerd of mislukt: reeds gelezen batches niet toevoegen
+        jobs.discard_outputs(import_job)
+        if job is not None and job["status"] == "cancelled":
+            st.info(t("import.cancelled"))
+        else:
+            st.error(t("import.failed", error=jobs.text(job["error"]) if job else t("import.unknown_job")))
+
+st.divider()
+
+# -----------------------------
+# Next steps
+# -----------------------------
+st.subheader(t("planner.next"))
+n1, n2 = st.columns(2)
+with n1:
+    st.write(t("planner.next_itinerary"))
+    if st.button(t("planner.open_itinerary")):
+        st.switch_page("pages/3_Itinerary.py")
+with n2:
+    st.write(t("planner.next_dashboard"))
+    if st.button(t("planner.open_dashboard")):
         st.switch_page("pages/1_Dashboard.py")
\ No newline at end of file
@@ -1,221 +1,343 @@
-import streamlit as st
-from datetime import date
-
-# -----------------------------
-# Page config (moet bovenaan!)
-# -----------------------------
-st.set_page_config(
-    page_title="TripBuilder",
-    page_icon="🧭",
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
-# -----------------------------
-# Minimal "data model" in session_state
-# -----------------------------
-def init_state():
-    if "trip" not in st.session_state:
-        st.session_state.trip = {
-            "destination": "Barcelona",
-            "start_date": date.today(),
-            "end_date": date.today(),
-            "budget_eur": 800,
-            "travelers": 1,
-            "interests": ["Food", "Culture"],
-            "notes": "",
-        }
-
-    if "draft_items" not in st.session_state:
-        st.session_state.draft_items = []  # later gebruiken we dit in Itinerary
-
-    if "ui" not in st.session_state:
-        st.session_state.ui = {
-            "show_tips": True,
-            "last_saved": None,
-        }
-
-
-init_state()
-
-# -----------------------------
-# Styling (subtiel "nuts")
-# -----------------------------
-st.markdown(
-    """
-    <style>
-      .tb-hero {
-        padding: 1.2rem 1.4rem;
-        border-radius: 18px;
-        background: linear-gradient(120deg, rgba(0, 255, 180, 0.10), rgba(80, 120, 255, 0.10));
-        border: 1px solid rgba(255,255,255,0.08);
-      }
-      .tb-kpi {
-        padding: 0.9rem 1rem;
-        border-radius: 16px;
-        border: 1px solid rgba(255,255,255,0.08);
-        background: rgba(255,255,255,0.03);
-      }
-      .tb-small {
-        opacity: 0.85;
-        font-size: 0.92rem;
-      }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-# -----------------------------
-# Header / Hero
-# -----------------------------
-st.markdown(
-    f"""
-    <div class="tb-hero">
-      <h1 style="margin:0;">🧭 TripBuilder</h1>
-      <p class="tb-small" style="margin:0.25rem 0 0 0;">
-        Plan je reis alsof je een film regisseert: budget, route, activiteiten, stats.
-      </p>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
-
-st.write("")
-
-# -----------------------------
-# Sidebar controls (globaal)
-# -----------------------------
-with st.sidebar:
-    st.header("⚙️ Quick Controls")
-
-    st.caption("Deze instellingen gelden overal (alle pagina’s).")
-
-    # Quick edit essentials (globale inputs)
-    st.session_state.trip["destination"] = st.text_input(
-        "Bestemming",
-        value=st.session_state.trip["destination"],
-    )
-
-    c1, c2 = st.columns(2)
-    with c1:
-        st.session_state.trip["start_date"] = st.date_input(
-            "Start",
-            value=st.session_state.trip["start_date"],
-        )
-    with c2:
-        st.session_state.trip["end_date"] = st.date_input(
-            "Einde",
-            value=st.session_state.trip["end_date"],
-        )
-
-    st.session_state.trip["travelers"] = st.number_input(
-        "Reizigers",
-        min_value=1,
-        max_value=20,
-        value=int(st.session_state.trip["travelers"]),
-        step=1,
-    )
-
-    st.session_state.trip["budget_eur"] = st.slider(
-        "Budget (€)",
-        min_value=0,
-        max_value=10000,
-        value=int(st.session_state.trip["budget_eur"]),
-        step=50,
-    )
-
-    st.session_state.ui["show_tips"] = st.toggle(
-        "Tips tonen",
-        value=st.session_state.ui["show_tips"],
-    )
-
-    st.divider()
-
-    # Quick actions
-    a1, a2 = st.columns(2)
-    with a1:
-        if st.button("🧹 Reset trip"):
-            st.session_state.trip = {
-                "destination": "",
-                "start_date": date.today(),
-                "end_date": date.today(),
-                "budget_eur": 0,
-                "travelers": 1,
-                "interests": [],
-                "notes": "",
-            }
-            st.session_state.draft_items = []
-            st.session_state.ui["last_saved"] = None
-            st.rerun()
-
-    with a2:
-        if st.button("✨ Demo data"):
-            st.session_state.trip["destination"] = "Tokyo"
-            st.session_state.trip["budget_eur"] = 1800
-            st.session_state.trip["travelers"] = 2
-            st.session_state.trip["interests"] = ["Food", "Tech", "Culture"]
-            st.session_state.draft_items = [
-                {"day": 1, "time": "10:00", "title": "Senso-ji Temple", "cost": 0},
-                {"day": 1, "time": "13:00", "title": "Ramen lunch", "cost": 25},
-                {"day": 2, "time": "09:00", "title": "Akihabara walk", "cost": 0},
-            ]
-            st.rerun()
-
-    st.caption("Tip: de echte pagina’s staan in de map `pages/`.")
-
-# -----------------------------
-# Main overview (landing)
-# -----------------------------
-trip = st.session_state.trip
-
-colA, colB, colC, colD = st.columns(4)
-
-with colA:
-    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
-    st.metric("📍 Bestemming", trip["destination"] or "—")
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with colB:
-    days = (trip["end_date"] - trip["start_date"]).days + 1
-    if days < 1:
-        days = 0
-    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
-    st.metric("🗓️ Duur", f"{days} dagen")
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with colC:
-    per_person = 0
-    if trip["travelers"] > 0:
-        per_person = int(trip["budget_eur"] / trip["travelers"])
-    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
-    st.metric("💶 Budget p.p.", f"€ {per_person}")
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with colD:
-    st.markdown('<div class="tb-kpi">', unsafe_allow_html=True)
-    st.metric("🧾 Items (draft)", len(st.session_state.draft_items))
-    st.markdown("</div>", unsafe_allow_html=True)
-
-st.write("")
-
-# Progress bar "trip completeness"
-score = 0
-score += 1 if trip["destination"] else 0
-score += 1 if trip["budget_eur"] > 0 else 0
-score += 1 if days > 0 else 0
-score += 1 if len(st.session_state.draft_items) > 0 else 0
-progress = score / 4
-
-st.subheader("🚀 Trip readiness")
-st.progress(progress)
-labels = {
-    0.0: "Nog leeg. Begin met bestemming + data.",
-    0.25: "Nice, basis staat. Voeg budget of draft toe.",
-    0.50: "Halfway. Tijd om je itinerary te bouwen.",
-    0.75: "Bijna klaar. Check stats + finetune.",
-    1.0: "Go time. Pak je koffer. 🧳",
-}
-closest = max([k for k in labels.keys() if k <= progress])
-st.caption(labels[closest])
-
-st.write("")
\ No newline at end of file
+from collections import defaultdict
+
+import streamlit as st
+
+from src.hours import closed_items
+from src.i18n import money, number, t
+from src.models import CATEGORIES
+from src.sort_index import SORT_MODES
+from src.state import apply_batch, cached, items_table, log, maintained, pop_item, set_items, swap_items
+from src.table import total_cost, totals_by, visible
+from src.travel import MODES, trip_legs
+from src.utils import trip_days
+
+trip = st.session_state.trip
+
+st.title(t("itinerary.title"))
+st.caption(t("itinerary.caption"))
+
+# -----------------------------
+# Derived values
+# -----------------------------
+days = trip_days(trip, minimum=1)
+
+items = st.session_state.draft_items
+
+# -----------------------------
+# Controls
+# -----------------------------
+top1, top2, top3, top4 = st.columns([1.2, 1.2, 1.2, 1.4])
+
+with top1:
+    # 0 = alle dagen; labels vooraf vertaald (format_func mag geen t() oproepen)
+    day_labels = {0: t("filter.all"), **{i: t("itinerary.day", d=i) for i in range(1, days + 1)}}
+    day_filter = st.selectbox(t("filter.day"), options=list(day_labels), format_func=day_labels.get, index=0)
+
+with top2:
+    sort_labels = {mode: t(f"sort.{key}") for mode, key in SORT_MODES.items()}
+    sort_mode = st.selectbox(t("itinerary.sort"), options=list(SORT_MODES), format_func=sort_labels.get, index=0)
+
+with top3:
+    compact = st.toggle(t("itinerary.compact"), value=False)
+
+with top4:
+    if st.button(t("itinerary.back")):
+        st.switch_page("pages/2_TripPlanner.py")
+
+# -----------------------------
+# Helper functions for ordering & operations
+# -----------------------------
+def sorted_ids(mode: str) -> list[str]:
+    # Volgorde komt uit de incrementeel bijgehouden SortIndex (src/sort_index.py)
+    return maintained("sort_index").order(SORT_MODES[mode])
+
+def remove_item(index: int):
+    item = pop_item(index)
+    log(t("log.removed", day=item.get("day"), title=item.get("title")))
+    st.rerun()
+
+def move_item(index: int, direction: int):
+    # direction: -1 for up, +1 for down
+    new_index = index + direction
+    if new_index < 0 or new_index >= len(st.session_state.draft_items):
+        return
+    swap_items(index, new_index)
+    log(t("log.moved_up" if direction == -1 else "log.moved_down", index=index))
+    st.rerun()
+
+# -----------------------------
+# Empty state
+# -----------------------------
+if not items:
+    st.info(t("itinerary.empty"))
+    if st.button(t("itinerary.open_planner")):
+        st.switch_page("pages/2_TripPlanner.py")
+    st.stop()
+
+# -----------------------------
+# Facet filters (tags, categorie, dagen, kost) via de FacetIndex bitsets
+# -----------------------------
+facets = maintained("facet_index")
+matched = facets.alive
+active_filters = 0
+
+with st.expander(t("facet.title")):
+    f1, f2 = st.columns([2, 1])
+    with f1:
+        tag_counts = facets.counts("tags", facets.alive)
+        pick_tags = st.multiselect(
+            t("facet.tags"),
+            facets.values("tags"),
+            format_func=lambda tag: f"{tag} ({tag_counts.get(tag, 0)})",
+            key="facet_tags",  # vaste key: selectie blijft staan als de counts wijzigen
+        )
+    with f2:
+        match_labels = {True: t("facet.match_all"), False: t("facet.match_any")}
+        match_all = st.radio(t("facet.combine"), list(match_labels), format_func=match_labels.get, horizontal=True)
+
+    f3, f4 = st.columns(2)
+    with f3:
+        cat_counts = facets.counts("category", facets.alive)
+        pick_cats = st.multiselect(
+            t("facet.categories"),
+            facets.values("category"),
+            format_func=lambda c: f"{c} ({cat_counts.get(c, 0)})",
+            key="facet_cats",
+        )
+        pick_days = st.slider(t("facet.days"), 1, days, (1, days)) if days > 1 else (1, 1)
+    with f4:
+        lo, hi = facets.cost_bounds()
+        pick_cost = st.slider(t("field.cost"), lo, hi, (lo, hi)) if hi > lo else (lo, hi)
+
+    matched = facets.query(
+        tags=pick_tags,
+        match_all_tags=match_all,
+        categories=pick_cats,
+        days=pick_days if pick_days != (1, days) else None,
+        cost=pick_cost if pick_cost != (lo, hi) else None,
+    )
+    active_filters = len(pick_tags) + len(pick_cats) + (pick_days != (1, days)) + (pick_cost != (lo, hi))
+    if active_filters:
+        counts = facets.counts("category", matched)
+        st.caption(
+            t("facet.matched", n=matched.bit_count(), total=len(facets))
+            + ", ".join(f"{c}: {n}" for c, n in sorted(counts.items()) if n)
+        )
+
+# -----------------------------
+# Prepare view data
+# -----------------------------
+order = sorted_ids(sort_mode)
+
+# Positie van elk item in draft_items (voor delete/move en de Arrow table)
+position = {x["id"]: i for i, x in enumerate(items)}
+view_items = [items[position[item_id]] for item_id in order]
+
+# Facet filters: één set-lookup per item i.p.v. alle criteria opnieuw te evalueren
+if active_filters:
+    keep = facets.ids(matched)
+    view_items = [x for x in view_items if x["id"] in keep]
+
+# Filter by day
+if day_filter:
+    view_items = [x for x in view_items if int(x.get("day", 0)) == day_filter]
+
+# We'll also compute totals per day from original list (not filtered)
+table = items_table()
+totals_per_day = dict(zip(*totals_by(table, "day").to_pydict().values()))
+
+# -----------------------------
+# Summary row
+# -----------------------------
+sum1, sum2, sum3, sum4 = st.columns(4)
+sum1.metric(t("kpi.destination"), trip["destination"] or "—")
+sum2.metric(t("kpi.items_total"), len(items))
+sum3.metric(t("kpi.total_cost"), money(total_cost(table)))
+sum4.metric(t("kpi.days"), f"{days}")
+
+# -----------------------------
+# Batch edit: alles in één transactie, één rerun
+# -----------------------------
+with st.expander(t("batch.title")):
+    labels = {x["id"]: f"{t('itinerary.day', d=x.get('day'))} • {x.get('time', '')} • {x.get('title', '')}" for x in view_items}
+
+    with st.form("batch_edit_form"):
+        selected = st.multiselect(t("batch.items"), options=list(labels), format_func=labels.get)
+
+        e1, e2, e3, e4 = st.columns(4)
+        with e1:
+            shift = st.number_input(t("batch.shift"), min_value=-days, max_value=days, value=0, step=1)
+        with e2:
+            unchanged = t("batch.unchanged")
+            new_category = st.selectbox(t("field.category"), [None] + CATEGORIES, format_func=lambda c: c or unchanged)
+        with e3:
+            scale_pct = st.number_input(t("batch.scale"), min_value=0, max_value=500, value=100, step=5)
+        with e4:
+            delete_selected = st.checkbox(t("batch.delete"))
+
+        st.caption(t("batch.reorder"))
+        in_list_order = sorted(view_items, key=lambda x: position[x["id"]])
+        order_rows = {
+            "#": list(range(1, len(in_list_order) + 1)),
+            "id": [x["id"] for x in in_list_order],
+            "item": [labels[x["id"]] for x in in_list_order],
+        }
+        edited_order = st.data_editor(
+            order_rows,
+            column_config={"id": None},
+            disabled=["item"],
+            hide_index=True,
+            use_container_width=True,
+            key="batch_order",
+        )
+
+        apply_clicked = st.form_submit_button(t("batch.apply"))
+
+    if apply_clicked:
+        ops = []
+        if selected and shift:
+            ops.append({"op": "shift_days", "ids": selected, "days": int(shift)})
+        if selected and new_category:
+            ops.append({"op": "set_category", "ids": selected, "category": new_category})
+        if selected and scale_pct != 100:
+            ops.append({"op": "scale_cost", "ids": selected, "factor": scale_pct / 100})
+        if edited_order["#"] != order_rows["#"]:
+            new_order = [item_id for _, item_id in sorted(zip(edited_order["#"], edited_order["id"]), key=lambda r: r[0] or 0)]
+            ops.append({"op": "reorder", "ids": new_order})
+        if selected and delete_selected:
+            ops.append({"op": "delete", "ids": selected})
+
+        if ops:
+            try:
+                removed = apply_batch(ops, max_day=days)
+            except ValueError as e:
+                st.error(t("batch.failed", error=e))
+            else:
+                log(t("log.batch", ops=len(ops), selected=len(selected), removed=removed))
+                st.rerun()
+        else:
+            st.info(t("batch.nothing"))
+
+items_per_day = defaultdict(list)
+for x in view_items:
+    items_per_day[int(x.get("day", 0))].append(x)
+
+st.divider()
+
+# -----------------------------
+# Day-by-day planner view
+# -----------------------------
+day_range = [day_filter] if day_filter else range(1, days + 1)
+
+# Verplaatsingen tussen stops met locatie: alle legs van de trip in één batch
+mode_labels = {mode: t(f"travel.mode.{mode}") for mode in MODES}
+travel_mode = st.selectbox(t("travel.title"), list(MODES), format_func=mode_labels.get)
+legs_per_day = cached("travel_legs", lambda: trip_legs(items, travel_mode), inputs=travel_mode)
+infeasible = sum(not leg["feasible"] for legs in legs_per_day.values() for leg in legs)
+if infeasible:
+    st.warning(t("travel.infeasible", n=infeasible, mode=mode_labels[travel_mode].lower()))
+
+# Openingsuren: hele itinerary in één gevectoriseerde check (hangt ook af van de startdatum)
+closed = cached("closed_items", lambda: closed_items(trip, items), inputs=trip["start_date"])
+if closed:
+    st.warning(
+        t(
+            "hours.closed",
+            items=", ".join(t("hours.closed_item", title=x["title"], day=x.get("day"), time=x.get("time")) for x in closed),
+        )
+    )
+
+for d in day_range:
+    st.subheader(t("itinerary.day", d=d))
+
+    # Day total
+    day_total = int(totals_per_day.get(d, 0))
+    st.caption(t("itinerary.day_total", d=d, amount=money(day_total)))
+
+    for leg in legs_per_day.get(d, []):
+        text = t(
+            "travel.leg",
+            origin=leg["from"]["title"],
+            dest=leg["to"]["title"],
+            minutes=leg["minutes"],
+            km=number(leg["km"], 1),
+            free=max(leg["free_min"], 0),
+        )
+        if leg["feasible"]:
+            st.caption(f"🧭 {text}")
+        else:
+            st.markdown(f":red[⚠️ {text}]")
+
+    # Items for this day (respecting current sort/filter)
+    day_items = items_per_day[d]
+
+    if not day_items:
+        st.info(t("itinerary.day_empty"))
+        continue
+
+    # Show each item as a card-like row with actions
+    for idx_in_view, item in enumerate(day_items):
+        # We need the actual index in the original list to delete/move reliably
+        orig_index = position.get(item["id"])
+
+        time_str = item.get("time", "")
+        title = item.get("title", "")
+        category = item.get("category", "Other")
+        cost = int(item.get("cost", 0))
+        tags = item.get("tags", [])
+
+        c1, c2, c3, c4, c5 = st.columns([0.9, 3.4, 1.3, 1.1, 1.3])
+
+        with c1:
+            st.write(f"**{time_str}**" if time_str else "—")
+
+        with c2:
+            st.write(f"**{title}**")
+            meta = f"{category}"
+            if tags:
+                meta += " • " + ", ".join(tags)
+            st.caption(meta)
+
+        with c3:
+            st.write(money(cost))
+
+        with c4:
+            # Move up/down within full list (not per-day), simple but works well
+            up = st.button("⬆️", key=f"up_{d}_{idx_in_view}")
+            down = st.button("⬇️", key=f"down_{d}_{idx_in_view}")
+            if orig_index is not None:
+                if up:
+                    move_item(orig_index, -1)
+                if down:
+                    move_item(orig_index, +1)
+
+        with c5:
+            if st.button(t("itinerary.delete"), key=f"del_{d}_{idx_in_view}"):
+                if orig_index is not None:
+                    remove_item(orig_index)
+
+    if not compact:
+        st.write("")  # spacer
+
+st.divider()
+
+# -----------------------------
+# Table view + quick export preview
+# -----------------------------
+st.subheader(t("itinerary.table"))
+st.dataframe(visible(table.take([position[item_id] for item_id in sorted_ids("Day + Time")])), use_container_width=True, hide_index=True)
+
+b1, b2, b3 = st.columns(3)
+with b1:
+    if st.button(t("itinerary.clear_all")):
+        set_items([])
+        log(t("log.cleared_itinerary"))
+        st.rerun()
+
+with b2:
+    if st.button(t("itinerary.open_stats")):
+        st.switch_page("pages/4_Statistics.py")
+
+with b3:
+    if st.button(t("itinerary.open_dashboard")):
+        st.switch_page("pages/1_Dashboard.py")
\ No newline at end of file
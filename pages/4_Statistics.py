@@ -1,171 +1,242 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import date
-
-st.set_page_config(page_title="Statistics", page_icon="📊", layout="wide")
-
-# -----------------------------
-# State init
-# -----------------------------
-def ensure_state():
-    if "trip" not in st.session_state:
-        st.session_state.trip = {
-            "destination": "",
-            "start_date": date.today(),
-            "end_date": date.today(),
-            "budget_eur": 0,
-            "travelers": 1,
-            "interests": [],
-            "notes": "",
-        }
-    if "draft_items" not in st.session_state:
-        st.session_state.draft_items = []
-    if "activity" not in st.session_state:
-        st.session_state.activity = []
-
-ensure_state()
-trip = st.session_state.trip
-items = st.session_state.draft_items
-
-st.title("📊 Statistics")
-st.caption("Analyse van je trip: budget health, kostenverdeling en planning trends.")
-
-# -----------------------------
-# Prepare dataframe
-# -----------------------------
-if items:
-    df = pd.DataFrame(items).copy()
-else:
-    df = pd.DataFrame(columns=["day", "time", "title", "category", "cost", "tags"])
-
-# Normalize types
-if "cost" in df.columns:
-    df["cost"] = pd.to_numeric(df["cost"], errors="coerce").fillna(0).astype(int)
-if "day" in df.columns:
-    df["day"] = pd.to_numeric(df["day"], errors="coerce").fillna(0).astype(int)
-
-budget = int(trip.get("budget_eur", 0))
-travelers = int(trip.get("travelers", 1)) if int(trip.get("travelers", 1)) > 0 else 1
-days = (trip["end_date"] - trip["start_date"]).days + 1
-days = max(days, 0)
-
-planned = int(df["cost"].sum()) if len(df) else 0
-remaining = budget - planned
-
-# -----------------------------
-# KPI Row
-# -----------------------------
-k1, k2, k3, k4 = st.columns(4)
-k1.metric("📍 Bestemming", trip.get("destination") or "—")
-k2.metric("💶 Budget", f"€ {budget}")
-k3.metric("✅ Planned", f"€ {planned}")
-k4.metric("🧾 Remaining", f"€ {remaining}")
-
-# Budget health message
-if budget <= 0:
-    st.warning("Je budget staat op €0. Zet een budget in TripPlanner.")
-elif remaining < 0:
-    st.error("Je zit over budget. Tijd om te schrappen of budget te verhogen.")
-elif remaining < 100:
-    st.warning("Je zit dicht bij je budget.")
-else:
-    st.success("Budget ziet er gezond uit.")
-
-st.divider()
-
-# -----------------------------
-# Layout
-# -----------------------------
-left, right = st.columns([1.1, 0.9])
-
-with left:
-    st.subheader("📅 Spending per day")
-
-    if len(df):
-        by_day = df.groupby("day", as_index=False)["cost"].sum().sort_values("day")
-        by_day["Day"] = by_day["day"].apply(lambda x: f"Dag {x}")
-
-        fig_day = px.bar(by_day, x="Day", y="cost", title="Kosten per dag")
-        st.plotly_chart(fig_day, use_container_width=True)
-
-        # Optional line trend
-        fig_line = px.line(by_day, x="Day", y="cost", markers=True, title="Trend (kosten per dag)")
-        st.plotly_chart(fig_line, use_container_width=True)
-    else:
-        st.info("Geen items om per dag te analyseren. Voeg activities toe in TripPlanner.")
-
-with right:
-    st.subheader("🍱 Spending per category")
-
-    if len(df):
-        if "category" not in df.columns:
-            df["category"] = "Other"
-
-        by_cat = df.groupby("category", as_index=False)["cost"].sum().sort_values("cost", ascending=False)
-
-        fig_cat = px.pie(by_cat, names="category", values="cost", hole=0.45, title="Verdeling per categorie")
-        st.plotly_chart(fig_cat, use_container_width=True)
-
-        # Show top categories table
-        st.dataframe(by_cat, use_container_width=True, hide_index=True)
-    else:
-        st.info("Geen items om categorieën te analyseren.")
-
-st.divider()
-
-# -----------------------------
-# Top expensive items
-# -----------------------------
-st.subheader("💎 Top expensive items")
-
-if len(df):
-    top_n = st.slider("Hoeveel tonen?", 3, 15, 5)
-    top = df.sort_values("cost", ascending=False).head(top_n)
-
-    fig_top = px.bar(
-        top,
-        x="cost",
-        y="title",
-        orientation="h",
-        title="Duurste activiteiten",
-    )
-    st.plotly_chart(fig_top, use_container_width=True)
-
-    st.dataframe(top[["day", "time", "title", "category", "cost"]].sort_values(["day", "time"]), use_container_width=True, hide_index=True)
-else:
-    st.info("Nog geen items. Voeg eerst itinerary items toe.")
-
-st.divider()
-
-# -----------------------------
-# Budget per person + per day
-# -----------------------------
-st.subheader("🧮 Budget breakdown (per person / per day)")
-
-b1, b2, b3, b4 = st.columns(4)
-
-budget_pp = int(budget / travelers) if travelers else 0
-planned_pp = int(planned / travelers) if travelers else 0
-
-budget_per_day = int(budget / days) if days > 0 else 0
-planned_per_day = int(planned / days) if days > 0 else 0
-
-b1.metric("Budget p.p.", f"€ {budget_pp}")
-b2.metric("Planned p.p.", f"€ {planned_pp}")
-b3.metric("Budget / dag", f"€ {budget_per_day}")
-b4.metric("Planned / dag", f"€ {planned_per_day}")
-
-# -----------------------------
-# Navigation
-# -----------------------------
-nav1, nav2, nav3 = st.columns(3)
-with nav1:
-    if st.button("🏁 Dashboard"):
-        st.switch_page("pages/Dashboard.py")
-with nav2:
-    if st.button("🗺️ TripPlanner"):
-        st.switch_page("pages/TripPlanner.py")
-with nav3:
-    if st.button("📅 Itinerary"):
-        st.switch_page("pages/Itinerary.py")
\ No newline at end of file
+import streamlit as st
+
+from src import jobs, simulate
+from src.deps import plotly_express
+from src.i18n import current_locale, money, number, percent, t
+from src.pacing import pace
+from src.state import cached, items_table, maintained
+from src.table import sort_view, total_cost, totals_by, visible
+from src.utils import trip_days
+
+trip = st.session_state.trip
+
+st.title(t("stats.title"))
+st.caption(t("stats.caption"))
+
+# -----------------------------
+# Prepare table (types worden genormaliseerd in src/table.py)
+# -----------------------------
+table = items_table()
+
+budget = int(trip.get("budget_eur", 0))
+travelers = int(trip.get("travelers", 1)) if int(trip.get("travelers", 1)) > 0 else 1
+days = trip_days(trip)
+
+planned = total_cost(table)
+
+# plotly pas laden als er iets te tekenen valt
+px = plotly_express() if table.num_rows else None
+remaining = budget - planned
+
+# -----------------------------
+# Gedeelde (gecachete) inputs + fragments
+# -----------------------------
+def day_totals(table) -> dict:
+    by_day = totals_by(table, "day").to_pydict()
+    by_day["Day"] = [t("itinerary.day", d=x) for x in by_day["day"]]
+    return by_day
+
+
+@st.fragment
+def top_expensive():
+    # De slider herlaadt alleen dit blok, niet de hele pagina
+    top_n = st.slider(t("stats.top_n"), 3, 15, 5)
+    by_cost = cached("stats_by_cost", lambda: sort_view(items_table(), "cost_desc"))
+    top = by_cost.slice(0, top_n)
+
+    fig_top = plotly_express().bar(
+        top.select(["cost", "title"]).to_pydict(),
+        x="cost",
+        y="title",
+        orientation="h",
+        title=t("stats.top_title"),
+    )
+    st.plotly_chart(fig_top, use_container_width=True)
+
+    st.dataframe(visible(sort_view(top.select(["day", "time", "title", "category", "cost", "minute"]), "day_time")), use_container_width=True, hide_index=True)
+
+# -----------------------------
+# KPI Row
+# -----------------------------
+k1, k2, k3, k4 = st.columns(4)
+k1.metric(t("kpi.destination"), trip.get("destination") or "—")
+k2.metric(t("kpi.budget"), money(budget))
+k3.metric(t("kpi.planned"), money(planned))
+k4.metric(t("kpi.remaining"), money(remaining))
+
+# Budget health message
+if budget <= 0:
+    st.warning(t("budget.zero"))
+elif remaining < 0:
+    st.error(t("budget.over"))
+elif remaining < 100:
+    st.warning(t("budget.close"))
+else:
+    st.success(t("budget.healthy"))
+
+st.divider()
+
+# -----------------------------
+# Layout
+# -----------------------------
+left, right = st.columns([1.1, 0.9])
+
+with left:
+    st.subheader(t("stats.per_day"))
+
+    if table.num_rows:
+        # Labels/titels hangen van de taal af: die gaat mee als cache-input
+        locale = current_locale()
+        by_day = cached("stats_by_day", lambda: day_totals(table), inputs=locale)
+
+        fig_day = cached("stats_fig_day", lambda: px.bar(by_day, x="Day", y="cost", title=t("stats.fig_day")), inputs=locale)
+        st.plotly_chart(fig_day, use_container_width=True)
+
+        # Optional line trend
+        fig_line = cached(
+            "stats_fig_line",
+            lambda: px.line(by_day, x="Day", y="cost", markers=True, title=t("stats.fig_trend")),
+            inputs=locale,
+        )
+        st.plotly_chart(fig_line, use_container_width=True)
+    else:
+        st.info(t("stats.per_day_empty"))
+
+with right:
+    st.subheader(t("stats.per_category"))
+
+    if table.num_rows:
+        by_cat = cached("stats_by_cat", lambda: totals_by(table, "category").sort_by([("cost", "descending")]))
+
+        fig_cat = cached(
+            "stats_fig_cat",
+            lambda: px.pie(by_cat.to_pydict(), names="category", values="cost", hole=0.45, title=t("stats.fig_category")),
+            inputs=current_locale(),
+        )
+        st.plotly_chart(fig_cat, use_container_width=True)
+
+        # Show top categories table
+        st.dataframe(by_cat, use_container_width=True, hide_index=True)
+    else:
+        st.info(t("stats.per_category_empty"))
+
+st.divider()
+
+# -----------------------------
+# Top expensive items
+# -----------------------------
+st.subheader(t("stats.top"))
+
+if table.num_rows:
+    top_expensive()
+else:
+    st.info(t("stats.top_empty"))
+
+st.divider()
+
+# -----------------------------
+# Budget per person + per day
+# -----------------------------
+st.subheader(t("stats.breakdown"))
+
+b1, b2, b3, b4 = st.columns(4)
+
+budget_pp = int(budget / travelers) if travelers else 0
+planned_pp = int(planned / travelers) if travelers else 0
+
+budget_per_day = int(budget / days) if days > 0 else 0
+planned_per_day = int(planned / days) if days > 0 else 0
+
+b1.metric(t("breakdown.budget_pp"), money(budget_pp))
+b2.metric(t("breakdown.planned_pp"), money(planned_pp))
+b3.metric(t("breakdown.budget_day"), money(budget_per_day))
+b4.metric(t("breakdown.planned_day"), money(planned_per_day))
+
+# Pacing: cumulatief gepland vs. lineaire budgetcurve over de tripdata
+if table.num_rows and budget > 0:
+    pacing = pace(trip, maintained("daily_costs").per_day)
+    fig_pace = cached(
+        "stats_fig_pace",
+        lambda: px.line(
+            {
+                "datum": pacing["dates"] * 2,
+                "€": pacing["cumulative"] + pacing["curve"],
+                "reeks": [t("pace.planned")] * len(pacing["dates"]) + [t("pace.curve")] * len(pacing["dates"]),
+            },
+            x="datum",
+            y="€",
+            color="reeks",
+            labels={"datum": t("pace.date"), "reeks": t("pace.series")},
+            markers=True,
+            title=t("pace.title"),
+        ),
+        inputs=(trip["start_date"], days, budget, current_locale()),
+    )
+    st.plotly_chart(fig_pace, use_container_width=True)
+    if pacing["cross_day"]:
+        st.error(t("pace.exceeded", day=pacing["cross_day"], date=pacing["dates"][pacing["cross_day"] - 1]))
+
+st.divider()
+
+# -----------------------------
+# What-if simulator (draait in de achtergrond, resultaat gecachet per scenario)
+# -----------------------------
+st.subheader(t("sim.title"))
+st.caption(t("sim.caption", n=number(simulate.N_SCENARIOS)))
+
+
+def render_simulation(job_id: str):
+    res = simulate.result(job_id)
+    if res is None:
+        # Mislukt of geannuleerd: laatste fout tonen, enkel opnieuw starten op vraag
+        job = jobs.status(job_id)
+        st.error(t("sim.failed", error=jobs.text(job["error"])) if job and job["error"] else t("sim.unavailable"))
+        if st.button(t("sim.retry")):
+            simulate.submit(st.session_state.draft_items, budget, retry=True)
+            st.rerun()
+        return
+    s1, s2, s3 = st.columns(3)
+    s1.metric(t("sim.p_over"), percent(res["p_over"], 1))
+    s2.metric(t("sim.p50"), money(res["p50"]))
+    s3.metric(t("sim.p90"), money(res["p90"]))
+
+    if res["per_day"]:
+        st.dataframe(
+            {
+                t("field.day"): [r["day"] for r in res["per_day"]],
+                "P50 (€)": [round(r["p50"]) for r in res["per_day"]],
+                "P90 (€)": [round(r["p90"]) for r in res["per_day"]],
+            },
+            use_container_width=True,
+            hide_index=True,
+        )
+    if res["sensitive"]:
+        st.caption(t("sim.sensitive"))
+        for row in res["sensitive"]:
+            st.write("•", row["title"], f"({percent(row['variance_share'])})")
+
+
+if table.num_rows:
+    sim_job = simulate.submit(st.session_state.draft_items, budget)
+    job = jobs.status(sim_job)
+    if job is not None and job["status"] in jobs.ACTIVE:
+        # Voortgang pollen tot de job klaar is, daarna één volledige rerun
+        jobs.poll(sim_job, cancellable=False)
+    else:
+        render_simulation(sim_job)
+else:
+    st.info(t("sim.empty"))
+
+# -----------------------------
+# Navigation
+# -----------------------------
+nav1, nav2, nav3 = st.columns(3)
+with nav1:
+    if st.button(t("nav.btn_dashboard")):
+        st.switch_page("pages/1_Dashboard.py")
+with nav2:
+    if st.button(t("nav.btn_planner")):
+        st.switch_page("pages/2_TripPlanner.py")
+with nav3:
+    if st.button(t("nav.btn_itinerary")):
+        st.switch_page("pages/3_Itinerary.py")
\ No newline at end of file
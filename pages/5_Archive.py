@@ -0,0 +1,88 @@
+import streamlit as st
+
+from src.deps import plotly_express
+from src.i18n import money, number, t
+from src.state import load_trip, log
+from src.storage import get_store
+
+PAGE_SIZE = 20
+
+store = get_store()
+
+st.title(t("archive.title"))
+st.caption(t("archive.caption"))
+
+# -----------------------------
+# Fleet KPI's (rollups, geen scan over items)
+# -----------------------------
+rollups = store.rollups()
+by_dest = rollups["destination"]
+
+n_trips = sum(r["trips"] for r in by_dest)
+n_items = sum(r["items"] for r in by_dest)
+total_cost = sum(r["cost"] for r in by_dest)
+traveler_days = sum(r["traveler_days"] for r in by_dest)
+
+k1, k2, k3, k4 = st.columns(4)
+k1.metric(t("archive.trips"), number(n_trips))
+k2.metric(t("kpi.items"), number(n_items))
+k3.metric(t("kpi.total_cost"), money(total_cost))
+k4.metric(t("archive.per_traveler_day"), money(total_cost / traveler_days, 2) if traveler_days else "—")
+
+if not n_trips:
+    st.info(t("archive.empty"))
+    st.stop()
+
+st.divider()
+
+px = plotly_express()
+left, right = st.columns(2)
+
+with left:
+    st.subheader(t("archive.per_destination"))
+    dest_rows = {
+        "destination": [r["destination"] for r in by_dest],
+        "cost": [r["cost"] for r in by_dest],
+        "per_traveler_day": [round(r["cost"] / r["traveler_days"], 2) if r["traveler_days"] else 0 for r in by_dest],
+    }
+    st.plotly_chart(px.bar(dest_rows, x="destination", y="cost", title=t("archive.fig_destination")), use_container_width=True)
+    st.dataframe(by_dest, use_container_width=True, hide_index=True)
+
+with right:
+    st.subheader(t("archive.per_category"))
+    st.plotly_chart(
+        px.pie(rollups["category"], names="category", values="cost", hole=0.45, title=t("archive.fig_category")),
+        use_container_width=True,
+    )
+
+st.subheader(t("archive.per_month"))
+st.plotly_chart(px.bar(rollups["month"], x="month", y="cost", title=t("archive.fig_month")), use_container_width=True)
+
+st.divider()
+
+# -----------------------------
+# Opgeslagen trips
+# -----------------------------
+st.subheader(t("archive.saved"))
+
+# Per pagina: enkel de rijen van trips (tellers staan op de trip, geen scan over items)
+n_saved = store.count_trips()
+n_pages = max(1, -(-n_saved // PAGE_SIZE))
+page = st.number_input(t("archive.page"), min_value=1, max_value=n_pages, value=1, key="archive_page") if n_pages > 1 else 1
+st.caption(t("archive.page_caption", n=number(n_saved), page=page, pages=n_pages))
+
+for row in store.list_trips(limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE):
+    c1, c2, c3, c4 = st.columns([2.4, 1.4, 1.2, 1.0])
+    with c1:
+        st.write(f"**{row['destination']}**")
+        st.caption(t("archive.row_caption", start=row["start_date"], end=row["end_date"], travelers=row["travelers"]))
+    with c2:
+        st.write(t("archive.row_items", n=number(row["items"])))
+    with c3:
+        st.write(f"{money(row['cost'])} / {money(row['budget_eur'])}")
+    with c4:
+        if st.button(t("archive.load"), key=f"load_{row['id']}"):
+            trip, items = store.load_trip(row["id"])
+            load_trip(trip, items)
+            log(t("log.loaded", destination=trip["destination"]))
+            st.switch_page("pages/1_Dashboard.py")
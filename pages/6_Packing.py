@@ -0,0 +1,106 @@
+import streamlit as st
+
+from src.i18n import number, t
+from src.packing import (
+    CUSTOM_SECTION,
+    checklist_key,
+    climate_conditions,
+    climate_for,
+    custom_rows,
+    generate,
+    to_markdown,
+    trip_month,
+)
+from src.state import cached, checklist, remove_checklist_item, set_checked
+
+trip = st.session_state.trip
+items = st.session_state.draft_items
+read_only = st.session_state.ui.get("read_only", False)
+
+st.title(t("packing.title"))
+st.caption(t("packing.caption"))
+
+# -----------------------------
+# Weergavenamen: regels zijn brontekst (src/packing.py), hier vertaald
+# -----------------------------
+def section_label(section: str) -> str:
+    return t(f"packing.section.{section}")
+
+
+def item_label(row: dict) -> str:
+    # Eigen items zijn vrije tekst van de gebruiker, regelitems staan in de catalogi
+    return row["item"] if row["section"] == CUSTOM_SECTION else t(f"packing.item.{row['item']}")
+
+# -----------------------------
+# Klimaat (gebundelde maandnormalen, offline)
+# -----------------------------
+month = trip_month(trip)
+climate = climate_for(trip.get("destination", ""), month)
+if climate is None:
+    st.info(t("packing.no_climate", destination=trip.get("destination") or "—"))
+else:
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric(t("packing.tmin"), f"{climate['tmin_c']} °C")
+    c2.metric(t("packing.tmax"), f"{climate['tmax_c']} °C")
+    c3.metric(t("packing.rain"), f"{number(climate['rain_mm'])} mm")
+    c4.metric(t("packing.rain_days"), climate["rain_days"])
+    labels = {"hot": t("packing.hot"), "cold": t("packing.cold"), "rain": t("packing.wet")}
+    conditions = [labels[c] for c in climate_conditions(climate)]
+    st.caption(t("packing.month_avg", month=month) + (f": {', '.join(conditions)}." if conditions else "."))
+
+st.divider()
+
+# -----------------------------
+# Lijst + afvinken (per trip bewaard)
+# -----------------------------
+profile = (trip.get("destination"), trip["start_date"], trip["end_date"], trip.get("travelers"), tuple(trip.get("interests") or []))
+packing = cached("packing", lambda: generate(trip, items), inputs=profile)
+state = checklist()
+packing = packing + custom_rows(state)
+
+done = sum(1 for row in packing if state.get(checklist_key(row), {}).get("checked"))
+st.progress(done / len(packing) if packing else 0.0, text=t("packing.progress", done=done, total=len(packing)))
+
+key_prefix = f"pack_{trip.get('id', 'draft')}"
+section = None
+for row in packing:
+    if row["section"] != section:
+        section = row["section"]
+        st.subheader(section_label(section))
+    key = checklist_key(row)
+    entry = state.get(key, {})
+    left, right = st.columns([12, 1])
+    checked = left.checkbox(
+        f"{row['qty']}× {item_label(row)}",
+        value=entry.get("checked", False),
+        key=f"{key_prefix}_{key}",
+        disabled=read_only,
+    )
+    if checked != entry.get("checked", False):
+        set_checked(key, checked, custom=entry.get("custom", False))
+    if entry.get("custom") and right.button("🗑️", key=f"{key_prefix}_del_{key}", disabled=read_only):
+        remove_checklist_item(key)
+        st.rerun()
+
+st.divider()
+
+with st.form("packing_extra", clear_on_submit=True):
+    extra = st.text_input(t("packing.add_label"), placeholder=t("packing.add_placeholder")).strip()
+    if st.form_submit_button(t("packing.add"), disabled=read_only) and extra:
+        # Zelfde naam als een item dat al op de lijst staat (bron- of vertaalde naam): niet dubbel toevoegen
+        if extra.casefold() in {name.casefold() for row in packing for name in (row["item"], item_label(row))}:
+            st.warning(t("packing.duplicate", item=extra))
+        else:
+            set_checked(checklist_key({"section": CUSTOM_SECTION, "item": extra}), False, custom=True)
+            st.rerun()
+
+st.download_button(
+    t("packing.download"),
+    data=to_markdown(
+        packing, {key: entry.get("checked", False) for key, entry in state.items()}, section_label, item_label
+    ).encode("utf-8"),
+    file_name=t("packing.file"),
+    mime="text/markdown",
+)
+if not trip.get("id"):
+    st.caption(t("packing.tip_save"))
@@ -0,0 +1,101 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from src.compare import STATUSES, aggregate_deltas, diff_items, status_counts, trip_table
+from src.deps import plotly_express
+from src.i18n import money, number, t
+from src.storage import get_store
+from src.table import total_cost
+
+store = get_store()
+PICK_LIMIT = 50  # trips per keuzelijst: nieuwste eerst, oudere via de zoekbalk
+
+
+def signed_money(value: int) -> str:
+    # st.metric leest de richting van de delta uit het teken vooraan
+    return ("+" if value >= 0 else "-") + money(abs(value))
+
+
+st.title(t("compare.title"))
+st.caption(t("compare.caption"))
+
+n_saved = store.count_trips()
+if n_saved < 2:
+    st.info(t("compare.need_two"))
+    st.stop()
+
+# Niet het hele archief per rerun: een beperkte lijst, te doorzoeken op bestemming of trip id
+search = st.text_input(t("compare.search"), key="compare_search").strip()
+trips = store.list_trips(limit=PICK_LIMIT, search=search)
+if not trips:
+    st.info(t("compare.no_match", search=search))
+    st.stop()
+if len(trips) == PICK_LIMIT:
+    st.caption(t("compare.limited", n=PICK_LIMIT, total=number(n_saved)))
+
+labels = {row["id"]: f"{row['destination']} ({row['start_date']} → {row['end_date']}) · {row['id']}" for row in trips}
+ids = list(labels)
+c1, c2 = st.columns(2)
+id_a = c1.selectbox(t("compare.trip_a"), ids, index=0, format_func=labels.get, key="compare_a")
+id_b = c2.selectbox(t("compare.trip_b"), ids, index=min(1, len(ids) - 1), format_func=labels.get, key="compare_b")
+
+# Geladen + omgezet per (trip, updated_at): opnieuw vergelijken kost enkel de join
+trip_a, table_a = trip_table(id_a, store.trip_version(id_a))
+trip_b, table_b = trip_table(id_b, store.trip_version(id_b))
+diff = diff_items(table_a, table_b)
+counts = status_counts(diff)
+
+# -----------------------------
+# KPI's
+# -----------------------------
+cost_a, cost_b = total_cost(table_a), total_cost(table_b)
+budget_a, budget_b = int(trip_a.get("budget_eur", 0)), int(trip_b.get("budget_eur", 0))
+k1, k2, k3, k4 = st.columns(4)
+k1.metric(t("compare.cost"), money(cost_b), delta=signed_money(cost_b - cost_a), delta_color="inverse")
+k2.metric(t("compare.budget"), money(budget_b), delta=signed_money(budget_b - budget_a))
+k3.metric(t("compare.items"), number(table_b.num_rows), delta=table_b.num_rows - table_a.num_rows)
+k4.metric(t("compare.differences"), number(diff.num_rows))
+
+status_labels = {status: t(f"compare.status.{status}") for status in STATUSES}
+for col, status in zip(st.columns(4), STATUSES):
+    col.metric(status_labels[status], number(counts[status]))
+
+if id_a != id_b and table_b.num_rows and not counts["moved"] and not counts["changed"] and counts["added"] == table_b.num_rows:
+    st.caption(t("compare.no_shared_ids"))
+
+st.divider()
+
+# -----------------------------
+# Verschillen per dag / categorie
+# -----------------------------
+px = plotly_express()
+left, right = st.columns(2)
+for col, key, title in ((left, "day", t("compare.per_day")), (right, "category", t("compare.per_category"))):
+    deltas = aggregate_deltas(table_a, table_b, key)
+    with col:
+        st.subheader(title)
+        st.plotly_chart(
+            px.bar(deltas.select([key, "cost_delta"]).to_pydict(), x=key, y="cost_delta", title=t("compare.fig_delta")),
+            use_container_width=True,
+        )
+        st.dataframe(deltas, use_container_width=True, hide_index=True)
+
+st.divider()
+
+# -----------------------------
+# Gewijzigde items (enkel de diff, niet de volledige trips)
+# -----------------------------
+st.subheader(t("compare.items_header"))
+show = st.multiselect(
+    t("compare.show"),
+    STATUSES,
+    default=[s for s in STATUSES if counts[s]],
+    format_func=status_labels.get,
+    key="compare_statuses",
+)
+if not diff.num_rows:
+    st.success(t("compare.no_diff"))
+elif show:
+    view = diff.filter(pc.is_in(diff["status"], value_set=pa.array(show)))
+    st.dataframe(view.drop_columns(["id"]), use_container_width=True, hide_index=True)
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+
+import tornado.ioloop
+import tornado.web
+
+from src.ical import to_ics_bytes
+from src.models import trip_from_dict, trip_to_dict
+from src.pacing import DailyCosts, pace
+from src.settle import Balances, settle, traveler_names
+from src.storage import get_store
+from src.table import to_csv_bytes, to_parquet_bytes, to_table, total_cost, totals_by
+from src.utils import clean_item, trip_days
+
+# -----------------------------
+# Headless JSON API (tornado) op dezelfde storage en aggregaties als de UI
+# -----------------------------
+# python -m src.api --port 8600
+#   GET/POST          /api/trips                   (GET: ?limit=&offset=)
+#   GET/PUT/DELETE    /api/trips/<id>
+#   GET/POST/DELETE   /api/trips/<id>/items        (POST: één item of een lijst = bulk)
+#   GET/PUT/DELETE    /api/trips/<id>/items/<item_id>
+#   GET               /api/trips/<id>/totals
+#   GET               /api/trips/<id>/export.(csv|ics|parquet)
+#   GET               /api/rollups
+# GETs op een trip krijgen een ETag (trip id + updated_at): If-None-Match -> 304 zonder payloads te laden.
+DEFAULT_PORT = int(os.environ.get("TRIPBUILDER_API_PORT", "8600"))
+ID = r"([0-9a-f]+)"
+
+EXPORTS = {
+    "csv": ("text/csv", lambda trip, items: to_csv_bytes(to_table(items))),
+    "ics": ("text/calendar", to_ics_bytes),
+    "parquet": ("application/vnd.apache.parquet", lambda trip, items: to_parquet_bytes(to_table(items))),
+}
+
+
+class JsonHandler(tornado.web.RequestHandler):
+    def initialize(self, store=None):
+        self.store = store or get_store()
+
+    def write_json(self, data, status: int = 200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(json.dumps(data, default=str))
+
+    def json_body(self):
+        try:
+            return json.loads(self.request.body or b"null")
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="Body is geen geldige JSON")
+
+    def write_error(self, status_code: int, **kwargs):
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(json.dumps({"error": self._reason, "status": status_code}))
+
+    def not_modified(self, trip_id: str) -> bool:
+        # ETag zetten en If-None-Match controleren vóór de trip geladen wordt
+        version = self.store.trip_version(trip_id)
+        if version is None:
+            raise tornado.web.HTTPError(404, reason="Trip niet gevonden")
+        self.set_header("Etag", f'"{trip_id}-{version!r}"')
+        if self.check_etag_header():
+            self.set_status(304)
+            self.finish()
+            return True
+        return False
+
+    def load(self, trip_id: str) -> tuple[dict, list[dict]]:
+        hit = self.store.load_trip(trip_id)
+        if hit is None:
+            raise tornado.web.HTTPError(404, reason="Trip niet gevonden")
+        return hit
+
+    def clean_items(self, raw, trip: dict) -> list[dict]:
+        raw = raw if isinstance(raw, list) else [raw]
+        try:
+            return [clean_item(x, max_day=trip_days(trip, minimum=1)) for x in raw]
+        except (ValueError, TypeError, AttributeError) as e:
+            raise tornado.web.HTTPError(400, reason=str(e))
+
+
+def _trip_payload(body) -> tuple[dict, list]:
+    if not isinstance(body, dict) or not isinstance(body.get("trip", {}), dict):
+        raise tornado.web.HTTPError(400, reason="Verwacht {'trip': {...}, 'items': [...]}")
+    try:
+        return trip_from_dict(body.get("trip", {})), body.get("items", [])
+    except ValueError as e:
+        raise tornado.web.HTTPError(400, reason=str(e))
+
+
+class TripsHandler(JsonHandler):
+    def get(self):
+        try:
+            limit, offset = int(self.get_argument("limit", "-1")), int(self.get_argument("offset", "0"))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="limit/offset moeten gehele getallen zijn")
+        self.write_json(self.store.list_trips(limit=limit, offset=max(offset, 0)))
+
+    def post(self):
+        trip, raw_items = _trip_payload(self.json_body())
+        trip.pop("id", None)
+        trip_id = self.store.save_trip(trip, self.clean_items(raw_items, trip) if raw_items else [])
+        self.set_header("Location", f"/api/trips/{trip_id}")
+        self.write_json({"id": trip_id}, status=201)
+
+
+class TripHandler(JsonHandler):
+    def get(self, trip_id: str):
+        if self.not_modified(trip_id):
+            return
+        trip, items = self.load(trip_id)
+        self.write_json({"trip": trip_to_dict(trip), "items": items})
+
+    def put(self, trip_id: str):
+        # Volledige vervanging; zonder "items" blijven de bestaande items staan
+        body = self.json_body()
+        trip, raw_items = _trip_payload(body)
+        _, current = self.load(trip_id)
+        items = self.clean_items(raw_items, trip) if "items" in body else current
+        self.store.save_trip({**trip, "id": trip_id}, items)
+        self.write_json({"id": trip_id, "items": len(items)})
+
+    def delete(self, trip_id: str):
+        self.load(trip_id)
+        self.store.delete_trip(trip_id)
+        self.set_status(204)
+        self.finish()
+
+
+class ItemsHandler(JsonHandler):
+    def get(self, trip_id: str):
+        if self.not_modified(trip_id):
+            return
+        self.write_json(self.load(trip_id)[1])
+
+    def post(self, trip_id: str):
+        # Bulk: één transactie, rollups één keer bijgewerkt
+        trip, _ = self.load(trip_id)
+        ids = self.store.upsert_items(trip_id, self.clean_items(self.json_body(), trip))
+        self.write_json({"ids": ids}, status=201)
+
+    def delete(self, trip_id: str):
+        body = self.json_body()
+        ids = body.get("ids") if isinstance(body, dict) else None
+        if not isinstance(ids, list):
+            raise tornado.web.HTTPError(400, reason="Verwacht {'ids': [...]}")
+        self.write_json({"removed": self.store.delete_items(trip_id, ids)})
+
+
+class ItemHandler(JsonHandler):
+    def get(self, trip_id: str, item_id: str):
+        if self.not_modified(trip_id):
+            return
+        item = next((x for x in self.load(trip_id)[1] if x.get("id") == item_id), None)
+        if item is None:
+            raise tornado.web.HTTPError(404, reason="Item niet gevonden")
+        self.write_json(item)
+
+    def put(self, trip_id: str, item_id: str):
+        trip, _ = self.load(trip_id)
+        body = self.json_body()
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Verwacht één item")
+        (item,) = self.clean_items({**body, "id": item_id}, trip)
+        self.store.upsert_items(trip_id, [item])
+        self.write_json(item)
+
+    def delete(self, trip_id: str, item_id: str):
+        if not self.store.delete_items(trip_id, [item_id]):
+            raise tornado.web.HTTPError(404, reason="Item niet gevonden")
+        self.set_status(204)
+        self.finish()
+
+
+class TotalsHandler(JsonHandler):
+    def get(self, trip_id: str):
+        if self.not_modified(trip_id):
+            return
+        trip, items = self.load(trip_id)
+        table = to_table(items)
+        names = traveler_names(trip)
+        net = Balances.from_items(items).net(len(names))
+        pacing = pace(trip, DailyCosts.from_items(items).per_day)
+        self.write_json(
+            {
+                "total": total_cost(table),
+                "budget": trip.get("budget_eur", 0),
+                "by_day": totals_by(table, "day").to_pylist(),
+                "by_category": totals_by(table, "category").to_pylist(),
+                "pacing": {k: pacing[k] for k in ("cumulative", "curve", "cross_day", "ahead_day")},
+                "balances_cents": {names[p] if p < len(names) else str(p): v for p, v in net.items()},
+                "transfers_cents": [
+                    {"from": names[a] if a < len(names) else str(a), "to": names[b] if b < len(names) else str(b), "amount": c}
+                    for a, b, c in settle(net)
+                ],
+            }
+        )
+
+
+class ExportHandler(JsonHandler):
+    def get(self, trip_id: str, fmt: str):
+        if self.not_modified(trip_id):
+            return
+        trip, items = self.load(trip_id)
+        mime, build = EXPORTS[fmt]
+        self.set_header("Content-Type", mime)
+        self.set_header("Content-Disposition", f'attachment; filename="itinerary.{fmt}"')
+        self.finish(build(trip, items))
+
+
+class RollupsHandler(JsonHandler):
+    def get(self):
+        self.write_json(self.store.rollups())
+
+
+def make_app(store=None) -> tornado.web.Application:
+    args = {"store": store}
+    return tornado.web.Application(
+        [
+            (r"/api/trips", TripsHandler, args),
+            (rf"/api/trips/{ID}", TripHandler, args),
+            (rf"/api/trips/{ID}/items", ItemsHandler, args),
+            (rf"/api/trips/{ID}/items/{ID}", ItemHandler, args),
+            (rf"/api/trips/{ID}/totals", TotalsHandler, args),
+            (rf"/api/trips/{ID}/export\.(csv|ics|parquet)", ExportHandler, args),
+            (r"/api/rollups", RollupsHandler, args),
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TripBuilder JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    opts = parser.parse_args()
+    make_app().listen(opts.port, address=opts.host)
+    print(f"TripBuilder API op http://{opts.host}:{opts.port}/api/trips")
+    tornado.ioloop.IOLoop.current().start()
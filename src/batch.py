@@ -0,0 +1,61 @@
+from src.models import CATEGORIES
+from src.utils import as_int
+
+# -----------------------------
+# Batch edits: een lijst operaties, in één keer toegepast op een kopie
+# -----------------------------
+# Ondersteunde operaties (dicts):
+#   {"op": "shift_days", "ids": [...], "days": 1}
+#   {"op": "set_category", "ids": [...], "category": "Food"}
+#   {"op": "scale_cost", "ids": [...], "factor": 0.9}
+#   {"op": "delete", "ids": [...]}
+#   {"op": "reorder", "ids": [...]}   # nieuwe volgorde binnen de plaatsen die deze ids innemen
+
+
+def _shift_days(item: dict, op: dict, max_day: int | None):
+    day = as_int(item.get("day", 1)) + int(op["days"])
+    item["day"] = max(1, min(day, max_day) if max_day else day)
+
+
+def _set_category(item: dict, op: dict, max_day: int | None):
+    if op["category"] not in CATEGORIES:
+        raise ValueError(f"Onbekende categorie: {op['category']}")
+    item["category"] = op["category"]
+
+
+def _scale_cost(item: dict, op: dict, max_day: int | None):
+    factor = float(op["factor"])
+    if factor < 0:
+        raise ValueError("Kostfactor kan niet negatief zijn.")
+    item["cost"] = int(round(as_int(item.get("cost", 0)) * factor))
+
+
+ITEM_OPS = {
+    "shift_days": _shift_days,
+    "set_category": _set_category,
+    "scale_cost": _scale_cost,
+}
+
+
+def apply_ops(items: list[dict], ops: list[dict], max_day: int | None = None) -> list[dict]:
+    # Alles-of-niets: bij een fout blijft de originele lijst onaangeroerd
+    result = [dict(x) for x in items]
+    for op in ops:
+        ids = set(op.get("ids", []))
+        kind = op.get("op")
+        if kind == "delete":
+            result = [x for x in result if x.get("id") not in ids]
+        elif kind == "reorder":
+            slots = [i for i, x in enumerate(result) if x.get("id") in ids]
+            by_id = {result[i]["id"]: result[i] for i in slots}
+            if set(op["ids"]) != set(by_id):
+                raise ValueError("Reorder moet exact de geselecteerde items bevatten.")
+            for slot, item_id in zip(slots, op["ids"]):
+                result[slot] = by_id[item_id]
+        elif kind in ITEM_OPS:
+            for item in result:
+                if item.get("id") in ids:
+                    ITEM_OPS[kind](item, op, max_day)
+        else:
+            raise ValueError(f"Onbekende batch-operatie: {kind}")
+    return result
@@ -0,0 +1,104 @@
+from functools import lru_cache
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.storage import get_store
+from src.table import to_table
+
+# -----------------------------
+# Twee trips vergelijken: keyed diff op item id + verschillen per dag/categorie
+# -----------------------------
+# Alles via Arrow joins/compute kernels: geen Python lus per item, ook niet voor 5k+ items.
+STATUSES = ["added", "removed", "moved", "changed"]
+
+
+def _keyed(items: list[dict]) -> pa.Table:
+    # Genormaliseerde kolommen (src/table.py) + id; tags als tekst zodat ze mee door de join kunnen
+    table = to_table(items)
+    tags = pc.binary_join(table["tags"], ", ")
+    return table.drop_columns(["tags"]).append_column("tags", tags).append_column(
+        "id", pa.array([str(x.get("id") or "") for x in items], pa.string())
+    )
+
+
+@lru_cache(maxsize=8)
+def trip_table(trip_id: str, version: float) -> tuple[dict, pa.Table]:
+    # Per (trip, updated_at): een opgeslagen trip wordt maar één keer geladen en omgezet
+    trip, items = get_store().load_trip(trip_id)
+    return trip, _keyed(items)
+
+
+def diff_items(a: pa.Table, b: pa.Table) -> pa.Table:
+    # -> enkel de gewijzigde rijen: status, title, day/time/category/cost van A en B, cost_delta
+    # Verschoven (dag/uur) gaat voor gewijzigd (titel/categorie/kost/tags) als beide gelden
+    a = a.append_column("in_a", pa.array([True] * a.num_rows, pa.bool_()))
+    b = b.append_column("in_b", pa.array([True] * b.num_rows, pa.bool_()))
+    joined = a.join(b, "id", join_type="full outer", left_suffix="_a", right_suffix="_b", coalesce_keys=True)
+
+    in_a = pc.fill_null(joined["in_a"], False)
+    in_b = pc.fill_null(joined["in_b"], False)
+    both = pc.and_(in_a, in_b)
+
+    def differs(*cols: str):
+        mask = pa.array([False] * joined.num_rows, pa.bool_())
+        for col in cols:
+            mask = pc.or_(mask, pc.fill_null(pc.not_equal(joined[f"{col}_a"], joined[f"{col}_b"]), False))
+        return pc.and_(both, mask)
+
+    moved = differs("day", "time")
+    changed = differs("title", "category", "cost", "tags")
+    status = pa.scalar(None, pa.string())
+    for mask, name in reversed(list(zip([pc.invert(in_a), pc.invert(in_b), moved, changed], STATUSES))):
+        status = pc.if_else(mask, name, status)
+    cost_a = pc.fill_null(joined["cost_a"], 0)
+    cost_b = pc.fill_null(joined["cost_b"], 0)
+    out = pa.table(
+        {
+            "status": status,
+            "title": pc.coalesce(joined["title_b"], joined["title_a"]),
+            "day_a": joined["day_a"],
+            "day_b": joined["day_b"],
+            "time_a": joined["time_a"],
+            "time_b": joined["time_b"],
+            "category_a": joined["category_a"],
+            "category_b": joined["category_b"],
+            "cost_a": joined["cost_a"],
+            "cost_b": joined["cost_b"],
+            "cost_delta": pc.subtract(cost_b, cost_a),
+            "id": joined["id"],
+        }
+    )
+    out = out.filter(pc.is_valid(out["status"]))
+    # Vaste volgorde: per status, dan op dag (B, anders A)
+    order = pc.sort_indices(
+        pa.table(
+            {
+                "rank": pc.index_in(out["status"], pa.array(STATUSES)),
+                "day": pc.coalesce(out["day_b"], out["day_a"]),
+                "title": out["title"],
+            }
+        ),
+        sort_keys=[("rank", "ascending"), ("day", "ascending"), ("title", "ascending")],
+    )
+    return out.take(order)
+
+
+def status_counts(diff: pa.Table) -> dict[str, int]:
+    counts = pc.value_counts(diff["status"])
+    found = dict(zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()))
+    return {s: found.get(s, 0) for s in STATUSES}
+
+
+def aggregate_deltas(a: pa.Table, b: pa.Table, key: str) -> pa.Table:
+    # -> [key, items_a, items_b, cost_a, cost_b, cost_delta], outer join zodat ontbrekende groepen 0 zijn
+    def grouped(table: pa.Table, side: str) -> pa.Table:
+        grouped = table.group_by(key).aggregate([("cost", "count"), ("cost", "sum")])
+        return grouped.rename_columns({"cost_count": f"items_{side}", "cost_sum": f"cost_{side}"})
+
+    joined = grouped(a, "a").join(grouped(b, "b"), key, join_type="full outer", coalesce_keys=True)
+    columns = {key: joined[key]}
+    for col in ("items_a", "items_b", "cost_a", "cost_b"):
+        columns[col] = pc.fill_null(joined[col], 0)
+    columns["cost_delta"] = pc.subtract(columns["cost_b"], columns["cost_a"])
+    return pa.table(columns).sort_by(key)
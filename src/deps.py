@@ -0,0 +1,75 @@
+import importlib
+import logging
+import os
+import threading
+import time
+from functools import cache
+
+# -----------------------------
+# Zware imports pas laden wanneer een pagina ze echt nodig heeft
+# -----------------------------
+logger = logging.getLogger(__name__)
+
+_import_times: dict[str, float] = {}
+_warm_up_lock = threading.Lock()
+_warm_up_started = False
+
+
+def _timed_import(name: str):
+    t0 = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times.setdefault(name, time.perf_counter() - t0)
+    return module
+
+
+@cache
+def pandas():
+    return _timed_import("pandas")
+
+
+@cache
+def numpy():
+    return _timed_import("numpy")
+
+
+@cache
+def plotly_express():
+    return _timed_import("plotly.express")
+
+
+def warm_up():
+    # Laadt de heavy modules + plotly template (wordt anders pas bij de eerste chart geparsed)
+    t0 = time.perf_counter()
+    numpy()
+    pd = pandas()
+    px = plotly_express()
+    pio = importlib.import_module("plotly.io")
+    _ = pio.templates[pio.templates.default]
+    px.bar(pd.DataFrame({"x": ["a"], "y": [0]}), x="x", y="y").to_plotly_json()
+    _import_times["warm_up"] = time.perf_counter() - t0
+    logger.info("Warm-up klaar in %.2fs", _import_times["warm_up"])
+
+
+def start_warm_up() -> bool:
+    # Eén keer per proces, in de achtergrond. Uitzetten met TRIPBUILDER_WARMUP=0.
+    global _warm_up_started
+    if os.environ.get("TRIPBUILDER_WARMUP", "1") == "0":
+        return False
+    with _warm_up_lock:
+        if _warm_up_started:
+            return False
+        _warm_up_started = True
+    threading.Thread(target=warm_up, name="tripbuilder-warm-up", daemon=True).start()
+    return True
+
+
+def import_report() -> list[dict]:
+    rows = [{"module": name, "seconds": round(sec, 4)} for name, sec in _import_times.items()]
+    return sorted(rows, key=lambda r: r["seconds"], reverse=True)
+
+
+if __name__ == "__main__":
+    # python -m src.deps  -> meet de koude import-tijden in dit proces
+    warm_up()
+    for row in import_report():
+        print(f"{row['module']:<20} {row['seconds']:>8.3f}s")
@@ -0,0 +1,128 @@
+from bisect import bisect_left, bisect_right, insort
+
+from src.utils import as_int, parse_tags
+
+# -----------------------------
+# Inverted index: tag/categorie/dag -> bitset van item slots, incrementeel bijgehouden
+# -----------------------------
+# Elk item krijgt een vast slot (bitpositie); een filter is dan een paar AND/OR's op ints
+# en facet counts zijn popcounts, zonder over alle items te lopen.
+FACETS = ("tags", "category", "day")
+
+
+def _values(item: dict, facet: str) -> list:
+    if facet == "tags":
+        return parse_tags(item.get("tags"))
+    if facet == "day":
+        return [as_int(item.get("day", 0))]
+    return [item.get("category") or "Other"]
+
+
+def iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FacetIndex:
+    def __init__(self):
+        self._next_slot = 0
+        self._slot_of: dict[str, int] = {}
+        self._id_of: dict[int, str] = {}
+        self.alive = 0
+        self._bits: dict[str, dict] = {facet: {} for facet in FACETS}
+        # Gesorteerde (kost, slot) paren voor kost-ranges
+        self._costs: list[tuple[int, int]] = []
+
+    @classmethod
+    def from_items(cls, items: list[dict]) -> "FacetIndex":
+        index = cls()
+        for item in items:
+            index.add(item)
+        return index
+
+    def add(self, item: dict):
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slot_of[item["id"]] = slot
+        self._id_of[slot] = item["id"]
+        bit = 1 << slot
+        self.alive |= bit
+        for facet, postings in self._bits.items():
+            for value in _values(item, facet):
+                postings[value] = postings.get(value, 0) | bit
+        insort(self._costs, (as_int(item.get("cost", 0)), slot))
+
+    def remove(self, item: dict):
+        slot = self._slot_of.pop(item["id"], None)
+        if slot is None:
+            return
+        del self._id_of[slot]
+        bit = 1 << slot
+        self.alive &= ~bit
+        for facet, postings in self._bits.items():
+            for value in _values(item, facet):
+                remaining = postings.get(value, 0) & ~bit
+                if remaining:
+                    postings[value] = remaining
+                else:
+                    postings.pop(value, None)
+        pos = bisect_left(self._costs, (as_int(item.get("cost", 0)), slot))
+        if pos < len(self._costs) and self._costs[pos][1] == slot:
+            del self._costs[pos]
+
+    def values(self, facet: str) -> list:
+        return sorted(self._bits[facet])
+
+    def cost_bounds(self) -> tuple[int, int]:
+        return (self._costs[0][0], self._costs[-1][0]) if self._costs else (0, 0)
+
+    def _any(self, facet: str, values) -> int:
+        bits = 0
+        for value in values:
+            bits |= self._bits[facet].get(value, 0)
+        return bits
+
+    def _all(self, facet: str, values) -> int:
+        bits = self.alive
+        for value in values:
+            bits &= self._bits[facet].get(value, 0)
+        return bits
+
+    def query(
+        self,
+        tags=(),
+        match_all_tags: bool = True,
+        categories=(),
+        days: tuple[int, int] | None = None,
+        cost: tuple[int, int] | None = None,
+    ) -> int:
+        # Binnen een facet OR (tags: AND of OR), tussen facetten AND
+        bits = self.alive
+        if tags:
+            bits &= self._all("tags", tags) if match_all_tags else self._any("tags", tags)
+        if categories:
+            bits &= self._any("category", categories)
+        if days is not None:
+            lo, hi = days
+            bits &= self._any("day", [d for d in self._bits["day"] if lo <= d <= hi])
+        if cost is not None:
+            lo, hi = cost
+            start = bisect_left(self._costs, (lo, -1))
+            end = bisect_right(self._costs, (hi, self._next_slot))
+            in_range = 0
+            for _, slot in self._costs[start:end]:
+                in_range |= 1 << slot
+            bits &= in_range
+        return bits
+
+    def counts(self, facet: str, bits: int) -> dict:
+        # Aantal items per facetwaarde binnen de huidige selectie
+        return {value: (posting & bits).bit_count() for value, posting in self._bits[facet].items()}
+
+    def ids(self, bits: int) -> set[str]:
+        return {self._id_of[slot] for slot in iter_bits(bits)}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
@@ -0,0 +1,156 @@
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+
+from src.deps import numpy
+from src.models import TEMPLATES
+from src.utils import UNTIMED, as_int, time_minutes
+
+# -----------------------------
+# Openingsuren: per weekdag een bitmap van kwartieren + uitzonderingen per datum
+# -----------------------------
+# Spec (subset van OSM opening_hours): "Mo-Fr 09:00-17:00; Sa 10:00-14:00", "24/7", "Mo off"
+# Uitzonderingen: {"12-25": "off", "2026-04-18": "10:00-14:00"} (jaarlijks of op datum)
+SLOT_MIN = 15
+SLOTS = 24 * 60 // SLOT_MIN
+FULL_DAY = (1 << SLOTS) - 1
+WEEKDAYS = ["mo", "tu", "we", "th", "fr", "sa", "su"]
+
+RULE_RE = re.compile(r"^(?P<days>[a-z]{2}(?:-[a-z]{2})?(?:,[a-z]{2}(?:-[a-z]{2})?)*)\s+(?P<hours>.+)$")
+RANGE_RE = re.compile(r"^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$")
+
+
+def _hours_bitmap(text: str) -> int:
+    # "09:00-12:00,13:00-17:00" of "off" -> int met één bit per kwartier
+    text = text.strip().lower()
+    if text in ("off", "closed"):
+        return 0
+    bits = 0
+    for part in text.split(","):
+        match = RANGE_RE.match(part.strip())
+        if not match:
+            raise ValueError(f"Ongeldige openingsuren: {part!r}")
+        h1, m1, h2, m2 = map(int, match.groups())
+        start, end = (h1 * 60 + m1) // SLOT_MIN, -(-(h2 * 60 + m2) // SLOT_MIN)
+        if end <= start:  # over middernacht: tot einde dag
+            end = SLOTS
+        bits |= ((1 << (min(end, SLOTS) - start)) - 1) << start
+    return bits
+
+
+def _days(spec: str) -> list[int]:
+    out = []
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        i, j = WEEKDAYS.index(first), WEEKDAYS.index(last or first)
+        out += [(i + k) % 7 for k in range((j - i) % 7 + 1)]
+    return out
+
+
+class Availability:
+    def __init__(self, weekly: str, exceptions: dict | None = None):
+        self.weekly = [0] * 7
+        for rule in weekly.lower().split(";"):
+            rule = rule.strip()
+            if rule == "24/7":
+                self.weekly = [FULL_DAY] * 7
+                continue
+            match = RULE_RE.match(rule)
+            if not match:
+                raise ValueError(f"Ongeldige openingsuren: {rule!r}")
+            for weekday in _days(match.group("days")):
+                self.weekly[weekday] = _hours_bitmap(match.group("hours"))
+        # "MM-DD" (elk jaar) of "YYYY-MM-DD"
+        self.exceptions = {key: _hours_bitmap(value) for key, value in (exceptions or {}).items()}
+
+    def bitmap(self, day: date) -> int:
+        exceptions = self.exceptions
+        if exceptions:
+            iso = day.isoformat()
+            if iso in exceptions:
+                return exceptions[iso]
+            if iso[5:] in exceptions:
+                return exceptions[iso[5:]]
+        return self.weekly[day.weekday()]
+
+    def is_open(self, day: date, minute: int, duration_min: int = 0) -> bool:
+        # O(1): één masker over de kwartieren van het bezoek
+        start = minute // SLOT_MIN
+        end = min(max(start + 1, -(-(minute + duration_min) // SLOT_MIN)), SLOTS)
+        mask = ((1 << (end - start)) - 1) << start
+        return self.bitmap(day) & mask == mask
+
+
+@lru_cache(maxsize=1)
+def template_index() -> dict[str, Availability]:
+    # Eén keer gebouwd: activiteit (titel, lowercase) -> Availability
+    return {
+        t["title"].lower(): Availability(t["hours"], t.get("closed"))
+        for t in TEMPLATES
+        if t.get("hours")
+    }
+
+
+def availability_for(item: dict) -> Availability | None:
+    return template_index().get(str(item.get("title", "")).lower())
+
+
+def trip_date(trip: dict, day) -> date:
+    return trip["start_date"] + timedelta(days=max(1, as_int(day)) - 1)
+
+
+def is_open(trip: dict, item: dict) -> bool | None:
+    # None = geen openingsuren gekend of geen tijdstip
+    availability = availability_for(item)
+    minute = time_minutes(item.get("time", ""))
+    if availability is None or minute == UNTIMED:
+        return None
+    return availability.is_open(trip_date(trip, item.get("day", 1)), minute, as_int(item.get("duration_min", 0)))
+
+
+@lru_cache(maxsize=1)
+def _weekly_table():
+    # -> (positie per activiteit, prefix sums [activiteit, weekdag, kwartier + 1])
+    np = numpy()
+    index = template_index()
+    position = {name: i for i, name in enumerate(index)}
+    bits = np.array(
+        [[[(a.weekly[w] >> s) & 1 for s in range(SLOTS)] for w in range(7)] for a in index.values()],
+        dtype=np.int16,
+    ).reshape(len(index), 7, SLOTS)
+    cum = np.concatenate([np.zeros((len(index), 7, 1), dtype=np.int16), bits.cumsum(axis=2)], axis=2)
+    return position, cum
+
+
+def closed_items(trip: dict, items: list[dict]) -> list[dict]:
+    # Bulk check: alle items met gekende uren in één NumPy lookup; een bezoek is
+    # open als het aantal open kwartieren in [start, einde) gelijk is aan de lengte
+    np = numpy()
+    index = template_index()
+    position, cum = _weekly_table()
+    checks = []
+    for item in items:
+        minute = time_minutes(item.get("time", ""))
+        name = str(item.get("title", "")).lower()
+        if name in position and minute != UNTIMED:
+            checks.append((item, name, minute))
+    if not checks:
+        return []
+
+    act = np.array([position[name] for _, name, _ in checks])
+    days = np.array([max(1, as_int(item.get("day", 1))) for item, _, _ in checks])
+    minutes = np.array([m for _, _, m in checks])
+    durations = np.array([as_int(item.get("duration_min", 0)) for item, _, _ in checks])
+    weekday = (trip["start_date"].weekday() + days - 1) % 7
+    start = minutes // SLOT_MIN
+    end = np.minimum(np.maximum(start + 1, -(-(minutes + durations) // SLOT_MIN)), SLOTS)
+    open_now = (cum[act, weekday, end] - cum[act, weekday, start]) == (end - start)
+
+    # Uitzonderingen (feestdagen...) zijn zeldzaam: die items scalair herbekijken
+    for i, (item, name, minute) in enumerate(checks):
+        availability = index[name]
+        if availability.exceptions:
+            day = trip_date(trip, item.get("day", 1))
+            if day.isoformat() in availability.exceptions or day.isoformat()[5:] in availability.exceptions:
+                open_now[i] = availability.is_open(day, minute, int(durations[i]))
+    return [item for (item, _, _), ok in zip(checks, open_now.tolist()) if not ok]
@@ -0,0 +1,49 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+
+# -----------------------------
+# Vertalingen: JSON catalogi, één keer per proces ingelezen (O(1) dict lookup per string)
+# -----------------------------
+LOCALE_DIR = Path(__file__).parent / "locales"
+LOCALES = {"nl": "Nederlands", "en": "English", "fr": "Français"}
+DEFAULT_LOCALE = "nl"  # brontaal: ontbrekende keys vallen hierop terug
+
+
+@lru_cache(maxsize=1)
+def catalogs() -> dict[str, dict[str, str]]:
+    raw = {code: json.loads((LOCALE_DIR / f"{code}.json").read_text(encoding="utf-8")) for code in LOCALES}
+    base = raw[DEFAULT_LOCALE]
+    return {code: {**base, **messages} for code, messages in raw.items()}
+
+
+def default_locale() -> str:
+    # Browsertaal als we die ondersteunen ("fr-BE" -> "fr")
+    browser = (getattr(st.context, "locale", None) or "")[:2].lower()
+    return browser if browser in LOCALES else DEFAULT_LOCALE
+
+
+def current_locale() -> str:
+    return st.session_state.ui.get("locale") or DEFAULT_LOCALE
+
+
+def t(key: str, **kwargs) -> str:
+    text = catalogs()[current_locale()].get(key, key)
+    return text.format(**kwargs) if kwargs else text
+
+
+def number(value: float, decimals: int = 0) -> str:
+    messages = catalogs()[current_locale()]
+    text = f"{value:,.{decimals}f}"
+    # Python geeft "1,234.5": eerst naar placeholders, dan naar de scheidingstekens van de taal
+    return text.replace(",", "\0").replace(".", messages["_decimal"]).replace("\0", messages["_group"])
+
+
+def money(value: float, decimals: int = 0) -> str:
+    return catalogs()[current_locale()]["_currency"].format(amount=number(value, decimals))
+
+
+def percent(fraction: float, decimals: int = 0) -> str:
+    return catalogs()[current_locale()]["_percent"].format(value=number(fraction * 100, decimals))
@@ -0,0 +1,228 @@
+import io
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from functools import cache
+from typing import BinaryIO, Iterable, Iterator
+from zoneinfo import ZoneInfo, available_timezones
+
+from src import jobs
+from src.models import CATEGORIES, DEFAULT_TIMEZONE
+from src.utils import as_int, clean_item, parse_time
+
+# -----------------------------
+# iCalendar (.ics) export + streaming import
+# -----------------------------
+DEFAULT_TZ = DEFAULT_TIMEZONE
+DEFAULT_DURATION_MIN = 60
+IMPORT_BATCH = 500
+IMPORT_JOB = "ics_import"
+
+
+@cache
+def timezone_names() -> list[str]:
+    # available_timezones() scant de tzdata bestanden: één keer per proces
+    return sorted(available_timezones())
+
+
+def _escape(text: str) -> str:
+    return (
+        str(text)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
+
+
+def _fold(line: str) -> str:
+    # RFC 5545: max 75 octets per regel, vervolg begint met een spatie
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:  # niet midden in een UTF-8 teken knippen
+            end -= 1
+        parts.append(raw[start:end].decode("utf-8"))
+        start = end
+    return "\r\n ".join(parts)
+
+
+def _utc(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def item_start(trip: dict, item: dict, tz: ZoneInfo) -> datetime | date:
+    # day + time + start_date -> echte timestamp (of enkel een datum zonder geldig uur)
+    day = trip["start_date"] + timedelta(days=max(1, as_int(item.get("day", 1))) - 1)
+    try:
+        minute = item["minute"] if "minute" in item else parse_time(item.get("time", ""))
+    except ValueError:
+        minute = None
+    if minute is None:
+        return day
+    return datetime.combine(day, time(minute // 60, minute % 60), tzinfo=tz)
+
+
+def iter_ics(trip: dict, items: list[dict], duration_min: int = DEFAULT_DURATION_MIN) -> Iterator[str]:
+    tz_name = trip.get("timezone") or DEFAULT_TZ
+    tz = ZoneInfo(tz_name)
+    stamp = _utc(datetime.now(timezone.utc))
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:-//TripBuilder//Itinerary//NL"
+    yield "CALSCALE:GREGORIAN"
+    yield _fold(f"X-WR-CALNAME:{_escape(trip.get('destination') or 'Trip')}")
+    yield f"X-WR-TIMEZONE:{tz_name}"
+    for item in items:
+        start = item_start(trip, item, tz)
+        yield "BEGIN:VEVENT"
+        yield f"UID:{item.get('id') or id(item)}@tripbuilder"
+        yield f"DTSTAMP:{stamp}"
+        if isinstance(start, datetime):
+            # Eigen duur van het item als die gekend is, anders de standaardduur
+            minutes = as_int(item.get("duration_min", 0)) or duration_min
+            yield f"DTSTART:{_utc(start)}"
+            yield f"DTEND:{_utc(start + timedelta(minutes=minutes))}"
+        else:
+            yield f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}"
+            yield f"DTEND;VALUE=DATE:{(start + timedelta(days=1)).strftime('%Y%m%d')}"
+        yield _fold(f"SUMMARY:{_escape(item.get('title', ''))}")
+        yield _fold(f"CATEGORIES:{_escape(item.get('category') or 'Other')}")
+        if item.get("lat") is not None and item.get("lon") is not None:
+            yield f"GEO:{float(item['lat']):.6f};{float(item['lon']):.6f}"
+        if item.get("tags"):
+            yield _fold(f"X-TRIPBUILDER-TAGS:{_escape(', '.join(item['tags']))}")
+        yield f"X-TRIPBUILDER-COST:{as_int(item.get('cost', 0))}"
+        yield "END:VEVENT"
+    yield "END:VCALENDAR"
+
+
+def to_ics_bytes(trip: dict, items: list[dict]) -> bytes:
+    return ("\r\n".join(iter_ics(trip, items)) + "\r\n").encode("utf-8")
+
+
+# -----------------------------
+# Import: regel per regel, nooit het hele bestand in geheugen
+# -----------------------------
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    current = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_dt(value: str, params: dict, tz: ZoneInfo) -> datetime | date | None:
+    value = value.strip()
+    try:
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d").date()
+        if value.endswith("Z"):
+            return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc).astimezone(tz)
+        local = ZoneInfo(params["TZID"]) if "TZID" in params else tz
+        return datetime.strptime(value[:15], "%Y%m%dT%H%M%S").replace(tzinfo=local).astimezone(tz)
+    except (ValueError, KeyError):
+        return None
+
+
+def iter_events(lines: Iterable[str], tz: ZoneInfo) -> Iterator[dict]:
+    event = None
+    for line in _unfold(lines):
+        name_params, _, value = line.partition(":")
+        name, *raw_params = name_params.split(";")
+        name = name.upper()
+        params = dict(p.split("=", 1) for p in raw_params if "=" in p)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+        elif name == "END" and value.upper() == "VEVENT":
+            if event is not None:
+                yield event
+            event = None
+        elif event is not None:
+            if name == "DTSTART":
+                event["start"] = _parse_dt(value, params, tz)
+            elif name == "DTEND":
+                event["end"] = _parse_dt(value, params, tz)
+            elif name in ("SUMMARY", "CATEGORIES", "X-TRIPBUILDER-TAGS", "X-TRIPBUILDER-COST", "LOCATION", "GEO"):
+                event[name] = _unescape(value)
+
+
+def event_to_item(event: dict, trip: dict) -> dict | None:
+    # None = overslaan (geen datum, voor de startdatum of ongeldige waarden)
+    start = event.get("start")
+    if start is None:
+        return None
+    day_date = start.date() if isinstance(start, datetime) else start
+    day = (day_date - trip["start_date"]).days + 1
+    if day < 1:
+        return None
+    category = (event.get("CATEGORIES") or "Other").split(",")[0].strip()
+    end = event.get("end")
+    extra = {}
+    if isinstance(start, datetime) and isinstance(end, datetime) and end > start:
+        extra["duration_min"] = int((end - start).total_seconds() // 60)
+    try:
+        return clean_item(
+            {
+                **extra,
+                "day": day,
+                "time": start.strftime("%H:%M") if isinstance(start, datetime) else "",
+                "title": event.get("SUMMARY") or "(zonder titel)",
+                "category": category if category in CATEGORIES else "Other",
+                "cost": event.get("X-TRIPBUILDER-COST", 0),
+                "tags": event.get("X-TRIPBUILDER-TAGS") or "",
+                "location": event.get("GEO", "").replace(";", ","),
+            }
+        )
+    except ValueError:
+        return None
+
+
+def iter_item_batches(lines: Iterable[str], trip: dict, batch_size: int = IMPORT_BATCH) -> Iterator[tuple[list[dict], int]]:
+    # -> (batch items, aantal overgeslagen events sinds vorige batch)
+    tz = ZoneInfo(trip.get("timezone") or DEFAULT_TZ)
+    batch, skipped = [], 0
+    for event in iter_events(lines, tz):
+        item = event_to_item(event, trip)
+        if item is None:
+            skipped += 1
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch, skipped
+            batch, skipped = [], 0
+    if batch or skipped:
+        yield batch, skipped
+
+
+@jobs.register(IMPORT_JOB, retry_on=())
+def import_job(ctx, upload: BinaryIO, trip: dict) -> dict:
+    # Achtergrondjob (src/jobs.py): het bestand wordt gestreamd en elke batch meteen weggeschreven
+    # (ctx.emit); de pagina voegt ze per batch toe. Het resultaat bevat enkel de aantallen.
+    size = max(upload.seek(0, io.SEEK_END), 1)
+    upload.seek(0)
+    lines = io.TextIOWrapper(upload, encoding="utf-8", errors="replace")
+    imported = skipped = 0
+    try:
+        for batch, batch_skipped in iter_item_batches(lines, trip):
+            if batch:
+                ctx.emit(batch)
+            imported += len(batch)
+            skipped += batch_skipped
+            ctx.progress(upload.tell() / size, "import.progress", n=imported)
+    finally:
+        lines.detach()  # het upload-object zelf niet sluiten
+    return {"imported": imported, "skipped": skipped}
@@ -0,0 +1,312 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from tenacity import (
+    Retrying,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    stop_when_event_set,
+    wait_exponential,
+)
+
+from src.storage import get_store
+
+# -----------------------------
+# Achtergrondtaken: thread pool + persistente job tabel, annuleren, retries en voortgang
+# -----------------------------
+#   @register("kind")                      fn(ctx, **params) -> JSON-baar resultaat
+#   job_id = submit("kind", label=..., dedupe_key=..., **params)  (retry=True: mislukte job opnieuw)
+#   status(job_id) / result(job_id) / cancel(job_id) / poll(job_id) (Streamlit fragment)
+#   ctx.emit(batch) in de job + outputs(job_id) op de pagina: grote output per stuk via storage
+#   ctx.progress(f, "catalog.key", **params): boodschappen (en labels) als key, vertaald op de pagina met text()
+# Threads, geen processen: jobs delen de store en de resultaten in dit proces.
+# Enkel de NumPy simulatie (simulate) geeft de GIL vrij en loopt echt parallel over de cores.
+# De .ics import (ics_import) is pure Python parsing en houdt de GIL vast: die loopt niet
+# parallel, maar deelt de CPU met de Streamlit script threads (in batches, dus responsief).
+MAX_WORKERS = int(os.environ.get("TRIPBUILDER_JOB_WORKERS", str(min(4, os.cpu_count() or 1))))
+MAX_ATTEMPTS = 3
+MAX_RESULTS = 64
+PROGRESS_EVERY_S = 0.25
+KEEP_JOBS_S = 7 * 24 * 3600
+
+ACTIVE = ("queued", "running")
+FAILED = ("failed", "cancelled")
+# Standaard enkel tijdelijke fouten opnieuw proberen (parsefouten e.d. worden niet beter)
+TRANSIENT = (OSError, TimeoutError, sqlite3.OperationalError)
+
+
+# Eigenaar van de jobs van dit proces: bij het opstarten worden enkel jobs van verdwenen runners afgesloten
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_gone(owner: str | None) -> bool:
+    if owner is None:
+        return True  # job van voor de owner kolom
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False  # ander toestel/container: niet na te gaan, laten staan
+    if int(pid) == os.getpid():
+        return True  # zelfde pid (bv. pid 1 in een container): vorige run, dit proces heeft nog niets gestart
+    if os.name != "posix":
+        return False  # os.kill(pid, 0) beëindigt het proces op Windows
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False  # bestaat wel (bv. PermissionError)
+    return False
+
+
+def message(key: str, **params) -> str:
+    # Boodschap als catalog key + parameters: t() werkt enkel in de script thread (taal van de sessie)
+    return json.dumps([key, params])
+
+
+def text(value: str | None) -> str:
+    # Bewaarde boodschap of fout in de taal van de huidige sessie; vrije tekst (exceptions) blijft zoals hij is
+    from src.i18n import number, t
+
+    if not value:
+        return ""
+    try:
+        key, params = json.loads(value)
+    except (ValueError, TypeError):
+        return value
+    return t(key, **{k: number(v) if isinstance(v, (int, float)) else v for k, v in params.items()})
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    # Wordt aan de job functie meegegeven: voortgang melden + annulering opmerken
+    def __init__(self, job_id: str, cancel_event: threading.Event):
+        self.job_id = job_id
+        self._cancel = cancel_event
+        self._last = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, fraction: float, key: str = "", **params):
+        # Gethrottled naar storage; tussenin enkel de annulering checken
+        self.check()
+        now = time.monotonic()
+        if now - self._last < PROGRESS_EVERY_S and fraction < 1:
+            return
+        self._last = now
+        get_store().update_job(
+            self.job_id,
+            progress=min(max(float(fraction), 0.0), 1.0),
+            message=message(key, **params) if key else "",
+        )
+
+    def emit(self, value):
+        # Tussentijdse output meteen naar storage i.p.v. alles in het resultaat te verzamelen.
+        # Niet teruggedraaid bij een nieuwe poging: enkel voor jobs zonder retry (of idempotente output).
+        self.check()
+        get_store().add_job_output(self.job_id, json.dumps(value, default=str))
+
+
+_registry: dict[str, tuple[Callable, tuple]] = {}
+_executor: ThreadPoolExecutor | None = None
+_futures: dict[str, Future] = {}
+_cancel: dict[str, threading.Event] = {}
+_by_key: dict[str, str] = {}  # dedupe_key -> job_id (in dit proces)
+_results: OrderedDict[str, object] = OrderedDict()
+_lock = threading.Lock()
+
+
+def register(kind: str, retry_on: tuple = TRANSIENT):
+    def decorator(fn: Callable) -> Callable:
+        _registry[kind] = (fn, retry_on)
+        return fn
+
+    return decorator
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # Nieuw proces: jobs van gestopte runners lopen niet meer, oude jobs opruimen.
+            # Andere levende processen op dezelfde database houden hun jobs.
+            store = get_store()
+            gone = {owner for owner in store.active_job_owners() if _owner_gone(owner)}
+            store.interrupt_jobs(gone, error=message("jobs.interrupted"))
+            store.purge_jobs(KEEP_JOBS_S)
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="tripbuilder-job")
+        return _executor
+
+
+def submit(
+    kind: str,
+    label: str = "",
+    dedupe_key: str | None = None,
+    max_attempts: int = MAX_ATTEMPTS,
+    retry: bool = False,
+    **params,
+) -> str:
+    if kind not in _registry:
+        raise ValueError(f"Onbekend job type: {kind!r}")
+    pool = _pool()
+    store = get_store()
+    with _lock:
+        if dedupe_key:
+            # Zelfde invoer = zelfde job, ook als die mislukt is: enkel opnieuw bij een expliciete retry
+            existing = find(dedupe_key)
+            job = status(existing) if existing is not None else None
+            if job is not None and not (retry and job["status"] in FAILED):
+                return existing
+        job_id = uuid.uuid4().hex[:12]
+        store.create_job(job_id, kind, label or kind, dedupe_key, owner=OWNER)
+        _cancel[job_id] = threading.Event()
+        if dedupe_key:
+            _by_key[dedupe_key] = job_id
+        _futures[job_id] = pool.submit(_run, job_id, kind, params, max_attempts)
+    return job_id
+
+
+def _run(job_id: str, kind: str, params: dict, max_attempts: int):
+    store = get_store()
+    fn, retry_on = _registry[kind]
+    cancel_event = _cancel[job_id]
+    ctx = JobContext(job_id, cancel_event)
+    store.update_job(job_id, status="running")
+    try:
+        for attempt in Retrying(
+            stop=stop_after_attempt(max_attempts) | stop_when_event_set(cancel_event),
+            wait=wait_exponential(multiplier=0.5, max=5),
+            retry=retry_if_exception_type(retry_on) & retry_if_not_exception_type(JobCancelled),
+            reraise=True,
+        ):
+            with attempt:
+                store.update_job(job_id, attempts=attempt.retry_state.attempt_number, error=None)
+                ctx.check()
+                value = fn(ctx, **params)
+    except JobCancelled:
+        store.update_job(job_id, status="cancelled", message=message("jobs.cancelled"))
+    except Exception as e:
+        store.update_job(job_id, status="failed", error=f"{type(e).__name__}: {e}")
+    else:
+        _remember(job_id, value)
+        store.update_job(job_id, status="done", progress=1.0, result=json.dumps(value, default=str))
+    finally:
+        with _lock:
+            _futures.pop(job_id, None)
+            _cancel.pop(job_id, None)
+
+
+def _remember(job_id: str, value):
+    with _lock:
+        _results[job_id] = value
+        _results.move_to_end(job_id)
+        while len(_results) > MAX_RESULTS:
+            _results.popitem(last=False)
+
+
+def find(dedupe_key: str) -> str | None:
+    # Meest recente job met dezelfde invoer, in elke status (zie status() voor de uitkomst)
+    job_id = _by_key.get(dedupe_key)
+    if job_id is not None and (job_id in _futures or job_id in _results):
+        return job_id
+    job = get_store().find_job(dedupe_key)
+    if job is None:
+        return None
+    _by_key[dedupe_key] = job["job_id"]
+    return job["job_id"]
+
+
+def status(job_id: str) -> dict | None:
+    return get_store().get_job(job_id)
+
+
+def result(job_id: str):
+    # None zolang de job niet (succesvol) klaar is
+    with _lock:
+        if job_id in _results:
+            _results.move_to_end(job_id)
+            return _results[job_id]
+    raw = get_store().job_result(job_id)
+    if raw is None:
+        return None
+    value = json.loads(raw)
+    _remember(job_id, value)
+    return value
+
+
+def cancel(job_id: str) -> bool:
+    store = get_store()
+    with _lock:
+        event, future = _cancel.get(job_id), _futures.get(job_id)
+    if event is None:
+        return False
+    event.set()
+    if future is not None and future.cancel():
+        # Nog niet gestart: meteen afsluiten
+        store.update_job(job_id, status="cancelled", message=message("jobs.cancelled"))
+        with _lock:
+            _futures.pop(job_id, None)
+            _cancel.pop(job_id, None)
+    return True
+
+
+def outputs(job_id: str, chunk: int = 8) -> Iterator:
+    # Uitgestuurde output (ctx.emit) in volgorde, per paar stuks uit storage gehaald en verwijderd
+    store = get_store()
+    while True:
+        rows = store.take_job_outputs(job_id, chunk)
+        if not rows:
+            return
+        for raw in rows:
+            yield json.loads(raw)
+
+
+def discard_outputs(job_id: str):
+    get_store().delete_job_outputs(job_id)
+
+
+def recent(limit: int = 20) -> list[dict]:
+    return get_store().list_jobs(limit)
+
+
+# -----------------------------
+# Streamlit: lichte polling fragment (herlaadt enkel dit blok tot de job klaar is)
+# -----------------------------
+def poll(job_id: str, interval_s: float = 1.0, cancellable: bool = True):
+    import streamlit as st
+
+    from src.i18n import t
+
+    @st.fragment(run_every=interval_s)
+    def _poll():
+        job = status(job_id)
+        if job is None or job["status"] not in ACTIVE:
+            st.rerun()  # volledige rerun: de pagina verwerkt het resultaat
+            return
+        bar, stop = st.columns([5, 1]) if cancellable else (st.container(), None)
+        label = text(job["message"]) or (t("jobs.queued") if job["status"] == "queued" else f"{text(job['label'])}…")
+        if job["attempts"] > 1:
+            label += t("jobs.attempt", n=job["attempts"])
+        bar.progress(job["progress"], text=label)
+        if stop is not None and stop.button(t("jobs.cancel"), key=f"cancel_{job_id}"):
+            cancel(job_id)
+            st.rerun()
+
+    _poll()
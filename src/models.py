@@ -0,0 +1,104 @@
+import uuid
+from datetime import date
+
+# -----------------------------
+# Shared data model (één schema voor alle pagina's)
+# -----------------------------
+CATEGORIES = ["Activities", "Museums", "Food", "Transport", "Nature", "Shopping", "Nightlife", "Other"]
+
+INTERESTS = ["Food", "Culture", "Nature", "Nightlife", "Museums", "Shopping", "Tech", "Beaches", "History"]
+
+DEFAULT_TIMEZONE = "Europe/Brussels"
+
+ITEM_COLUMNS = ["day", "time", "title", "category", "cost", "tags"]
+
+# "hours"/"closed": openingsuren + uitzonderingen, zie src/hours.py
+TEMPLATES = [
+    {"title": "City walking tour", "category": "Activities", "cost": 25, "time": "10:00", "hours": "Mo-Su 09:00-18:00"},
+    {
+        "title": "Museum visit",
+        "category": "Museums",
+        "cost": 18,
+        "time": "11:00",
+        "hours": "Tu-Su 10:00-18:00",
+        "closed": {"01-01": "off", "12-25": "off", "12-31": "10:00-14:00"},
+    },
+    {"title": "Lunch at local spot", "category": "Food", "cost": 20, "time": "13:00", "hours": "Mo-Sa 11:30-15:00"},
+    {"title": "Public transport day pass", "category": "Transport", "cost": 9, "time": "09:00", "hours": "24/7"},
+    {"title": "Sunset viewpoint", "category": "Nature", "cost": 0, "time": "19:00", "hours": "24/7"},
+    {"title": "Dinner reservation", "category": "Food", "cost": 35, "time": "20:00", "hours": "Tu-Su 18:00-23:00"},
+]
+
+
+def empty_trip() -> dict:
+    return {
+        "destination": "",
+        "start_date": date.today(),
+        "end_date": date.today(),
+        "budget_eur": 0,
+        "travelers": 1,
+        "interests": [],
+        "notes": "",
+        "timezone": DEFAULT_TIMEZONE,
+        "people": [],  # namen van de reizigers (optioneel, zie src/settle.py)
+    }
+
+
+def default_trip() -> dict:
+    # Startwaarden voor een nieuwe sessie
+    trip = empty_trip()
+    trip["destination"] = "Barcelona"
+    trip["budget_eur"] = 800
+    trip["interests"] = ["Food", "Culture"]
+    return trip
+
+
+def demo_items() -> list[dict]:
+    return [
+        {"day": 1, "time": "10:00", "title": "Senso-ji Temple", "cost": 0, "lat": 35.7148, "lon": 139.7967},
+        {"day": 1, "time": "13:00", "title": "Ramen lunch", "cost": 25, "lat": 35.6938, "lon": 139.7034},
+        {"day": 2, "time": "09:00", "title": "Akihabara walk", "cost": 0, "lat": 35.6984, "lon": 139.7731},
+    ]
+
+
+def new_item_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def new_trip_id() -> str:
+    return uuid.uuid4().hex[:10]
+
+
+def with_ids(items: list[dict]) -> list[dict]:
+    # Oudere items (demo, gespilde sessies) hebben nog geen id
+    for item in items:
+        if not item.get("id"):
+            item["id"] = new_item_id()
+    return items
+
+
+def default_ui() -> dict:
+    return {"show_tips": True, "last_saved": None}
+
+
+# -----------------------------
+# (De)serialisatie: dates <-> ISO strings
+# -----------------------------
+TRIP_DATE_FIELDS = ("start_date", "end_date")
+
+
+def trip_to_dict(trip: dict) -> dict:
+    data = dict(trip)
+    for key in TRIP_DATE_FIELDS:
+        if isinstance(data.get(key), date):
+            data[key] = data[key].isoformat()
+    return data
+
+
+def trip_from_dict(data: dict) -> dict:
+    trip = empty_trip()
+    trip.update(data)
+    for key in TRIP_DATE_FIELDS:
+        if isinstance(trip[key], str):
+            trip[key] = date.fromisoformat(trip[key])
+    return trip
@@ -0,0 +1,61 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from src.deps import numpy
+from src.utils import as_int, trip_days
+
+# -----------------------------
+# Budget pacing: cumulatieve geplande kost vs. een lineaire budgetcurve over de tripdagen
+# -----------------------------
+# Waarschuwen als de planning meer dan PACE_MARGIN voor loopt op de curve
+PACE_MARGIN = 0.15
+
+
+class DailyCosts:
+    # Kost per dag, incrementeel bijgehouden (add/remove) i.p.v. telkens te groeperen
+
+    def __init__(self):
+        self.per_day: dict[int, int] = defaultdict(int)
+
+    @classmethod
+    def from_items(cls, items: list[dict]) -> "DailyCosts":
+        costs = cls()
+        for item in items:
+            costs.add(item)
+        return costs
+
+    def add(self, item: dict):
+        self.per_day[as_int(item.get("day", 1))] += as_int(item.get("cost", 0))
+
+    def remove(self, item: dict):
+        day = as_int(item.get("day", 1))
+        self.per_day[day] -= as_int(item.get("cost", 0))
+        if not self.per_day[day]:
+            del self.per_day[day]
+
+
+def pace(trip: dict, per_day: dict[int, int]) -> dict:
+    np = numpy()
+    n = trip_days(trip, minimum=1)
+    daily = np.zeros(n, dtype=np.int64)
+    for day, cost in per_day.items():
+        # Items buiten de trip tellen mee op de dichtstbijzijnde dag
+        daily[min(max(day, 1), n) - 1] += cost
+    cumulative = np.cumsum(daily)
+    budget = int(trip.get("budget_eur", 0))
+    curve = budget * np.arange(1, n + 1) / n
+
+    over = np.flatnonzero(cumulative > budget) if budget > 0 else np.array([], dtype=np.int64)
+    cross_day = int(over[0]) + 1 if over.size else None
+    ahead = cumulative - curve
+    worst = int(np.argmax(ahead))
+    ahead_day = worst + 1 if budget > 0 and ahead[worst] > PACE_MARGIN * budget else None
+    return {
+        "dates": [trip["start_date"] + timedelta(days=i) for i in range(n)],
+        "daily": daily.tolist(),
+        "cumulative": cumulative.tolist(),
+        "curve": curve.round().astype(np.int64).tolist(),
+        "cross_day": cross_day,
+        "ahead_day": ahead_day,
+        "ahead_eur": int(ahead[worst]),
+    }
@@ -0,0 +1,228 @@
+import csv
+from datetime import timedelta
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable
+
+from src.utils import as_int, parse_tags, trip_days
+
+# -----------------------------
+# Paklijst: regels (categorie / tag / interesse / klimaat) -> items met een hoeveelheid
+# -----------------------------
+# Klimaat komt uit een gebundelde, offline tabel met (benaderde) maandnormalen per bestemming.
+CLIMATE_CSV = Path(__file__).parent / "data" / "climate_normals.csv"
+
+# Bestemmingen zoals mensen ze typen -> naam in de klimaattabel
+ALIASES = {
+    "brussel": "brussels",
+    "bruxelles": "brussels",
+    "parijs": "paris",
+    "roma": "rome",
+    "lissabon": "lisbon",
+    "lisboa": "lisbon",
+    "londen": "london",
+    "londres": "london",
+    "tokio": "tokyo",
+    "kaapstad": "cape town",
+    "le cap": "cape town",
+    "new york city": "new york",
+    "nyc": "new york",
+    "marrakesh": "marrakech",
+    "reykjavík": "reykjavik",
+}
+
+# Drempels voor de klimaatvoorwaarden
+HOT_TMAX_C = 25
+COLD_TMIN_C = 5
+RAIN_DAYS = 10
+
+# Sectie voor items die de gebruiker zelf toevoegt. Secties en items van de regels zijn
+# brontekst (en deel van de afvinkkeys): de pagina vertaalt ze via packing.section.* / packing.item.*
+CUSTOM_SECTION = "Eigen items"
+
+# Na een week wordt er gewassen: kleding per dag stopt daar
+LAUNDRY_DAYS = 7
+
+QUANTITY = {
+    "trip": lambda days, people: 1,
+    "person": lambda days, people: people,
+    "2days": lambda days, people: people * -(-min(days, LAUNDRY_DAYS) // 2),
+    "day": lambda days, people: people * min(days, LAUNDRY_DAYS),
+}
+
+# (voorwaarde, sectie, item, hoeveelheid)
+RULES = [
+    ("always", "Documenten", "Paspoort / ID-kaart", "person"),
+    ("always", "Documenten", "Reisverzekering + noodnummers", "trip"),
+    ("always", "Documenten", "Bankkaart + wat cash", "person"),
+    ("always", "Kleding", "Ondergoed", "day"),
+    ("always", "Kleding", "Sokken", "day"),
+    ("always", "Kleding", "T-shirts", "2days"),
+    ("always", "Kleding", "Broek / rok", "person"),
+    ("always", "Toilettas", "Tandenborstel + tandpasta", "person"),
+    ("always", "Toilettas", "Deodorant", "person"),
+    ("always", "Gezondheid", "Persoonlijke medicatie", "person"),
+    ("always", "Elektronica", "Telefoon + lader", "person"),
+    ("climate:hot", "Kleding", "Korte broek", "2days"),
+    ("climate:hot", "Gezondheid", "Zonnecrème", "trip"),
+    ("climate:hot", "Accessoires", "Zonnebril", "person"),
+    ("climate:hot", "Accessoires", "Pet / hoed", "person"),
+    ("climate:hot", "Accessoires", "Herbruikbare drinkfles", "person"),
+    ("climate:cold", "Kleding", "Warme jas", "person"),
+    ("climate:cold", "Kleding", "Muts, sjaal en handschoenen", "person"),
+    ("climate:cold", "Kleding", "Warme trui", "2days"),
+    ("climate:cold", "Kleding", "Thermisch ondergoed", "person"),
+    ("climate:rain", "Kleding", "Regenjas", "person"),
+    ("climate:rain", "Accessoires", "Paraplu", "trip"),
+    ("climate:rain", "Accessoires", "Waterdichte schoenen", "person"),
+    ("category:activities", "Kleding", "Comfortabele wandelschoenen", "person"),
+    ("category:nature", "Kleding", "Stevige wandelschoenen", "person"),
+    ("category:nature", "Accessoires", "Dagrugzak", "person"),
+    ("category:nature", "Gezondheid", "Insectenspray", "trip"),
+    ("category:nature", "Gezondheid", "EHBO-setje", "trip"),
+    ("category:museums", "Documenten", "Tickets / museumpas (geprint of op gsm)", "trip"),
+    ("category:transport", "Documenten", "Vervoersbewijzen / OV-kaart", "person"),
+    ("category:transport", "Elektronica", "Powerbank", "trip"),
+    ("category:food", "Documenten", "Reservaties (bevestigingen)", "trip"),
+    ("category:nightlife", "Kleding", "Nette outfit", "person"),
+    ("category:shopping", "Accessoires", "Opvouwbare boodschappentas", "trip"),
+    ("tag:beach", "Kleding", "Zwemkledij", "person"),
+    ("tag:beach", "Accessoires", "Strandhanddoek", "person"),
+    ("tag:beach", "Kleding", "Slippers", "person"),
+    ("tag:kids", "Accessoires", "Snacks + speelgoed voor onderweg", "trip"),
+    ("interest:beaches", "Kleding", "Zwemkledij", "person"),
+    ("interest:beaches", "Accessoires", "Strandhanddoek", "person"),
+    ("interest:nature", "Kleding", "Stevige wandelschoenen", "person"),
+    ("interest:tech", "Elektronica", "Powerbank", "trip"),
+    ("interest:tech", "Elektronica", "Reisstekker / adapter", "trip"),
+    ("interest:culture", "Kleding", "Schouders/knieën bedekkend (kerken, tempels)", "person"),
+]
+
+# Grootste hoeveelheid wint als meerdere regels hetzelfde item vragen
+_QUANTITY_RANK = {name: i for i, name in enumerate(QUANTITY)}
+
+
+@lru_cache(maxsize=1)
+def rule_table() -> dict[str, tuple[tuple[str, str, str], ...]]:
+    # Eén keer gecompileerd: voorwaarde -> (sectie, item, hoeveelheid)
+    table: dict[str, list] = {}
+    for condition, section, item, quantity in RULES:
+        if quantity not in QUANTITY:
+            raise ValueError(f"Onbekende hoeveelheid {quantity!r} voor {item!r}")
+        table.setdefault(condition, []).append((section, item, quantity))
+    return {condition: tuple(rules) for condition, rules in table.items()}
+
+
+@lru_cache(maxsize=1)
+def _climate_table() -> dict[tuple[str, int], dict]:
+    with open(CLIMATE_CSV, newline="", encoding="utf-8") as f:
+        return {
+            (row["destination"].lower(), int(row["month"])): {
+                "tmin_c": int(row["tmin_c"]),
+                "tmax_c": int(row["tmax_c"]),
+                "rain_mm": int(row["rain_mm"]),
+                "rain_days": int(row["rain_days"]),
+            }
+            for row in csv.DictReader(f)
+        }
+
+
+def destination_key(destination: str) -> str:
+    # "Barcelona, Spain" -> "barcelona"
+    name = str(destination or "").split(",")[0].strip().lower()
+    return ALIASES.get(name, name)
+
+
+def climate_for(destination: str, month: int) -> dict | None:
+    # None = bestemming niet in de gebundelde tabel
+    return _climate_table().get((destination_key(destination), month))
+
+
+def trip_month(trip: dict) -> int:
+    # Maand van de middelste tripdag (lange trips over een maandgrens)
+    return (trip["start_date"] + timedelta(days=(trip_days(trip, minimum=1) - 1) // 2)).month
+
+
+def climate_conditions(climate: dict | None) -> list[str]:
+    if climate is None:
+        return []
+    out = []
+    if climate["tmax_c"] >= HOT_TMAX_C:
+        out.append("hot")
+    if climate["tmin_c"] <= COLD_TMIN_C:
+        out.append("cold")
+    if climate["rain_days"] >= RAIN_DAYS:
+        out.append("rain")
+    return out
+
+
+@lru_cache(maxsize=512)
+def needs(
+    destination: str, month: int, categories: frozenset, tags: frozenset, interests: frozenset
+) -> tuple[tuple[str, str, str], ...]:
+    # Gememoiseerd per (bestemming, maand, categorieën, tags, interesses): alleen dict lookups
+    table = rule_table()
+    conditions = ["always"]
+    conditions += [f"climate:{c}" for c in climate_conditions(climate_for(destination, month))]
+    conditions += [f"category:{c.lower()}" for c in sorted(categories)]
+    conditions += [f"tag:{t}" for t in sorted(tags)]
+    conditions += [f"interest:{i.lower()}" for i in sorted(interests)]
+
+    picked: dict[str, tuple[str, str, str]] = {}
+    for condition in conditions:
+        for rule in table.get(condition, ()):
+            current = picked.get(rule[1])
+            if current is None or _QUANTITY_RANK[rule[2]] > _QUANTITY_RANK[current[2]]:
+                picked[rule[1]] = rule
+    return tuple(picked.values())
+
+
+def generate(trip: dict, items: list[dict]) -> list[dict]:
+    # -> [{"section", "item", "qty"}], hoeveelheden geschaald op dagen x reizigers
+    categories = frozenset(x.get("category") or "Other" for x in items)
+    tags = frozenset(t for x in items for t in parse_tags(x.get("tags")))
+    rules = needs(
+        destination_key(trip.get("destination", "")),
+        trip_month(trip),
+        categories,
+        tags,
+        frozenset(trip.get("interests") or []),
+    )
+    days = trip_days(trip, minimum=1)
+    people = max(1, as_int(trip.get("travelers", 1)))
+    return [
+        {"section": section, "item": item, "qty": QUANTITY[quantity](days, people)}
+        for section, item, quantity in sorted(rules)
+    ]
+
+
+def checklist_key(row: dict) -> str:
+    # Afvinkstatus + widget keys per sectie: een eigen item met dezelfde naam botst niet met een regel
+    return f"{row['section']}|{row['item']}"
+
+
+def custom_rows(checklist: dict[str, dict]) -> list[dict]:
+    # Eigen items uit de (opgeslagen) afvinklijst terug als rijen van de paklijst
+    return [
+        {"section": CUSTOM_SECTION, "item": key.split("|", 1)[-1], "qty": 1}
+        for key, entry in checklist.items()
+        if entry.get("custom")
+    ]
+
+
+def to_markdown(
+    packing: list[dict],
+    checked: dict[str, bool],
+    section_label: Callable[[str], str] = str,
+    item_label: Callable[[dict], str] = itemgetter("item"),
+) -> str:
+    # section_label / item_label: weergavenamen (vertaald), standaard de brontekst
+    lines, section = [], None
+    for row in packing:
+        if row["section"] != section:
+            section = row["section"]
+            lines += ["", f"## {section_label(section)}"]
+        mark = "x" if checked.get(checklist_key(row)) else " "
+        lines.append(f"- [{mark}] {row['qty']}× {item_label(row)}")
+    return "\n".join(lines).strip() + "\n"
@@ -0,0 +1,151 @@
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+
+from src.deps import numpy
+from src.models import TEMPLATES
+
+# -----------------------------
+# Aanbevelingen: TF-IDF vectoren + inverted index, top-k cosine
+# -----------------------------
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_index_lock = threading.Lock()
+_index_cache: dict[str, object] = {}
+
+
+def tokens(item: dict) -> list[str]:
+    words = TOKEN_RE.findall(str(item.get("title", "")).lower())
+    category = str(item.get("category") or "Other").lower()
+    tags = [f"tag:{t.strip().lower()}" for t in item.get("tags") or [] if str(t).strip()]
+    return words + [f"cat:{category}"] + tags
+
+
+def interest_tokens(interests) -> list[str]:
+    # Een interesse matcht zowel titelwoorden als de categorie/tag met die naam
+    out = []
+    for interest in interests:
+        word = str(interest).lower()
+        out += [word, f"cat:{word}", f"tag:{word}"]
+    return out
+
+
+class VectorIndex:
+    # Documenten = token lijsten; per token een posting list (doc ids + genormaliseerd gewicht)
+
+    def __init__(self, docs: list[list[str]]):
+        np = numpy()
+        df = Counter(t for doc in docs for t in set(doc))
+        n = max(len(docs), 1)
+        self.idf = {t: math.log((1 + n) / (1 + c)) + 1.0 for t, c in df.items()}
+        self.n_docs = len(docs)
+
+        postings: dict[str, tuple[list[int], list[float]]] = {}
+        for doc_id, doc in enumerate(docs):
+            tf = Counter(doc)
+            weights = {t: c * self.idf[t] for t, c in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for t, w in weights.items():
+                ids, ws = postings.setdefault(t, ([], []))
+                ids.append(doc_id)
+                ws.append(w / norm)
+        self.postings = {
+            t: (np.asarray(ids, dtype=np.int32), np.asarray(ws, dtype=np.float32)) for t, (ids, ws) in postings.items()
+        }
+
+    def query_vector(self, query: list[str]) -> dict[str, float]:
+        tf = Counter(t for t in query if t in self.idf)
+        weights = {t: c * self.idf[t] for t, c in tf.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {t: w / norm for t, w in weights.items()}
+
+    def search(self, query: list[str] | dict[str, float], k: int = 5, exclude: set[int] | None = None) -> list[tuple[int, float]]:
+        np = numpy()
+        q = query if isinstance(query, dict) else self.query_vector(query)
+        if not q or not self.n_docs:
+            return []
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for t, wq in q.items():
+            ids, ws = self.postings[t]
+            scores[ids] += wq * ws
+        if exclude:
+            scores[list(exclude)] = 0
+        k = min(k, self.n_docs)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+class Catalog:
+    def __init__(self, entries: list[dict], trips: dict[str, dict]):
+        self.entries = entries
+        self.items = VectorIndex([tokens(x) for x in entries])
+        self.trip_ids = list(trips)
+        self.trip_meta = [trips[t]["meta"] for t in self.trip_ids]
+        self.trips = VectorIndex([trips[t]["tokens"] for t in self.trip_ids])
+
+    def like_interests(self, interests, k: int = 5) -> list[dict]:
+        return [{**self.entries[i], "score": s} for i, s in self.items.search(interest_tokens(interests), k)]
+
+    def like_item(self, item: dict, k: int = 5) -> list[dict]:
+        key = (str(item.get("title", "")).lower(), item.get("category"))
+        hits = self.items.search(tokens(item), k + 1)
+        return [{**self.entries[i], "score": s} for i, s in hits if _entry_key(self.entries[i]) != key][:k]
+
+    def like_trip(self, items: list[dict], interests=(), k: int = 5, exclude_trip: str | None = None) -> list[dict]:
+        query = interest_tokens(interests) + [t for x in items for t in tokens(x)]
+        exclude = {self.trip_ids.index(exclude_trip)} if exclude_trip in self.trip_ids else None
+        return [{**self.trip_meta[i], "score": s} for i, s in self.trips.search(query, k, exclude)]
+
+
+def _entry_key(item: dict) -> tuple:
+    return (str(item.get("title", "")).lower(), item.get("category"))
+
+
+def build_catalog(archived: list[tuple[str, dict, dict]]) -> Catalog:
+    # archived: (trip_id, trip meta, item); items worden ontdubbeld op (titel, categorie)
+    entries: dict[tuple, dict] = {}
+    trips: dict[str, dict] = {}
+    for template in TEMPLATES:
+        entries[_entry_key(template)] = {**template, "tags": [], "count": 0}
+    for trip_id, meta, item in archived:
+        key = _entry_key(item)
+        if key not in entries:
+            entries[key] = {
+                "title": item.get("title", ""),
+                "category": item.get("category") or "Other",
+                "cost": item.get("cost", 0),
+                "time": item.get("time", ""),
+                "tags": list(item.get("tags") or []),
+                "count": 0,
+            }
+        entries[key]["count"] += 1
+        trip = trips.setdefault(trip_id, {"meta": meta, "tokens": []})
+        trip["tokens"] += tokens(item)
+    return Catalog(list(entries.values()), trips)
+
+
+def get_catalog(store) -> Catalog:
+    # Eén index per proces, herbouwd als het archief veranderd is
+    version = store.archive_version()
+    with _index_lock:
+        hit = _index_cache.get("catalog")
+        if hit is None or hit[0] != version:
+            hit = (version, build_catalog(store.archive_items()))
+            _index_cache["catalog"] = hit
+            _suggest.cache_clear()
+    return hit[1]
+
+
+def suggestions(store, interests, k: int = 5) -> list[dict]:
+    get_catalog(store)
+    return list(_suggest(frozenset(interests), k))
+
+
+@lru_cache(maxsize=256)
+def _suggest(interests: frozenset, k: int) -> tuple:
+    # Gecachet per interesse-set; geleegd zodra de catalogus herbouwd wordt
+    catalog = _index_cache["catalog"][1]
+    return tuple(catalog.like_interests(sorted(interests), k))
@@ -0,0 +1,179 @@
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.app_session import AppSessionState
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.state.safe_session_state import SafeSessionState
+
+from src.storage import get_store
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Geheugenbudget per sessie + idle sessies naar storage spillen
+# -----------------------------
+SESSION_CAP_BYTES = int(float(os.environ.get("TRIPBUILDER_SESSION_MB", "25")) * 1024 * 1024)
+IDLE_TIMEOUT_S = float(os.environ.get("TRIPBUILDER_IDLE_MINUTES", "30")) * 60
+SWEEP_INTERVAL_S = 60.0
+
+# Wat we bij een idle sessie wegschrijven en uit het geheugen halen
+SPILL_KEYS = ("trip", "draft_items", "activity")
+# Afgeleide data (DataFrames, figuren, ...) mag altijd weg: wordt opnieuw berekend
+CACHE_PREFIX = "_cache_"
+SPILLED_FLAG = "_spilled_at"
+
+
+# Zwakke referenties naar de SessionState van elke sessie: een gesloten sessie wordt
+# gewoon opgeruimd door de garbage collector, niet pas bij de volgende sweep.
+_registry: "weakref.WeakValueDictionary[str, object]" = weakref.WeakValueDictionary()
+_last_seen: dict[str, float] = {}
+_over_budget: set[str] = set()  # sessies die zonder caches nog boven de cap zitten
+_registry_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+def estimate_bytes(obj, _seen: set | None = None) -> int:
+    # Ruwe schatting (sys.getsizeof recursief); numpy/arrow/pandas via hun eigen tellers
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):
+        return int(obj.memory_usage(deep=True).sum())
+    if hasattr(obj, "nbytes") and not isinstance(obj, (str, bytes)):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_bytes(k, seen) + estimate_bytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_bytes(v, seen) for v in obj)
+    return size
+
+
+def session_usage() -> dict[str, int]:
+    return {key: estimate_bytes(st.session_state[key]) for key in list(st.session_state.keys())}
+
+
+def _session_id() -> str | None:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def _claim_session():
+    # Eerste stap van elke run: onder de registry lock als actief markeren, zodat een
+    # sweep uit een andere sessie deze sessie niet meer spilt terwijl haar script loopt
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with _registry_lock:
+        # De SafeSessionState wrapper leeft maar zo lang als de script runner: de SessionState
+        # zelf (eigendom van de AppSession) is wat we later willen spillen
+        _registry[ctx.session_id] = ctx.session_state._state
+        _last_seen[ctx.session_id] = time.time()
+
+
+def _script_running(session_id: str) -> bool:
+    # Loopt er nu een script run voor deze sessie? (buiten een server, bv. AppTest: nee)
+    if not Runtime.exists():
+        return False
+    info = Runtime.instance()._session_mgr.get_active_session_info(session_id)
+    return info is not None and info.session._state == AppSessionState.APP_IS_RUNNING
+
+
+def rehydrate_session():
+    # Moet vóór init_state() draaien, anders overschrijven defaults de gespilde trip
+    _claim_session()
+    if SPILLED_FLAG not in st.session_state:
+        return
+    restored = get_store().restore_session(_session_id()) or {}
+    for key, value in restored.items():
+        st.session_state[key] = value
+    del st.session_state[SPILLED_FLAG]
+
+
+def enforce_budget() -> int:
+    # Eerst de grootste caches laten vallen tot we onder de cap zitten
+    usage = session_usage()
+    total = sum(usage.values())
+    caches = sorted((k for k in usage if k.startswith(CACHE_PREFIX)), key=usage.get, reverse=True)
+    for key in caches:
+        if total <= SESSION_CAP_BYTES:
+            break
+        total -= usage[key]
+        del st.session_state[key]
+    # Nog steeds te groot (de items zelf): tussen de runs in storage houden i.p.v. in het geheugen.
+    # De volgende sweep spilt de sessie zodra haar script niet meer loopt, de volgende run zet ze terug.
+    session_id = _session_id()
+    with _registry_lock:
+        if total > SESSION_CAP_BYTES and session_id is not None:
+            if session_id not in _over_budget:
+                logger.warning(
+                    "Sessie %s boven het geheugenbudget (%.1f MB > %.1f MB): wordt tussen runs gespild",
+                    session_id,
+                    total / 1024 / 1024,
+                    SESSION_CAP_BYTES / 1024 / 1024,
+                )
+            _over_budget.add(session_id)
+        else:
+            _over_budget.discard(session_id)
+    return total
+
+
+def spill(session_id: str, state) -> bool:
+    if SPILLED_FLAG in state:
+        return False
+    payload = {key: state[key] for key in SPILL_KEYS if key in state}
+    get_store().spill_session(session_id, payload)
+    for key in list(SPILL_KEYS) + [k for k in state.filtered_state if k.startswith(CACHE_PREFIX)]:
+        if key in state:
+            del state[key]
+    state[SPILLED_FLAG] = time.time()
+    return True
+
+
+def sweep_idle(now: float | None = None) -> int:
+    # Spilt idle sessies en sessies boven het geheugenbudget (nooit de sessie die de sweep draait)
+    now = now if now is not None else time.time()
+    current = _session_id()
+    spilled = 0
+    swept = False
+    # Spillen gebeurt onder de registry lock: een nieuwe run van die sessie claimt eerst
+    # dezelfde lock (_claim_session), dus sweep en script raken de state nooit tegelijk aan
+    with _registry_lock:
+        for sid, last_seen in list(_last_seen.items()):
+            if now - last_seen <= IDLE_TIMEOUT_S and sid in _registry and sid not in _over_budget:
+                continue
+            if sid == current or _script_running(sid):
+                continue  # nog bezig (lange run): volgende sweep
+            swept = True
+            del _last_seen[sid]
+            _over_budget.discard(sid)
+            state = _registry.pop(sid, None)
+            if state is not None:  # None = sessie al gesloten en opgeruimd
+                # Verse wrapper rond de SessionState, zoals de script thread die gebruikt
+                spilled += spill(sid, SafeSessionState(state, lambda: None))
+    if swept:
+        # Gespilde sessies van gesloten tabs blijven niet eeuwig staan
+        get_store().purge_spills(max_age_s=7 * 24 * 3600)
+    return spilled
+
+
+def track_session():
+    global _last_sweep
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    now = time.time()
+    with _registry_lock:
+        run_sweep = now - _last_sweep > SWEEP_INTERVAL_S
+        if run_sweep:
+            _last_sweep = now
+    enforce_budget()
+    if run_sweep:
+        sweep_idle(now)
@@ -0,0 +1,86 @@
+import heapq
+from collections import defaultdict
+
+from src.utils import as_int
+
+# -----------------------------
+# Kosten verdelen tussen reizigers + minimale terugbetalingen
+# -----------------------------
+# Item velden: "paid_by" (index van de betaler, standaard 0) en "shared_with"
+# (lijst indexen; leeg = iedereen). Alles in cent, zodat saldi exact op 0 sluiten.
+
+
+def traveler_names(trip: dict, fallback: str = "Reiziger {n}") -> list[str]:
+    # fallback: naam voor reizigers zonder naam (de pagina's geven de vertaalde template mee)
+    n = max(1, as_int(trip.get("travelers", 1)))
+    names = [str(x).strip() for x in trip.get("people") or []]
+    return [names[i] if i < len(names) and names[i] else fallback.format(n=i + 1) for i in range(n)]
+
+
+def split_cents(cents: int, people: list[int]) -> dict[int, int]:
+    # Deterministisch: de eerste (rest) deelnemers betalen 1 cent extra
+    people = sorted(set(people))
+    base, rest = divmod(cents, len(people))
+    return {p: base + (1 if i < rest else 0) for i, p in enumerate(people)}
+
+
+class Balances:
+    # Incrementeel bijgehouden: betaald per reiziger, aandeel per reiziger, en het
+    # "iedereen"-totaal apart (het aantal reizigers is pas bij het uitlezen gekend).
+
+    def __init__(self):
+        self.paid: dict[int, int] = defaultdict(int)
+        self.owed: dict[int, int] = defaultdict(int)
+        self.shared_all = 0
+
+    @classmethod
+    def from_items(cls, items: list[dict]) -> "Balances":
+        balances = cls()
+        for item in items:
+            balances.add(item)
+        return balances
+
+    def _apply(self, item: dict, sign: int):
+        cents = as_int(item.get("cost", 0)) * 100
+        if not cents:
+            return
+        self.paid[as_int(item.get("paid_by", 0))] += sign * cents
+        shared = item.get("shared_with") or []
+        if not shared:
+            self.shared_all += sign * cents
+            return
+        for person, share in split_cents(cents, [as_int(p) for p in shared]).items():
+            self.owed[person] += sign * share
+
+    def add(self, item: dict):
+        self._apply(item, +1)
+
+    def remove(self, item: dict):
+        self._apply(item, -1)
+
+    def net(self, n_travelers: int) -> dict[int, int]:
+        # > 0: krijgt geld terug, < 0: moet nog betalen
+        people = set(range(n_travelers)) | set(self.paid) | set(self.owed)
+        net = {p: self.paid.get(p, 0) - self.owed.get(p, 0) for p in people}
+        for person, share in split_cents(self.shared_all, list(range(n_travelers))).items():
+            net[person] -= share
+        return net
+
+
+def settle(net: dict[int, int]) -> list[tuple[int, int, int]]:
+    # Greedy min-cash-flow: grootste schuldenaar betaalt grootste schuldeiser -> (van, naar, cent)
+    creditors = [(-amount, p) for p, amount in net.items() if amount > 0]
+    debtors = [(amount, p) for p, amount in net.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
@@ -0,0 +1,73 @@
+import base64
+import copy
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+
+from src.models import trip_from_dict, trip_to_dict
+
+# -----------------------------
+# Deelbare trip snapshots: canonieke JSON, gecomprimeerd, content-addressed
+# -----------------------------
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+KEY_LENGTH = 16
+# Velden die enkel voor deze sessie/opslag gelden, niet voor de inhoud
+VOLATILE_TRIP_FIELDS = ("id",)
+
+
+def canonical_json(trip: dict, items: list[dict]) -> bytes:
+    data = {k: v for k, v in trip_to_dict(trip).items() if k not in VOLATILE_TRIP_FIELDS}
+    payload = {"trip": data, "items": items}
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def snapshot_key(raw: bytes) -> str:
+    digest = hashlib.sha256(raw).digest()
+    return base64.b32encode(digest).decode("ascii").lower()[:KEY_LENGTH]
+
+
+def compress(raw: bytes) -> tuple[str, bytes]:
+    if _zstd is not None:
+        return "zstd", _zstd.compress(raw)
+    # mtime=0: zelfde input -> zelfde bytes
+    return "gzip", gzip.compress(raw, mtime=0)
+
+
+def decompress(codec: str, blob: bytes) -> bytes:
+    if codec == "zstd":
+        if _zstd is None:
+            raise ValueError("Snapshot is zstd-gecomprimeerd maar zstd is niet beschikbaar.")
+        return _zstd.decompress(blob)
+    return gzip.decompress(blob)
+
+
+def create_snapshot(store, trip: dict, items: list[dict]) -> str:
+    # Identieke trips -> zelfde key -> geen extra opslag
+    raw = canonical_json(trip, items)
+    key = snapshot_key(raw)
+    codec, blob = compress(raw)
+    store.put_snapshot(key, codec, blob, len(raw))
+    return key
+
+
+@lru_cache(maxsize=128)
+def _load(store, key: str) -> tuple[dict, list[dict]] | None:
+    row = store.get_snapshot(key)
+    if row is None:
+        return None
+    data = json.loads(decompress(*row))
+    return trip_from_dict(data["trip"]), data["items"]
+
+
+def load_snapshot(store, key: str) -> tuple[dict, list[dict]] | None:
+    # Kopie teruggeven: de gecachete snapshot blijft immutable
+    hit = _load(store, key)
+    return copy.deepcopy(hit) if hit is not None else None
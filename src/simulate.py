@@ -0,0 +1,113 @@
+import hashlib
+import json
+
+from src import jobs
+from src.deps import numpy
+from src.utils import as_int
+
+# -----------------------------
+# What-if budget simulator (Monte Carlo, gevectoriseerd met NumPy)
+# -----------------------------
+N_SCENARIOS = 100_000
+CHUNK = 10_000  # max scenario's per stap (voortgang)
+CHUNK_ELEMENTS = 2_000_000  # scenario's x onzekere items per stap: ~16 MB float64 trekkingen
+
+
+def cost_range(item: dict) -> tuple[float, float, float]:
+    # (laag, verwacht, hoog); items zonder range zijn vast
+    cost = float(item.get("cost", 0) or 0)
+    low = float(item.get("cost_low", cost) or 0)
+    high = float(item.get("cost_high", cost) or 0)
+    return min(low, cost), cost, max(high, cost)
+
+
+def simulate(items: list[dict], budget: float, n: int = N_SCENARIOS, seed: int = 0, progress=None) -> dict:
+    np = numpy()
+    rng = np.random.default_rng(seed)
+
+    ranges = np.array([cost_range(x) for x in items], dtype=np.float64).reshape(-1, 3)
+    days = np.array([as_int(x.get("day", 0)) for x in items], dtype=np.int64)
+    day_ids, day_pos = np.unique(days, return_inverse=True)
+    low, mode, high = ranges[:, 0], ranges[:, 1], ranges[:, 2]
+
+    uncertain = high > low
+    fixed_per_day = np.bincount(day_pos[~uncertain], weights=mode[~uncertain], minlength=len(day_ids))
+    u_low, u_mode, u_high = low[uncertain], mode[uncertain], high[uncertain]
+    # one-hot (items x dagen) zodat per-dag sommen één matmul zijn
+    u_days = np.zeros((int(uncertain.sum()), len(day_ids)), dtype=np.float32)
+    u_days[np.arange(len(u_days)), day_pos[uncertain]] = 1.0
+
+    # Chunk schaalt met het aantal onzekere items zodat het geheugen per stap begrensd blijft
+    chunk = max(1, min(CHUNK, CHUNK_ELEMENTS // max(1, len(u_low))))
+
+    totals = np.empty(n, dtype=np.float64)
+    per_day = np.empty((n, len(day_ids)), dtype=np.float32)
+    # Streaming covariantie item <-> totaal voor de gevoeligheid
+    sum_x = np.zeros(len(u_low))
+    sum_xy = np.zeros(len(u_low))
+
+    for start in range(0, n, chunk):
+        size = min(chunk, n - start)
+        draws = rng.triangular(u_low, u_mode, u_high, size=(size, len(u_low))) if len(u_low) else np.zeros((size, 0))
+        total = draws.sum(axis=1) + fixed_per_day.sum()
+        totals[start:start + size] = total
+        per_day[start:start + size] = draws.astype(np.float32) @ u_days + fixed_per_day
+        sum_x += draws.sum(axis=0)
+        sum_xy += draws.T @ total
+        if progress is not None:
+            progress((start + size) / n, "sim.progress", done=start + size, n=n)
+
+    mean_total = totals.mean()
+    var_total = totals.var()
+    cov = sum_xy / n - (sum_x / n) * mean_total
+    share = cov / var_total if var_total > 0 else np.zeros_like(cov)
+
+    titles = [x.get("title", "") for x, u in zip(items, uncertain) if u]
+    ranked = np.argsort(-share)[:5]
+
+    return {
+        "n": n,
+        "p_over": float((totals > budget).mean()) if budget > 0 else 0.0,
+        "p50": float(np.percentile(totals, 50)),
+        "p90": float(np.percentile(totals, 90)),
+        "per_day": [
+            {"day": int(d), "p50": float(p50), "p90": float(p90)}
+            for d, p50, p90 in zip(day_ids, *np.percentile(per_day, [50, 90], axis=0))
+        ],
+        "sensitive": [{"title": titles[i], "variance_share": float(share[i])} for i in ranked if share[i] > 0],
+    }
+
+
+def scenario_key(items: list[dict], budget: float) -> str:
+    # Zelfde items/kosten/budget = zelfde resultaat, ongeacht items_version
+    payload = [(x.get("id"), x.get("day"), *cost_range(x)) for x in items]
+    raw = json.dumps([payload, budget], default=str).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+# -----------------------------
+# Als achtergrondjob (src/jobs.py): één job per scenario, resultaat bewaard in de job tabel
+# -----------------------------
+@jobs.register("simulate")
+def _simulate_job(ctx, items: list[dict], budget: float) -> dict:
+    return simulate(items, budget, progress=ctx.progress)
+
+
+def submit(items: list[dict], budget: float, retry: bool = False) -> str:
+    # -> job id; zelfde scenario = zelfde job (ook als die klaar of mislukt is, tot een retry)
+    snapshot = [dict(x) for x in items]
+    key = f"simulate:{scenario_key(items, budget)}"
+    return jobs.submit(
+        "simulate", label=jobs.message("sim.job_label"), dedupe_key=key, retry=retry, items=snapshot, budget=budget
+    )
+
+
+def result(job_id: str) -> dict | None:
+    # None zolang de simulatie nog loopt (of mislukt/geannuleerd is)
+    return jobs.result(job_id)
+
+
+def peek(items: list[dict], budget: float) -> dict | None:
+    # Resultaat als het al berekend is, zonder iets te starten
+    job_id = jobs.find(f"simulate:{scenario_key(items, budget)}")
+    return jobs.result(job_id) if job_id else None
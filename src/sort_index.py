@@ -0,0 +1,71 @@
+from bisect import bisect_left
+
+from src.utils import UNTIMED, as_int, time_minutes
+
+# -----------------------------
+# Voorberekende sorteervolgordes per modus, incrementeel bijgehouden
+# -----------------------------
+SORT_MODES = {
+    "Day + Time": "day_time",
+    "Cost (high→low)": "cost_desc",
+    "Title (A→Z)": "title",
+}
+
+
+def sort_key(mode: str, item: dict) -> tuple:
+    if mode == "day_time":
+        # Gevalideerde items hebben "minute"; oudere items worden hier geparsed
+        minute = item["minute"] if "minute" in item else time_minutes(item.get("time", ""))
+        return (as_int(item.get("day", 0)), UNTIMED if minute is None else minute, item.get("title", ""))
+    if mode == "cost_desc":
+        return (-as_int(item.get("cost", 0)),)
+    return (str(item.get("title", "")).lower(),)
+
+
+class SortIndex:
+    # Per modus een gesorteerde lijst keys (+ insert-volgnummer als stabiele tiebreak)
+    # en een parallelle lijst met item ids: order() is dan gewoon een lookup.
+
+    def __init__(self):
+        self._seq = 0
+        self._seq_of: dict[str, int] = {}
+        self._keys: dict[str, list[tuple]] = {mode: [] for mode in SORT_MODES.values()}
+        self._ids: dict[str, list[str]] = {mode: [] for mode in SORT_MODES.values()}
+
+    @classmethod
+    def from_items(cls, items: list[dict]) -> "SortIndex":
+        index = cls()
+        for item in items:
+            index._seq_of[item["id"]] = index._seq
+            index._seq += 1
+        for mode in index._keys:
+            keyed = sorted((sort_key(mode, x) + (index._seq_of[x["id"]],), x["id"]) for x in items)
+            index._keys[mode] = [k for k, _ in keyed]
+            index._ids[mode] = [item_id for _, item_id in keyed]
+        return index
+
+    def add(self, item: dict):
+        seq = self._seq
+        self._seq += 1
+        self._seq_of[item["id"]] = seq
+        for mode, keys in self._keys.items():
+            key = sort_key(mode, item) + (seq,)
+            pos = bisect_left(keys, key)
+            keys.insert(pos, key)
+            self._ids[mode].insert(pos, item["id"])
+
+    def remove(self, item: dict):
+        seq = self._seq_of.pop(item["id"], None)
+        if seq is None:
+            return
+        for mode, keys in self._keys.items():
+            pos = bisect_left(keys, sort_key(mode, item) + (seq,))
+            if pos < len(keys) and self._ids[mode][pos] == item["id"]:
+                del keys[pos]
+                del self._ids[mode][pos]
+
+    def order(self, mode: str) -> list[str]:
+        return self._ids[mode]
+
+    def __len__(self) -> int:
+        return len(self._seq_of)
@@ -0,0 +1,232 @@
+import streamlit as st
+
+from src.facets import FacetIndex
+from src.i18n import t
+from src.models import default_trip, default_ui, with_ids
+from src.pacing import DailyCosts
+from src.settle import Balances
+from src.sort_index import SortIndex
+
+# -----------------------------
+# Session state bootstrap (één keer, in de app shell)
+# -----------------------------
+STATE_SCHEMA = {
+    "trip": default_trip,
+    "draft_items": list,  # list[dict]
+    "ui": default_ui,
+    "activity": list,  # list[str]
+    "items_version": int,  # +1 bij elke wijziging aan draft_items
+}
+
+
+def init_state():
+    for key, factory in STATE_SCHEMA.items():
+        if key not in st.session_state:
+            st.session_state[key] = factory()
+
+
+def log(msg: str):
+    st.session_state.activity.insert(0, msg)
+    st.session_state.activity = st.session_state.activity[:30]
+
+
+# -----------------------------
+# Itinerary mutaties: altijd via deze helpers, zodat afgeleide data mee kan
+# -----------------------------
+# Indexen die incrementeel bijgewerkt worden (add/remove) i.p.v. herbouwd
+MAINTAINED = {
+    "sort_index": SortIndex,
+    "facet_index": FacetIndex,
+    "balances": Balances,
+    "daily_costs": DailyCosts,
+}
+
+
+def _maintain(op: str, item: dict | None = None):
+    # Bijwerken als de index bij de huidige versie hoort; anders wordt hij later lui herbouwd
+    version = st.session_state.items_version
+    for name in MAINTAINED:
+        hit = st.session_state.get(f"_cache_{name}")
+        if hit is None or hit[0] != version:
+            continue
+        if op != "touch":
+            getattr(hit[1], op)(item)
+        st.session_state[f"_cache_{name}"] = (version + 1, hit[1])
+
+
+def _ensure_writable():
+    # Gedeelde (read-only) trips: wijzigingen weigeren i.p.v. stil de snapshot aan te passen
+    if st.session_state.ui.get("read_only"):
+        st.toast(t("shared.read_only_toast"), icon="🔒")
+        st.stop()
+
+
+def items_changed():
+    st.session_state.items_version += 1
+
+
+def set_items(items: list[dict]):
+    _ensure_writable()
+    st.session_state.draft_items = with_ids(items)
+    items_changed()
+
+
+def add_item(item: dict):
+    _ensure_writable()
+    with_ids([item])
+    _maintain("add", item)
+    st.session_state.draft_items.append(item)
+    items_changed()
+
+
+def add_items(items: list[dict]):
+    # Bulk (imports): indexen niet item per item bijwerken, die worden lui herbouwd
+    _ensure_writable()
+    st.session_state.draft_items.extend(with_ids(items))
+    items_changed()
+
+
+def pop_item(index: int = -1) -> dict:
+    _ensure_writable()
+    item = st.session_state.draft_items.pop(index)
+    _maintain("remove", item)
+    items_changed()
+    return item
+
+
+def swap_items(i: int, j: int):
+    # Volgorde in de lijst telt niet mee voor de sorteerindexen
+    _ensure_writable()
+    items = st.session_state.draft_items
+    items[i], items[j] = items[j], items[i]
+    _maintain("touch")
+    items_changed()
+
+
+def apply_batch(ops: list[dict], max_day: int | None = None) -> int:
+    # Eén transactie = één nieuwe versie (indexen worden daarna lui herbouwd)
+    from src.batch import apply_ops
+
+    before = len(st.session_state.draft_items)
+    set_items(apply_ops(st.session_state.draft_items, ops, max_day=max_day))
+    return before - len(st.session_state.draft_items)
+
+
+def update_trip(**fields):
+    # Tripvelden (bestemming, data, budget, ...): enkel echte wijzigingen, en nooit op een gedeelde trip
+    trip = st.session_state.trip
+    changed = {k: v for k, v in fields.items() if trip.get(k) != v}
+    if changed:
+        _ensure_writable()
+        trip.update(changed)
+
+
+def load_trip(trip: dict, items: list[dict], read_only: bool = False):
+    st.session_state.ui["read_only"] = False
+    st.session_state.ui.pop("checklist", None)
+    st.session_state.trip = trip
+    set_items(items)
+    st.session_state.ui["read_only"] = read_only
+
+
+def open_shared(key: str) -> bool:
+    # ?trip=<key>: één keyed read, read-only in deze sessie
+    from src.share import load_snapshot
+    from src.storage import get_store
+
+    if st.session_state.ui.get("shared_key") == key:
+        return True
+    snapshot = load_snapshot(get_store(), key)
+    if snapshot is None:
+        return False
+    load_trip(*snapshot, read_only=True)
+    st.session_state.ui["shared_key"] = key
+    return True
+
+
+def leave_shared():
+    # Gedeelde trip wordt een gewone (eigen) trip in deze sessie
+    st.session_state.ui["read_only"] = False
+    st.session_state.ui.pop("shared_key", None)
+    st.session_state.trip.pop("id", None)
+    st.query_params.pop("trip", None)
+
+
+def save_trip(as_variant: bool = False) -> str:
+    # Naar het archief (src/storage.py); het trip id blijft in de sessie hangen.
+    # as_variant: nieuwe trip met dezelfde item ids (zo blijven varianten vergelijkbaar, zie src/compare.py)
+    from src.storage import get_store
+
+    _ensure_writable()
+    store = get_store()
+    source = st.session_state.trip.pop("id", None) if as_variant else None
+    trip_id = store.save_trip(st.session_state.trip, st.session_state.draft_items)
+    st.session_state.trip["id"] = trip_id
+    if source:
+        store.save_checklist(trip_id, store.get_checklist(source))
+    # Paklijst van een nog niet opgeslagen trip verhuist mee naar storage
+    if st.session_state.ui.get("checklist"):
+        store.save_checklist(trip_id, st.session_state.ui.pop("checklist"))
+    return trip_id
+
+
+# -----------------------------
+# Paklijst: per opgeslagen trip in storage, anders in de sessie (tot de eerste save)
+# Keys zijn "sectie|item" (packing.checklist_key)
+# -----------------------------
+def checklist() -> dict[str, dict]:
+    from src.storage import get_store
+
+    trip_id = st.session_state.trip.get("id")
+    if trip_id and not st.session_state.ui.get("read_only"):
+        return get_store().get_checklist(trip_id)
+    return st.session_state.ui.setdefault("checklist", {})
+
+
+def set_checked(key: str, checked: bool, custom: bool = False):
+    from src.storage import get_store
+
+    _ensure_writable()
+    entry = {"checked": checked, "custom": custom}
+    trip_id = st.session_state.trip.get("id")
+    if trip_id:
+        get_store().save_checklist(trip_id, {key: entry})
+    else:
+        st.session_state.ui.setdefault("checklist", {})[key] = entry
+
+
+def remove_checklist_item(key: str):
+    from src.storage import get_store
+
+    _ensure_writable()
+    trip_id = st.session_state.trip.get("id")
+    if trip_id:
+        get_store().delete_checklist_item(trip_id, key)
+    else:
+        st.session_state.ui.get("checklist", {}).pop(key, None)
+
+
+def cached(name: str, build, inputs=None):
+    # Per-sessie cache die vervalt bij een nieuwe items_version (en door session.py mag worden opgeruimd).
+    # inputs: overige waarden waar build van afhangt (datum, modus, ...). Vaste naam per view, dus één
+    # entry die herbouwd wordt als ze wijzigen (geen entry per waarde in session_state).
+    key = f"_cache_{name}"
+    version = st.session_state.items_version
+    if inputs is not None:
+        version = (version, inputs)
+    hit = st.session_state.get(key)
+    if hit is None or hit[0] != version:
+        hit = (version, build())
+        st.session_state[key] = hit
+    return hit[1]
+
+
+def maintained(name: str):
+    items = st.session_state.draft_items
+    return cached(name, lambda: MAINTAINED[name].from_items(with_ids(items)))
+
+
+def items_table():
+    from src.table import to_table
+
+    return cached("items_table", lambda: to_table(st.session_state.draft_items))
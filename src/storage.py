@@ -0,0 +1,481 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import cache
+from pathlib import Path
+
+from src.models import new_trip_id, trip_from_dict, trip_to_dict, with_ids
+from src.utils import as_int, trip_days
+
+# -----------------------------
+# Storage backend (SQLite, één bestand per server)
+# -----------------------------
+DB_PATH = os.environ.get("TRIPBUILDER_DB", "data/tripbuilder.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_spill (
+    session_id TEXT PRIMARY KEY,
+    payload    TEXT NOT NULL,
+    spilled_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS trips (
+    trip_id     TEXT PRIMARY KEY,
+    destination TEXT NOT NULL,
+    start_date  TEXT NOT NULL,
+    end_date    TEXT NOT NULL,
+    budget_eur  INTEGER NOT NULL,
+    travelers   INTEGER NOT NULL,
+    payload     TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    item_count  INTEGER NOT NULL DEFAULT 0,  -- bijgewerkt samen met de rollups
+    cost        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS trips_updated ON trips (updated_at);
+
+CREATE TABLE IF NOT EXISTS trip_items (
+    trip_id  TEXT NOT NULL,
+    item_id  TEXT NOT NULL,
+    day      INTEGER NOT NULL,
+    month    TEXT NOT NULL,
+    category TEXT NOT NULL,
+    cost     INTEGER NOT NULL,
+    payload  TEXT NOT NULL,
+    PRIMARY KEY (trip_id, item_id)
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    key        TEXT PRIMARY KEY,
+    codec      TEXT NOT NULL,
+    raw_size   INTEGER NOT NULL,
+    blob       BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+
+-- Paklijst per trip: afgevinkte items + eigen toevoegingen (custom = 1); item = "sectie|item" (src/packing.py)
+CREATE TABLE IF NOT EXISTS checklists (
+    trip_id TEXT NOT NULL,
+    item    TEXT NOT NULL,
+    checked INTEGER NOT NULL DEFAULT 0,
+    custom  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (trip_id, item)
+);
+
+-- Achtergrondtaken (src/jobs.py); dedupe_key = zelfde invoer -> zelfde job, owner = "host:pid" van de runner
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id     TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    label      TEXT NOT NULL,
+    dedupe_key TEXT,
+    status     TEXT NOT NULL,
+    progress   REAL NOT NULL DEFAULT 0,
+    message    TEXT NOT NULL DEFAULT '',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    result     TEXT,
+    error      TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner      TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key);
+
+-- Tussentijdse output van een job (bv. import-batches), in volgorde; wordt opgehaald en meteen verwijderd
+CREATE TABLE IF NOT EXISTS job_outputs (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id  TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_outputs_job ON job_outputs (job_id, seq);
+
+-- Rollups: bijgewerkt in dezelfde transactie als de write (+nieuw, -oud)
+CREATE TABLE IF NOT EXISTS rollup_destination (
+    destination   TEXT PRIMARY KEY,
+    trips         INTEGER NOT NULL DEFAULT 0,
+    items         INTEGER NOT NULL DEFAULT 0,
+    cost          INTEGER NOT NULL DEFAULT 0,
+    traveler_days INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rollup_category (
+    category TEXT PRIMARY KEY,
+    items    INTEGER NOT NULL DEFAULT 0,
+    cost     INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rollup_month (
+    month TEXT PRIMARY KEY,
+    items INTEGER NOT NULL DEFAULT 0,
+    cost  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Zonder "result" (kan groot zijn): dat komt apart via job_result()
+JOB_COLUMNS = [
+    "job_id", "kind", "label", "dedupe_key", "status", "progress", "message", "attempts", "error", "created_at", "updated_at"
+]
+JOB_FIELDS = {"status", "progress", "message", "attempts", "result", "error"}
+
+
+class TripStore:
+    def __init__(self, path: str = DB_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        # Kolommen die later bijkwamen: toevoegen op bestaande databases en één keer invullen
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(trips)")}
+        if "item_count" not in columns:
+            with self._transaction() as conn:
+                conn.execute("ALTER TABLE trips ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0")
+                conn.execute("ALTER TABLE trips ADD COLUMN cost INTEGER NOT NULL DEFAULT 0")
+                conn.execute(
+                    "UPDATE trips SET "
+                    "item_count = (SELECT COUNT(*) FROM trip_items i WHERE i.trip_id = trips.trip_id), "
+                    "cost = (SELECT COALESCE(SUM(cost), 0) FROM trip_items i WHERE i.trip_id = trips.trip_id)"
+                )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # -----------------------------
+    # Idle sessions
+    # -----------------------------
+    def spill_session(self, session_id: str, state: dict):
+        payload = dict(state)
+        if "trip" in payload:
+            payload["trip"] = trip_to_dict(payload["trip"])
+        self._execute(
+            "INSERT OR REPLACE INTO session_spill (session_id, payload, spilled_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(payload, default=str), time.time()),
+        )
+
+    def restore_session(self, session_id: str) -> dict | None:
+        with self._lock:
+            row = self._execute("SELECT payload FROM session_spill WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            self._execute("DELETE FROM session_spill WHERE session_id = ?", (session_id,))
+        state = json.loads(row[0])
+        if "trip" in state:
+            state["trip"] = trip_from_dict(state["trip"])
+        return state
+
+    def purge_spills(self, max_age_s: float) -> int:
+        cur = self._execute("DELETE FROM session_spill WHERE spilled_at < ?", (time.time() - max_age_s,))
+        return cur.rowcount
+
+    # -----------------------------
+    # Trip archief + rollups
+    # -----------------------------
+    def save_trip(self, trip: dict, items: list[dict]) -> str:
+        # Geeft het trip_id terug (nieuw bij de eerste save)
+        trip_id = trip.get("id") or new_trip_id()
+        data = trip_to_dict({**trip, "id": trip_id})
+        start = trip_from_dict(data)["start_date"]
+        rows = [_item_row(trip_id, start, x) for x in with_ids([dict(x) for x in items])]
+        with self._transaction() as conn:
+            self._apply_rollups(conn, trip_id, sign=-1)
+            conn.execute("DELETE FROM trip_items WHERE trip_id = ?", (trip_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO trips "
+                "(trip_id, destination, start_date, end_date, budget_eur, travelers, payload, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    trip_id,
+                    data["destination"] or "—",
+                    data["start_date"],
+                    data["end_date"],
+                    as_int(data["budget_eur"]),
+                    max(1, as_int(data["travelers"])),
+                    json.dumps(data, default=str),
+                    time.time(),
+                ),
+            )
+            conn.executemany("INSERT OR REPLACE INTO trip_items VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._apply_rollups(conn, trip_id, sign=+1)
+        return trip_id
+
+    def delete_trip(self, trip_id: str):
+        with self._transaction() as conn:
+            self._apply_rollups(conn, trip_id, sign=-1)
+            conn.execute("DELETE FROM trip_items WHERE trip_id = ?", (trip_id,))
+            conn.execute("DELETE FROM trips WHERE trip_id = ?", (trip_id,))
+            conn.execute("DELETE FROM checklists WHERE trip_id = ?", (trip_id,))
+
+    def _apply_rollups(self, conn: sqlite3.Connection, trip_id: str, sign: int):
+        # Enkel de rijen van deze trip aggregeren: kost O(trip), niet O(archief)
+        trip = conn.execute(
+            "SELECT destination, start_date, end_date, travelers FROM trips WHERE trip_id = ?", (trip_id,)
+        ).fetchone()
+        if trip is None:
+            return
+        destination, start, end, travelers = trip
+        days = trip_days(trip_from_dict({"start_date": start, "end_date": end}))
+        n_items, cost = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(cost), 0) FROM trip_items WHERE trip_id = ?", (trip_id,)
+        ).fetchone()
+        if sign > 0:
+            # Tellers op de trip zelf: het archief-overzicht hoeft de items dan niet te scannen
+            conn.execute("UPDATE trips SET item_count = ?, cost = ? WHERE trip_id = ?", (n_items, cost, trip_id))
+        conn.execute(
+            "INSERT INTO rollup_destination VALUES (?, ?, ?, ?, ?) ON CONFLICT(destination) DO UPDATE SET "
+            "trips = trips + excluded.trips, items = items + excluded.items, "
+            "cost = cost + excluded.cost, traveler_days = traveler_days + excluded.traveler_days",
+            (destination, sign, sign * n_items, sign * cost, sign * days * travelers),
+        )
+        for table, key in (("rollup_category", "category"), ("rollup_month", "month")):
+            conn.executemany(
+                f"INSERT INTO {table} VALUES (?, ?, ?) ON CONFLICT({key}) DO UPDATE SET "
+                "items = items + excluded.items, cost = cost + excluded.cost",
+                [
+                    (value, sign * n, sign * c)
+                    for value, n, c in conn.execute(
+                        f"SELECT {key}, COUNT(*), SUM(cost) FROM trip_items WHERE trip_id = ? GROUP BY {key}", (trip_id,)
+                    )
+                ],
+            )
+
+    def list_trips(self, limit: int = -1, offset: int = 0, search: str = "") -> list[dict]:
+        # Nieuwste eerst; limit -1 = alles. search: deel van de bestemming (hoofdletterongevoelig) of exact trip id
+        where, params = "", ()
+        if search:
+            where, params = "WHERE instr(lower(destination), lower(?)) > 0 OR trip_id = ? ", (search, search)
+        cur = self._execute(
+            "SELECT trip_id, destination, start_date, end_date, budget_eur, travelers, item_count, cost, updated_at "
+            f"FROM trips {where}ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        cols = ["id", "destination", "start_date", "end_date", "budget_eur", "travelers", "items", "cost", "updated_at"]
+        return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    def count_trips(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM trips").fetchone()[0]
+
+    def load_trip(self, trip_id: str) -> tuple[dict, list[dict]] | None:
+        row = self._execute("SELECT payload FROM trips WHERE trip_id = ?", (trip_id,)).fetchone()
+        if row is None:
+            return None
+        items = [
+            json.loads(p)
+            for (p,) in self._execute("SELECT payload FROM trip_items WHERE trip_id = ? ORDER BY rowid", (trip_id,))
+        ]
+        return trip_from_dict(json.loads(row[0])), items
+
+    def trip_version(self, trip_id: str) -> float | None:
+        # Goedkoop (zonder payloads): basis voor ETags in de API
+        row = self._execute("SELECT updated_at FROM trips WHERE trip_id = ?", (trip_id,)).fetchone()
+        return row[0] if row else None
+
+    def upsert_items(self, trip_id: str, items: list[dict]) -> list[str] | None:
+        # Items toevoegen/vervangen zonder de hele trip te herschrijven; None als de trip niet bestaat
+        with self._transaction() as conn:
+            row = conn.execute("SELECT start_date FROM trips WHERE trip_id = ?", (trip_id,)).fetchone()
+            if row is None:
+                return None
+            start = trip_from_dict({"start_date": row[0]})["start_date"]
+            items = with_ids([dict(x) for x in items])
+            self._apply_rollups(conn, trip_id, sign=-1)
+            conn.executemany(
+                "INSERT OR REPLACE INTO trip_items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [_item_row(trip_id, start, x) for x in items],
+            )
+            self._apply_rollups(conn, trip_id, sign=+1)
+            conn.execute("UPDATE trips SET updated_at = ? WHERE trip_id = ?", (time.time(), trip_id))
+        return [x["id"] for x in items]
+
+    def delete_items(self, trip_id: str, item_ids: list[str]) -> int:
+        with self._transaction() as conn:
+            self._apply_rollups(conn, trip_id, sign=-1)
+            removed = conn.executemany(
+                "DELETE FROM trip_items WHERE trip_id = ? AND item_id = ?", [(trip_id, i) for i in item_ids]
+            ).rowcount
+            self._apply_rollups(conn, trip_id, sign=+1)
+            if removed:
+                conn.execute("UPDATE trips SET updated_at = ? WHERE trip_id = ?", (time.time(), trip_id))
+        return removed
+
+    def archive_version(self) -> tuple:
+        return tuple(self._execute("SELECT COUNT(*), COALESCE(MAX(updated_at), 0) FROM trips").fetchone())
+
+    def archive_items(self) -> list[tuple[str, dict, dict]]:
+        # (trip_id, trip meta, item) voor de aanbevelingsindex
+        cur = self._execute(
+            "SELECT t.trip_id, t.destination, t.start_date, i.payload "
+            "FROM trip_items i JOIN trips t ON t.trip_id = i.trip_id"
+        )
+        return [
+            (trip_id, {"id": trip_id, "destination": dest, "start_date": start}, json.loads(payload))
+            for trip_id, dest, start, payload in cur
+        ]
+
+    def rollups(self) -> dict[str, list[dict]]:
+        def rows(sql: str, cols: list[str]) -> list[dict]:
+            return [dict(zip(cols, r)) for r in self._execute(sql).fetchall()]
+
+        return {
+            "destination": rows(
+                "SELECT destination, trips, items, cost, traveler_days FROM rollup_destination "
+                "WHERE trips > 0 ORDER BY cost DESC",
+                ["destination", "trips", "items", "cost", "traveler_days"],
+            ),
+            "category": rows(
+                "SELECT category, items, cost FROM rollup_category WHERE items > 0 ORDER BY cost DESC",
+                ["category", "items", "cost"],
+            ),
+            "month": rows(
+                "SELECT month, items, cost FROM rollup_month WHERE items > 0 ORDER BY month",
+                ["month", "items", "cost"],
+            ),
+        }
+
+    # -----------------------------
+    # Paklijst (per trip)
+    # -----------------------------
+    def get_checklist(self, trip_id: str) -> dict[str, dict]:
+        rows = self._execute("SELECT item, checked, custom FROM checklists WHERE trip_id = ?", (trip_id,)).fetchall()
+        return {item: {"checked": bool(checked), "custom": bool(custom)} for item, checked, custom in rows}
+
+    def save_checklist(self, trip_id: str, entries: dict[str, dict]):
+        # Upsert van enkele items (één afvinking) of een hele sessie-lijst (eerste save)
+        rows = [(trip_id, item, int(e.get("checked", False)), int(e.get("custom", False))) for item, e in entries.items()]
+        with self._transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO checklists VALUES (?, ?, ?, ?)", rows)
+
+    def delete_checklist_item(self, trip_id: str, item: str):
+        self._execute("DELETE FROM checklists WHERE trip_id = ? AND item = ?", (trip_id, item))
+
+    # -----------------------------
+    # Achtergrondtaken
+    # -----------------------------
+    def create_job(self, job_id: str, kind: str, label: str, dedupe_key: str | None = None, owner: str | None = None):
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (job_id, kind, label, dedupe_key, status, created_at, updated_at, owner) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, kind, label, dedupe_key, now, now, owner),
+        )
+
+    def update_job(self, job_id: str, **fields):
+        # Enkel gekende kolommen; updated_at altijd mee
+        fields = {k: v for k, v in fields.items() if k in JOB_FIELDS}
+        sets = "".join(f"{k} = ?, " for k in fields)
+        self._execute(f"UPDATE jobs SET {sets}updated_at = ? WHERE job_id = ?", (*fields.values(), time.time(), job_id))
+
+    def get_job(self, job_id: str) -> dict | None:
+        # Zonder result: dit wordt elke poll gelezen
+        row = self._execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    def job_result(self, job_id: str) -> str | None:
+        row = self._execute("SELECT result FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def find_job(self, dedupe_key: str) -> dict | None:
+        # Meest recente job met deze key, ook als die mislukt of geannuleerd is (opnieuw proberen is expliciet)
+        row = self._execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE dedupe_key = ? ORDER BY created_at DESC LIMIT 1",
+            (dedupe_key,),
+        ).fetchone()
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    def list_jobs(self, limit: int = 20) -> list[dict]:
+        cur = self._execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [dict(zip(JOB_COLUMNS, row)) for row in cur]
+
+    def active_job_owners(self) -> set[str | None]:
+        rows = self._execute("SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')").fetchall()
+        return {owner for (owner,) in rows}
+
+    def interrupt_jobs(self, owners: set[str | None], error: str = "Onderbroken (server herstart)") -> int:
+        # Actieve jobs van runners die niet meer bestaan afsluiten (None = rij van voor de owner kolom)
+        known = [owner for owner in owners if owner is not None]
+        where = f"owner IN ({', '.join('?' * len(known))})" if known else "0"
+        if None in owners:
+            where = f"({where} OR owner IS NULL)"
+        cur = self._execute(
+            "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+            f"WHERE status IN ('queued', 'running') AND {where}",
+            (error, time.time(), *known),
+        )
+        return cur.rowcount
+
+    def purge_jobs(self, max_age_s: float) -> int:
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND updated_at < ?",
+                (time.time() - max_age_s,),
+            )
+            # Niet opgehaalde output van opgeruimde jobs mee weg
+            conn.execute("DELETE FROM job_outputs WHERE job_id NOT IN (SELECT job_id FROM jobs)")
+        return cur.rowcount
+
+    def add_job_output(self, job_id: str, payload: str):
+        self._execute("INSERT INTO job_outputs (job_id, payload) VALUES (?, ?)", (job_id, payload))
+
+    def take_job_outputs(self, job_id: str, limit: int = -1) -> list[str]:
+        # Ophalen + verwijderen in één transactie: elke output wordt precies één keer verwerkt
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT seq, payload FROM job_outputs WHERE job_id = ? ORDER BY seq LIMIT ?", (job_id, limit)
+            ).fetchall()
+            if rows:
+                conn.execute("DELETE FROM job_outputs WHERE job_id = ? AND seq <= ?", (job_id, rows[-1][0]))
+        return [payload for _, payload in rows]
+
+    def delete_job_outputs(self, job_id: str):
+        self._execute("DELETE FROM job_outputs WHERE job_id = ?", (job_id,))
+
+    # -----------------------------
+    # Gedeelde snapshots (immutable, key = hash van de inhoud)
+    # -----------------------------
+    def put_snapshot(self, key: str, codec: str, blob: bytes, raw_size: int):
+        self._execute(
+            "INSERT OR IGNORE INTO snapshots (key, codec, raw_size, blob, created_at) VALUES (?, ?, ?, ?, ?)",
+            (key, codec, raw_size, blob, time.time()),
+        )
+
+    def get_snapshot(self, key: str) -> tuple[str, bytes] | None:
+        row = self._execute("SELECT codec, blob FROM snapshots WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+
+def _item_row(trip_id: str, start_date, item: dict) -> tuple:
+    day = max(1, as_int(item.get("day", 1)))
+    month = (start_date + timedelta(days=day - 1)).strftime("%Y-%m")
+    return (
+        trip_id,
+        item["id"],
+        day,
+        month,
+        item.get("category") or "Other",
+        as_int(item.get("cost", 0)),
+        json.dumps(item, default=str),
+    )
+
+
+@cache
+def get_store() -> TripStore:
+    return TripStore()
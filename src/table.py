@@ -0,0 +1,103 @@
+import io
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from src.utils import UNTIMED, as_int, normalize_time, time_minutes
+
+# -----------------------------
+# Itinerary als Arrow table: één build per versie, views via compute kernels
+# -----------------------------
+ITEM_SCHEMA = pa.schema(
+    [
+        ("day", pa.int32()),
+        ("time", pa.string()),
+        ("title", pa.string()),
+        ("category", pa.string()),
+        ("cost", pa.int64()),
+        ("tags", pa.list_(pa.string())),
+        ("minute", pa.int32()),
+    ]
+)
+# Hulpkolommen voor sorteren: niet tonen, niet exporteren
+HIDDEN_COLUMNS = ["minute"]
+
+SORT_KEYS = {
+    "day_time": [("day", "ascending"), ("minute", "ascending"), ("title", "ascending")],
+    "cost_desc": [("cost", "descending")],
+    "title": [("title_lower", "ascending")],
+}
+
+
+def _minute(item: dict) -> int:
+    # Gevalideerde items hebben "minute" (clean_item); oudere items worden hier geparsed
+    minute = item["minute"] if "minute" in item else time_minutes(item.get("time", ""))
+    return UNTIMED if minute is None else minute
+
+
+def to_table(items: list[dict]) -> pa.Table:
+    columns = {
+        "day": [as_int(x.get("day", 0)) for x in items],
+        "time": [normalize_time(str(x.get("time", "") or "")) for x in items],
+        "title": [str(x.get("title", "") or "") for x in items],
+        "category": [x.get("category") or "Other" for x in items],
+        "cost": [as_int(x.get("cost", 0)) for x in items],
+        "tags": [list(x.get("tags") or []) for x in items],
+        "minute": [_minute(x) for x in items],
+    }
+    return pa.table(columns, schema=ITEM_SCHEMA)
+
+
+def sort_view(table: pa.Table, mode: str = "day_time") -> pa.Table:
+    keys = SORT_KEYS[mode]
+    if mode == "title":
+        order = pc.sort_indices(pa.table({"title_lower": pc.utf8_lower(table["title"])}), sort_keys=keys)
+    else:
+        # day_time: op de minute-kolom (items zonder uur achteraan), niet op de tekst
+        order = pc.sort_indices(table, sort_keys=keys)
+    return table.take(order)
+
+
+def visible(table: pa.Table) -> pa.Table:
+    return table.drop_columns([c for c in HIDDEN_COLUMNS if c in table.column_names])
+
+
+def filter_day(table: pa.Table, day: int) -> pa.Table:
+    return table.filter(pc.equal(table["day"], day))
+
+
+def total_cost(table: pa.Table) -> int:
+    return int(pc.sum(table["cost"]).as_py() or 0)
+
+
+def totals_by(table: pa.Table, key: str) -> pa.Table:
+    # -> kolommen [key, "cost"], gesorteerd op key
+    grouped = table.group_by(key).aggregate([("cost", "sum")]).rename_columns([key, "cost"])
+    return grouped.sort_by(key)
+
+
+def unique_days(table: pa.Table) -> list[int]:
+    return sorted(pc.unique(table["day"]).to_pylist())
+
+
+# -----------------------------
+# Exports (zonder pandas-kopie)
+# -----------------------------
+def to_csv_bytes(table: pa.Table) -> bytes:
+    # CSV kent geen list-kolommen: tags als "a, b"
+    table = visible(table)
+    idx = table.schema.get_field_index("tags")
+    if idx >= 0:
+        table = table.set_column(idx, "tags", pc.binary_join(table["tags"], ", "))
+    buf = io.BytesIO()
+    pa_csv.write_csv(table, buf)
+    return buf.getvalue()
+
+
+def to_parquet_bytes(table: pa.Table) -> bytes:
+    table = visible(table)
+    buf = io.BytesIO()
+    pq.write_table(table, buf)
+    return buf.getvalue()
@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict, defaultdict
+
+from src.deps import numpy
+from src.utils import UNTIMED, as_int, time_minutes
+
+# -----------------------------
+# Reistijd tussen stops: haversine (hemelsbreed) x omweg-factor, per vervoerswijze
+# -----------------------------
+EARTH_RADIUS_KM = 6371.0
+COORD_PRECISION = 4  # ~11 m: dicht genoeg bij elkaar = zelfde cache entry
+DEFAULT_DURATION_MIN = 60
+MAX_CACHED_LEGS = 20_000
+
+# km/u, vaste overhead (min), omweg-factor t.o.v. hemelsbreed
+MODES = {
+    "Te voet": (4.8, 0, 1.25),
+    "Openbaar vervoer": (22.0, 8, 1.35),
+    "Auto / taxi": (30.0, 5, 1.4),
+    "Fiets": (14.0, 2, 1.25),
+}
+
+_legs: OrderedDict[tuple, float] = OrderedDict()
+_legs_lock = threading.Lock()
+
+
+def coords(item: dict) -> tuple[float, float] | None:
+    if item.get("lat") is None or item.get("lon") is None:
+        return None
+    return (round(float(item["lat"]), COORD_PRECISION), round(float(item["lon"]), COORD_PRECISION))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    # Werkt op floats én NumPy arrays (batch)
+    np = numpy()
+    lat1, lon1, lat2, lon2 = (np.radians(x) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def minutes_for(km: float, mode: str) -> int:
+    speed, overhead, detour = MODES[mode]
+    if km <= 0:
+        return 0
+    return int(round(overhead + km * detour / speed * 60))
+
+
+def pair_km(pairs: list[tuple[tuple, tuple]]) -> list[float]:
+    # Afstanden voor een batch paren: cache hits direct, missers in één vectorized haversine
+    np = numpy()
+    out: list[float | None] = [None] * len(pairs)
+    misses = []
+    with _legs_lock:
+        for i, (a, b) in enumerate(pairs):
+            key = (a, b) if a <= b else (b, a)
+            if key in _legs:
+                _legs.move_to_end(key)
+                out[i] = _legs[key]
+            else:
+                misses.append((i, key))
+    if misses:
+        arr = np.asarray([k[0] + k[1] for _, k in misses], dtype=np.float64)
+        km = haversine_km(arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3])
+        with _legs_lock:
+            for (i, key), d in zip(misses, km.tolist()):
+                out[i] = _legs[key] = d
+            while len(_legs) > MAX_CACHED_LEGS:
+                _legs.popitem(last=False)
+    return out
+
+
+def trip_legs(items: list[dict], mode: str) -> dict[int, list[dict]]:
+    # Per dag: opeenvolgende stops (op tijd) met coördinaten -> leg met reistijd en speling
+    per_day = defaultdict(list)
+    for item in items:
+        point = coords(item)
+        minute = time_minutes(item.get("time", ""))
+        if point is not None and minute != UNTIMED:
+            per_day[as_int(item.get("day", 0))].append((minute, point, item))
+
+    legs, pairs = [], []
+    for day, stops in per_day.items():
+        stops.sort(key=lambda s: s[0])
+        for (m1, p1, a), (m2, p2, b) in zip(stops, stops[1:]):
+            free = m2 - (m1 + as_int(a.get("duration_min", DEFAULT_DURATION_MIN)))
+            legs.append({"day": day, "from": a, "to": b, "free_min": free})
+            pairs.append((p1, p2))
+
+    by_day = defaultdict(list)
+    for leg, km in zip(legs, pair_km(pairs)):
+        leg["km"] = km
+        leg["minutes"] = minutes_for(km, mode)
+        leg["feasible"] = leg["minutes"] <= leg["free_min"]
+        by_day[leg["day"]].append(leg)
+    return by_day
@@ -0,0 +1,171 @@
+import re
+from functools import lru_cache
+
+
+def as_int(value) -> int:
+    # Zelfde gedrag als pd.to_numeric(errors="coerce").fillna(0)
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):  # OverflowError: "inf"
+        return 0
+
+
+def trip_days(trip: dict, minimum: int = 0) -> int:
+    # Aantal dagen inclusief start- en einddatum
+    days = (trip["end_date"] - trip["start_date"]).days + 1
+    return max(days, minimum)
+
+
+def budget_per_person(trip: dict) -> int:
+    travelers = int(trip.get("travelers", 1))
+    return int(int(trip.get("budget_eur", 0)) / max(1, travelers))
+
+
+# -----------------------------
+# Validatie + normalisatie van item input (form submit en bulk import)
+# -----------------------------
+# "9:30", "09.30", "930", "9h30", "21u", "9:30 pm"
+TIME_RE = re.compile(r"^(\d{1,2})(?:\s*[:.hu]?\s*(\d{2}))?\s*[hu]?\s*(am|pm)?$")
+TAG_SPLIT_RE = re.compile(r"[,;#\n]+")
+TAG_CLEAN_RE = re.compile(r"[^\w-]+")
+# "12", "12,5", "€ 1.250,00", "1,250.00 EUR"
+COST_RE = re.compile(r"^(\d+)(?:\.(\d{1,2}))?$")
+COST_STRIP_RE = re.compile(r"(?i)€|eur|\s")
+# "35.7148, 139.7967" (lat, lon)
+COORD_RE = re.compile(r"^\s*(-?\d{1,3}(?:\.\d+)?)\s*[,; ]\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+
+MINUTES_PER_DAY = 24 * 60
+# Items zonder (geldig) uur sorteren achteraan binnen hun dag
+UNTIMED = MINUTES_PER_DAY
+
+
+@lru_cache(maxsize=4096)
+def parse_time(value: str) -> int | None:
+    # -> minuten sinds middernacht; None voor leeg, ValueError voor onzin
+    text = str(value or "").strip().lower()
+    if not text:
+        return None
+    match = TIME_RE.match(text)
+    if not match:
+        raise ValueError(f"Ongeldig tijdstip: {value!r} (verwacht HH:MM)")
+    hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    if match.group(3):
+        if not 1 <= hours <= 12:
+            raise ValueError(f"Ongeldig tijdstip: {value!r}")
+        hours = hours % 12 + (12 if match.group(3) == "pm" else 0)
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Ongeldig tijdstip: {value!r}")
+    return hours * 60 + minutes
+
+
+def format_time(minutes: int | None) -> str:
+    return "" if minutes is None else f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def time_minutes(value: str) -> int:
+    # Sorteersleutel: nooit een exception, ongeldig/leeg -> UNTIMED
+    try:
+        minutes = parse_time(value)
+    except ValueError:
+        return UNTIMED
+    return UNTIMED if minutes is None else minutes
+
+
+def normalize_time(t: str) -> str:
+    # Canonieke "HH:MM"; onherkenbare input blijft (gestript) staan
+    try:
+        return format_time(parse_time(t))
+    except ValueError:
+        return (t or "").strip()
+
+
+@lru_cache(maxsize=4096)
+def tag_id(tag: str) -> str:
+    # "  Street Food! " -> "street-food"
+    return TAG_CLEAN_RE.sub("", "-".join(str(tag).lower().split())).strip("-")
+
+
+def parse_tags(value) -> list[str]:
+    # Tekst ("a, b; #c") of lijst -> unieke canonieke tag ids, volgorde behouden
+    parts = TAG_SPLIT_RE.split(value) if isinstance(value, str) else (value or [])
+    return list(dict.fromkeys(t for t in map(tag_id, parts) if t))
+
+
+def parse_cents(value) -> int:
+    # Bedrag -> integer cent, zonder float-afronding
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        return int(round(value * 100))
+    text = COST_STRIP_RE.sub("", str(value or ""))
+    if not text:
+        return 0
+    if "," in text and "." in text:
+        # Laatste scheidingsteken is het decimaalteken
+        thousands = "." if text.rfind(",") > text.rfind(".") else ","
+        text = text.replace(thousands, "").replace(",", ".")
+    elif "," in text or text.count(".") > 1:
+        sep = "," if "," in text else "."
+        head, _, tail = text.rpartition(sep)
+        text = head.replace(sep, "") + ("." + tail if len(tail) <= 2 else tail)
+    elif "." in text and len(text.rpartition(".")[2]) == 3:
+        text = text.replace(".", "")  # "1.250" = duizendtal
+    match = COST_RE.match(text)
+    if not match:
+        raise ValueError(f"Ongeldig bedrag: {value!r}")
+    return int(match.group(1)) * 100 + int((match.group(2) or "0").ljust(2, "0"))
+
+
+def parse_coords(value: str) -> tuple[float, float] | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    match = COORD_RE.match(text)
+    if not match:
+        raise ValueError(f"Ongeldige locatie: {value!r} (verwacht 'lat, lon')")
+    lat, lon = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Locatie buiten bereik: {value!r}")
+    return lat, lon
+
+
+def cents_to_eur(cents: int) -> int:
+    # Bedragen in de app zijn hele euro's; half naar boven afronden
+    return (cents + 50) // 100
+
+
+def clean_item(item: dict, max_day: int | None = None) -> dict:
+    # Eén plek waar ruwe input naar native types gaat; ValueError bij ongeldige input
+    title = str(item.get("title", "") or "").strip()
+    if not title:
+        raise ValueError("Activiteit mag niet leeg zijn.")
+    day = as_int(item.get("day", 1))
+    if day < 1 or (max_day and day > max_day):
+        raise ValueError(f"Dag {day} valt buiten de trip.")
+    cost = cents_to_eur(parse_cents(item.get("cost", 0)))
+    minute = parse_time(item.get("time", ""))
+    cleaned = {
+        **item,
+        "day": day,
+        "time": format_time(minute),
+        "minute": minute,
+        "title": title,
+        "category": item.get("category") or "Other",
+        "cost": cost,
+        "tags": parse_tags(item.get("tags")),
+    }
+    if "location" in item:
+        point = parse_coords(cleaned.pop("location"))
+        cleaned.pop("lat", None), cleaned.pop("lon", None)
+        if point is not None:
+            cleaned["lat"], cleaned["lon"] = point
+    if "duration_min" in item:
+        cleaned["duration_min"] = max(0, as_int(item["duration_min"]))
+    if "paid_by" in item:
+        cleaned["paid_by"] = max(0, as_int(item["paid_by"]))
+    if "shared_with" in item:
+        cleaned["shared_with"] = sorted({as_int(p) for p in item["shared_with"] or []})
+    for key in ("cost_low", "cost_high"):
+        if key in item:
+            cleaned[key] = cents_to_eur(parse_cents(item[key]))
+    return cleaned
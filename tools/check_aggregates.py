@@ -0,0 +1,266 @@
+import argparse
+import random
+import sys
+from datetime import date
+from pathlib import Path
+
+# -----------------------------
+# Differentiële check: geoptimaliseerde aggregaties/sorteringen/filters vs. een simpele referentie
+# -----------------------------
+# python tools/check_aggregates.py --runs 200 --steps 60 [--seed 1]
+# Genereert willekeurige itineraries + mutatiereeksen (add, remove, move, clear, reset, batch),
+# inclusief rommelige kost/dag waarden, en vergelijkt na elke stap:
+#   src/table.py (Arrow)         <-> pandas (pd.to_numeric(errors="coerce"), groupby, stabiele sort)
+#   SortIndex / FacetIndex /      <-> herberekening vanaf nul met list comprehensions
+#   Balances / DailyCosts (incrementeel)
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.batch import apply_ops  # noqa: E402
+from src.facets import FacetIndex  # noqa: E402
+from src.models import CATEGORIES, demo_items, new_item_id, with_ids  # noqa: E402
+from src.pacing import DailyCosts, pace  # noqa: E402
+from src.settle import Balances, split_cents  # noqa: E402
+from src.sort_index import SortIndex  # noqa: E402
+from src.table import filter_day, sort_view, to_table, total_cost, totals_by, unique_days  # noqa: E402
+from src.utils import parse_tags, time_minutes  # noqa: E402
+
+BAD_NUMBERS = ["abc", None, "", "12.7", "-5", " 7 ", "1e2", "nan", "inf", 3.9, True]
+TIMES = ["09:00", "9.30", "930", "21u", "", "25:00", "7:05 pm", "noon", "00:00", "13:00"]
+TITLES = ["Museum", "museum", "Été café", "Zoo", "ramen", "Ramen", "A", "b", ""]
+TAGS = ["Food", "food", "Night Life", "beach", "", "Beach ", "kids"]
+
+
+# -----------------------------
+# Referentie: zoals de oude pandas code, bewust naïef
+# -----------------------------
+def ref_frame(items: list[dict]):
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            "day": [x.get("day") for x in items],
+            "cost": [x.get("cost") for x in items],
+            "time": [x.get("time") for x in items],
+            "title": [str(x.get("title", "") or "") for x in items],
+            "category": [x.get("category") or "Other" for x in items],
+        }
+    )
+    for col in ("day", "cost"):
+        values = pd.to_numeric(df[col], errors="coerce")
+        df[col] = values.replace([np.inf, -np.inf], np.nan).fillna(0).astype("int64")
+    df["minute"] = [time_minutes(str(t or "")) for t in df["time"]]
+    return df
+
+
+def ref_sort(df, mode: str) -> list[int]:
+    # Stabiele sort op de positie in de lijst (zoals pc.sort_indices)
+    if mode == "day_time":
+        return df.sort_values(["day", "minute", "title"], kind="stable").index.tolist()
+    if mode == "cost_desc":
+        return df.sort_values("cost", ascending=False, kind="stable").index.tolist()
+    return df.assign(t=df["title"].map(str.lower)).sort_values("t", kind="stable").index.tolist()
+
+
+def ref_index_order(items: list[dict], seq: dict[str, int], mode: str) -> list[str]:
+    # SortIndex: zelfde keys, tiebreak = volgorde van toevoegen
+    df = ref_frame(items).assign(seq=[seq[x["id"]] for x in items], id=[x["id"] for x in items])
+    if mode == "day_time":
+        return df.sort_values(["day", "minute", "title", "seq"], kind="stable")["id"].tolist()
+    if mode == "cost_desc":
+        return df.sort_values(["cost", "seq"], ascending=[False, True], kind="stable")["id"].tolist()
+    return df.assign(t=df["title"].map(str.lower)).sort_values(["t", "seq"], kind="stable")["id"].tolist()
+
+
+def ref_facets(items, tags, match_all, cats, days, cost) -> set[str]:
+    df = ref_frame(items)
+    out = set()
+    for i, item in enumerate(items):
+        item_tags = set(parse_tags(item.get("tags")))
+        if tags and not (all if match_all else any)(t in item_tags for t in tags):
+            continue
+        if cats and df["category"][i] not in cats:
+            continue
+        if days and not days[0] <= df["day"][i] <= days[1]:
+            continue
+        if cost and not cost[0] <= df["cost"][i] <= cost[1]:
+            continue
+        out.add(item["id"])
+    return out
+
+
+def ref_net(items, n: int) -> dict[int, int]:
+    df = ref_frame(items)
+    net = {p: 0 for p in range(n)}
+    shared_all = 0  # "iedereen"-items worden samen verdeeld (één afronding), zoals in Balances
+    for i, item in enumerate(items):
+        cents = int(df["cost"][i]) * 100
+        if not cents:
+            continue
+        payer = int(item.get("paid_by", 0))
+        net[payer] = net.get(payer, 0) + cents
+        if not item.get("shared_with"):
+            shared_all += cents
+            continue
+        for person, share in split_cents(cents, item["shared_with"]).items():
+            net[person] = net.get(person, 0) - share
+    for person, share in split_cents(shared_all, list(range(n))).items():
+        net[person] -= share
+    return net
+
+
+# -----------------------------
+# Generator
+# -----------------------------
+def random_item(rng: random.Random, n_travelers: int) -> dict:
+    item = {
+        "id": new_item_id(),
+        "day": rng.choice([rng.randint(1, 6)] * 4 + BAD_NUMBERS),
+        "time": rng.choice(TIMES),
+        "title": rng.choice(TITLES),
+        "category": rng.choice(CATEGORIES + [None]),
+        "cost": rng.choice([rng.randint(0, 400)] * 4 + BAD_NUMBERS),
+        "tags": rng.sample(TAGS, rng.randint(0, 3)),
+    }
+    if rng.random() < 0.5:
+        item["paid_by"] = rng.randrange(n_travelers)
+        item["shared_with"] = rng.sample(range(n_travelers), rng.randint(0, n_travelers))
+    return item
+
+
+class Model:
+    # Lijst + incrementele indexen, gemuteerd zoals src/state.py dat doet
+    def __init__(self, items):
+        self.rebuild(items)
+
+    def rebuild(self, items):
+        self.items = with_ids(items)
+        self.seq = {x["id"]: i for i, x in enumerate(self.items)}
+        self.next_seq = len(self.items)
+        self.sort_index = SortIndex.from_items(self.items)
+        self.facets = FacetIndex.from_items(self.items)
+        self.balances = Balances.from_items(self.items)
+        self.daily = DailyCosts.from_items(self.items)
+
+    def add(self, item):
+        self.items.append(item)
+        self.seq[item["id"]] = self.next_seq
+        self.next_seq += 1
+        for index in (self.sort_index, self.facets, self.balances, self.daily):
+            index.add(item)
+
+    def remove(self, i):
+        item = self.items.pop(i)
+        for index in (self.sort_index, self.facets, self.balances, self.daily):
+            index.remove(item)
+
+
+def step(model: Model, rng: random.Random, n: int) -> str:
+    op = rng.choices(["add", "remove", "move", "clear", "reset", "batch"], [50, 20, 15, 3, 3, 9])[0]
+    if op == "add" or not model.items and op in ("remove", "move", "batch"):
+        model.add(random_item(rng, n))
+        return "add"
+    if op == "remove":
+        model.remove(rng.randrange(len(model.items)))
+    elif op == "move":
+        i = rng.randrange(len(model.items))
+        j = min(max(i + rng.choice([-1, 1]), 0), len(model.items) - 1)
+        model.items[i], model.items[j] = model.items[j], model.items[i]
+    elif op == "clear":
+        model.rebuild([])
+    elif op == "reset":
+        model.rebuild(demo_items())
+    else:
+        ids = [x["id"] for x in rng.sample(model.items, rng.randint(1, len(model.items)))]
+        ops = [
+            {"op": "shift_days", "ids": ids, "days": rng.randint(-2, 2)},
+            {"op": "set_category", "ids": ids, "category": rng.choice(CATEGORIES)},
+            {"op": "reorder", "ids": rng.sample(ids, len(ids))},
+        ]
+        # Batch edits herbouwen de indexen (set_items) -> nieuwe volgnummers
+        model.rebuild(apply_ops(model.items, rng.sample(ops, rng.randint(1, 3)), max_day=6))
+    return op
+
+
+# -----------------------------
+# Vergelijkingen
+# -----------------------------
+def check(model: Model, rng: random.Random, trip: dict, n: int) -> list[str]:
+    items = model.items
+    errors = []
+    table = to_table(items)
+    df = ref_frame(items)
+
+    def expect(name, got, want):
+        if got != want:
+            errors.append(f"{name}: {got!r} != {want!r}")
+
+    expect("total_cost", total_cost(table), int(df["cost"].sum()))
+    for key in ("day", "category"):
+        got = dict(zip(*totals_by(table, key).to_pydict().values()))
+        want = {k: int(v) for k, v in df.groupby(key)["cost"].sum().items()}
+        expect(f"totals_by[{key}]", got, want)
+    expect("unique_days", unique_days(table), sorted(int(d) for d in df["day"].unique()))
+    if len(df):
+        day = int(rng.choice(df["day"].tolist()))
+        expect("filter_day", filter_day(table, day)["title"].to_pylist(), df[df["day"] == day]["title"].tolist())
+
+    for mode in ("day_time", "cost_desc", "title"):
+        got = sort_view(table, mode)["title"].to_pylist()
+        want = [df["title"][i] for i in ref_sort(df, mode)]
+        expect(f"sort_view[{mode}]", got, want)
+        expect(f"SortIndex[{mode}]", model.sort_index.order(mode), ref_index_order(items, model.seq, mode))
+
+    tags = rng.sample(["food", "night-life", "beach", "kids"], rng.randint(0, 2))
+    cats = rng.sample(CATEGORIES, rng.randint(0, 2))
+    days = rng.choice([None, (2, 4)])
+    cost = rng.choice([None, (10, 200)])
+    match_all = rng.random() < 0.5
+    expect(
+        "FacetIndex.query",
+        model.facets.ids(model.facets.query(tags, match_all, cats, days, cost)),
+        ref_facets(items, tags, match_all, cats, days, cost),
+    )
+    counts = model.facets.counts("category", model.facets.alive)
+    expect("FacetIndex.counts", {k: v for k, v in counts.items() if v}, df["category"].value_counts().to_dict())
+
+    expect("Balances.net", {p: v for p, v in model.balances.net(n).items() if v}, {p: v for p, v in ref_net(items, n).items() if v})
+    per_day = {d: c for d, c in model.daily.per_day.items() if c}
+    expect("DailyCosts", per_day, {int(k): int(v) for k, v in df.groupby("day")["cost"].sum().items() if v})
+    pacing = pace(trip, model.daily.per_day)
+    n_days = len(pacing["daily"])
+    clamped = df.assign(d=df["day"].clip(1, n_days)).groupby("d")["cost"].sum()
+    expect("pace.cumulative[-1]", pacing["cumulative"][-1], int(clamped.sum()))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differentiële check van aggregaties, sorteringen en filters")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    opts = parser.parse_args()
+
+    trip = {"start_date": date(2026, 6, 1), "end_date": date(2026, 6, 5), "budget_eur": 900}
+    failures = 0
+    for run in range(opts.runs):
+        rng = random.Random(opts.seed * 1_000_003 + run)
+        n = rng.randint(1, 5)
+        model = Model([random_item(rng, n) for _ in range(rng.randint(0, 20))])
+        history = []
+        for _ in range(opts.steps):
+            history.append(step(model, rng, n))
+            errors = check(model, rng, trip, n)
+            if errors:
+                failures += 1
+                print(f"FAIL run={run} seed={opts.seed} na {history}:")
+                for line in errors:
+                    print("   ", line)
+                break
+    print(f"{opts.runs - failures}/{opts.runs} runs ok ({opts.steps} stappen per run)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# -----------------------------
+# Load test: veel gesimuleerde sessies (AppTest) verdeeld over een process pool
+# -----------------------------
+# python tools/loadtest.py --sessions 200 --workers 8 --items 50
+# Per worker blijven alle sessies tegelijk in geheugen; de stappen lopen round-robin
+# over die sessies, zoals gelijktijdige gebruikers op één server.
+ROOT = Path(__file__).resolve().parents[1]
+APP = "Informatie.py"
+
+
+def _rss_bytes() -> int:
+    # Huidig RSS van dit proces (Linux /proc; elders ru_maxrss als benadering)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _click(at, label: str):
+    next(b for b in at.button if label in b.label).click()
+    at.run()
+
+
+def _journey(n_items: int):
+    # (naam, functie(at)) stappen van één planner
+    def open_app(at):
+        at.run()
+
+    def add_item(i):
+        def step(at):
+            if i == 0:
+                at.switch_page("pages/2_TripPlanner.py")
+                at.run()
+            next(x for x in at.text_input if x.label.startswith("Tijd")).set_value(f"{8 + i % 12}:{(i * 7) % 60:02d}")
+            next(x for x in at.text_input if x.label.startswith("Activiteit")).set_value(f"Activiteit {i}")
+            _click(at, "Add to itinerary")
+
+        return step
+
+    def reorder(at):
+        at.switch_page("pages/3_Itinerary.py")
+        at.run()
+        _click(at, "⬇️")
+
+    def statistics_page(at):
+        at.switch_page("pages/4_Statistics.py")
+        at.run()
+
+    def export(at):
+        # Dashboard bouwt de CSV/ICS/Parquet downloads
+        at.switch_page("pages/1_Dashboard.py")
+        at.run()
+
+    steps = [("open", open_app)]
+    steps += [("add_item", add_item(i)) for i in range(n_items)]
+    steps += [("reorder", reorder), ("statistics", statistics_page), ("export", export)]
+    return steps
+
+
+def run_worker(worker: int, sessions: int, n_items: int) -> dict:
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("TRIPBUILDER_WARMUP", "0")
+    os.environ["TRIPBUILDER_DB"] = os.path.join(tempfile.mkdtemp(prefix="tb-load-"), "load.db")
+    from streamlit.testing.v1 import AppTest
+
+    # Eén opwarm-journey buiten de meting: imports en process-brede caches tellen niet mee per sessie
+    warm = AppTest.from_file(APP, default_timeout=120)
+    for _, step in _journey(1):
+        step(warm)
+    del warm
+
+    rss_start = _rss_bytes()
+    apps = [AppTest.from_file(APP, default_timeout=120) for _ in range(sessions)]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors = 0
+    started = time.perf_counter()
+    for name, step in _journey(n_items):
+        for at in apps:
+            t0 = time.perf_counter()
+            try:
+                step(at)
+                errors += bool(at.exception)
+            except Exception:
+                errors += 1
+            latencies[name].append(time.perf_counter() - t0)
+    return {
+        "worker": worker,
+        "sessions": sessions,
+        "seconds": time.perf_counter() - started,
+        "latencies": dict(latencies),
+        "errors": errors,
+        "rss_start": rss_start,
+        "rss_end": _rss_bytes(),
+        "items": [len(at.session_state["draft_items"]) for at in apps],
+    }
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def report(results: list[dict], wall: float) -> dict:
+    latencies = defaultdict(list)
+    for r in results:
+        for name, values in r["latencies"].items():
+            latencies[name] += values
+    all_steps = [v for values in latencies.values() for v in values]
+    sessions = sum(r["sessions"] for r in results)
+    return {
+        "sessions": sessions,
+        "workers": len(results),
+        "wall_s": round(wall, 2),
+        "steps_per_s": round(len(all_steps) / wall, 1),
+        "journeys_per_min": round(sessions / wall * 60, 1),
+        "errors": sum(r["errors"] for r in results),
+        "items_per_session": statistics.mean(n for r in results for n in r["items"]),
+        "rss_per_session_mb": round(
+            statistics.mean((r["rss_end"] - r["rss_start"]) / max(r["sessions"], 1) for r in results) / 2**20, 2
+        ),
+        "rss_per_worker_mb": round(statistics.mean(r["rss_end"] for r in results) / 2**20, 1),
+        "latency_ms": {
+            name: {p: round(percentile(values, int(p[1:])) * 1000, 1) for p in ("p50", "p90", "p99")}
+            | {"n": len(values)}
+            for name, values in sorted(latencies.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TripBuilder load test (AppTest sessies in een process pool)")
+    parser.add_argument("--sessions", type=int, default=50, help="totaal aantal gesimuleerde sessies")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--items", type=int, default=50, help="items per sessie (via het formulier)")
+    parser.add_argument("--json", action="store_true", help="rapport als JSON")
+    opts = parser.parse_args()
+
+    workers = max(1, min(opts.workers, opts.sessions))
+    shares = [opts.sessions // workers + (1 if i < opts.sessions % workers else 0) for i in range(workers)]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_worker, range(workers), shares, [opts.items] * workers))
+    summary = report(results, time.perf_counter() - started)
+
+    if opts.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(
+        f"{summary['sessions']} sessies / {summary['workers']} workers in {summary['wall_s']}s: "
+        f"{summary['steps_per_s']} stappen/s, {summary['journeys_per_min']} journeys/min, {summary['errors']} fouten, "
+        f"{summary['items_per_session']:.0f} items per sessie"
+    )
+    print(f"RSS: ~{summary['rss_per_session_mb']} MB per sessie, {summary['rss_per_worker_mb']} MB per worker")
+    print(f"{'stap':<12}{'n':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, row in summary["latency_ms"].items():
+        print(f"{name:<12}{row['n']:>7}{row['p50']:>10}{row['p90']:>10}{row['p99']:>10}")
+
+
+if __name__ == "__main__":
+    main()